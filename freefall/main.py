@@ -2,47 +2,47 @@
 
 Main file for free fall. Import this file in parent main.py
 """
-from threading import Thread
-import time
-from pathlib import Path
 from math import inf, sqrt
-import pygame
 from includes.constants import GAME_HEIGHT, GAME_WIDTH, FPS, BLACK, WHITE, \
     LIGHT_GRAY2, ENTRY_ACTIVE, ENTRY_INACTIVE, NORMAL_STATE, DISABLED_STATE
 from includes.button import Button
+from includes.dispatcher import get_dispatcher
+from includes.assets import asset_path, get_assets
+from includes.scene import Scene, get_scene_manager
 from includes.entry import Entry
 from includes.label import Label
 from includes.camera import CameraGroup
 from includes.sprites import FallObject, BackgroundSprite
 
 
-class FreeFallSim:
+class FreeFallSim(Scene):
     """Main class.
     """
+    name = "freefall"
+    caption = "Free Fall Simulation"
+    size = (GAME_WIDTH, GAME_HEIGHT)
+    fps = FPS
+
     def __init__(self) -> None:
         """Init
         """
-        pygame.init()
-
         self.__entries = []
         self.__buttons = []
         self.__labels = []
 
-        self.so = lambda msg: Thread(target=self.show_output,
-                            args=(msg, self.__calculate_button)).start()
+        self.so = lambda msg: self.show_output(msg, self.__calculate_button)
 
-        self.__screen = pygame.display.set_mode((GAME_WIDTH, GAME_HEIGHT))
-        self.__clock = pygame.time.Clock()
+        self.__screen = get_scene_manager().get_screen(self.size)
         self.__running = False
-        try:
-            self.__font = pygame.font.Font(rf"{Path(__file__).parent}\assets\fonts\times.ttf", 16)
-        except FileNotFoundError:
-            self.__font = pygame.font.Font(pygame.font.get_default_font(), 16)
+        self.__fall_ga = 0
+        self.__fall_duration = 0
+        self.__fall_time = 0
+        self.__font = get_assets().font(asset_path(__file__, "fonts", "times.ttf"), 16)
         self.__camera = CameraGroup(limit_x_negative=0, limit_x_positive=0)
         self.__fall_object = FallObject((-100, 0), self.__camera, allow_keyboard_control=False,
                                         fill_color="#000000", rect_size=(25, 25))
         self.__background = BackgroundSprite(self.__camera,
-                                             rf"{Path(__file__).parent}\assets\images\meter.png")
+                                             asset_path(__file__, "images", "meter.png"))
 
 
     def init_widgets(self):
@@ -65,7 +65,7 @@ class FreeFallSim:
         self.__reset_button = Button(self.__screen, font=self.__font, text="Reset",
                                      command=self.reset)
         self.__fall_button = Button(self.__screen, font=self.__font, text="Drop",
-                                  command=lambda: Thread(target=self.begin_fall).start())
+                                  command=self.begin_fall, use_thread=False)
         self.__entries = [self.__ga_entry, self.__height_entry, self.__time_entry,
                           self.__velocity_entry]
         self.__buttons = [self.__set_button, self.__calculate_button, self.__reset_button]
@@ -75,7 +75,7 @@ class FreeFallSim:
         self.set_object()
 
 
-    def draw_widget(self):
+    def draw_widgets(self):
         self.__ga_entry.place(GAME_WIDTH-100, y=GAME_HEIGHT-600, width=100, height=50)
         self.__height_entry.place(GAME_WIDTH-100, y=GAME_HEIGHT-540, width=100, height=50)
         self.__time_entry.place(GAME_WIDTH-100, y=GAME_HEIGHT-480, width=100, height=50)
@@ -201,27 +201,34 @@ class FreeFallSim:
     def begin_fall(self):
         if self.__running is True:
             return
-        else:
+        try:
+            ga = float(self.__ga_entry.get(False))
+            ft = float(self.__time_entry.get(False))
             self.set_object()
-            self.__fall_button.config(text="Abort", command=self.end_fall)
-            self.__running = True
+        except ValueError as ve:
+            self.so(f"All value must be float {ve}")
+            return
+        self.__fall_button.config(text="Abort", command=self.end_fall)
         self.widgets_visibility(False, False, False)
-        ga = float(self.__ga_entry.get(False))
-        ft = float(self.__time_entry.get(False))
-        t = 0
-        total = 0
-        vel = 0
-        while t < ft:
-            if not self.__running:
-                break
-            self.__camera.focus(self.__fall_object)
-            t += 1/100
-            vel = ga * t
-            distance_traveled = vel * 1/100
-            self.__fall_object.position.y += distance_traveled
-            total += distance_traveled
+        self.__fall_ga = ga
+        self.__fall_duration = ft
+        self.__fall_time = 0
+        self.__running = True
+
+
+    def step_fall(self, dt: float):
+        """Move the falling object dt seconds further. Runs in the main loop, so the
+        sprites and the camera are only touched by the thread that draws them.
+        """
+        if not self.__running:
+            return
+        if self.__fall_time < self.__fall_duration:
+            t = min(self.__fall_time + dt, self.__fall_duration)
+            self.__fall_object.position.y += 0.5 * self.__fall_ga * \
+                (t * t - self.__fall_time * self.__fall_time)
             self.__fall_object.rect.y = round(self.__fall_object.position.y)
-            time.sleep(1/100)
+            self.__fall_time = t
+        self.__camera.focus(self.__fall_object)
 
 
     def end_fall(self):
@@ -237,29 +244,28 @@ class FreeFallSim:
                              bg=LIGHT_GRAY2, fg=BLACK)
         if isinstance(button, Button):
             button.config(state="disabled")
-        time.sleep(2)
+        get_dispatcher().call_later(2, self.hide_output, button, key=self.show_output)
+
+
+    def hide_output(self, button: Button = ...):
         if isinstance(button, Button):
             button.config(state="normal")
-        del self.__output_label
+        try:
+            del self.__output_label
+        except AttributeError:
+            pass
 
+    def exit(self):
+        if self.__running:
+            self.end_fall()
 
-    def mainloop(self):
-        """Main game loop
-        """
-        prev_time = time.time()
-        while True:
-            dt = time.time() - prev_time
-            prev_time = time.time()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    return 0
-                for entry in self.__entries:
-                    entry.handle_entry_events(event)
-
-            self.__screen.fill("#FFFFFF")
-            self.__camera.update(dt)
-            self.__camera.custom_draw()
-            self.draw_widget()
-            pygame.display.flip()
-            self.__clock.tick(FPS)
+    def get_entries(self):
+        return self.__entries
+
+    def update(self, dt: float):
+        self.step_fall(dt)
+        self.__camera.update(dt)
+
+    def draw(self):
+        self.__screen.fill("#FFFFFF")
+        self.__camera.custom_draw()
@@ -1,4 +1,12 @@
-from includes.button import Button
-from includes.entry import Entry
-from includes.label import Label
-from includes.listbox import Listbox
+import importlib
+
+# widgets are imported on first access, so importing includes.constants or
+# includes.simulations does not load pygame
+_WIDGETS = {"Button": "includes.button", "Entry": "includes.entry",
+            "Label": "includes.label", "Listbox": "includes.listbox"}
+
+
+def __getattr__(name: str):
+    if name in _WIDGETS:
+        return getattr(importlib.import_module(_WIDGETS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,186 @@
+"""Assets
+
+A module for loading and caching fonts and images in pygame
+"""
+import io
+import os
+from pathlib import Path, PurePath
+from threading import Lock, Thread
+from typing import Iterable
+import pygame
+
+FONT_SUFFIXES = (".ttf", ".otf")
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".bmp", ".gif")
+
+
+def asset_path(module_file: str | Path, *parts: str) -> Path:
+    """Path of a file in the assets folder next to a module
+
+    Args:
+        module_file (str | Path): __file__ of the module
+        parts (str): Path parts inside the assets folder, e.g. "fonts", "times.ttf"
+
+    Returns:
+        Path: <module folder>/assets/<parts>
+    """
+    return Path(module_file).resolve().parent.joinpath("assets", *parts)
+
+
+def resolve_path(path: str | PurePath) -> Path:
+    """Turn a path written for any OS into a path for this one. Backslashes are treated as
+    separators on every OS."""
+    if isinstance(path, PurePath):
+        path = str(path)
+    if os.sep != "\\":
+        path = path.replace("\\", "/")
+    return Path(path)
+
+
+class AssetManager:
+    """AssetManager
+    Load fonts and images once, keyed by (path, size)
+
+    Cached surfaces are shared. Blit them, do not draw on them; copy() them first.
+    """
+    def __init__(self):
+        self.__lock = Lock()
+        self.__fonts = {}
+        self.__font_files = {}
+        self.__images = {}
+        self.__raw_images = {}
+        self.__loaded_images = set()
+
+    def font(self, path: str | PurePath | None, size: int) -> pygame.font.Font:
+        """Font at path. Falls back to the default font when path does not exist.
+
+        Args:
+            path (str | PurePath | None): Font file. None for the default font
+            size (int): Font size
+
+        Returns:
+            pygame.font.Font: font
+        """
+        path = None if path is None else resolve_path(path)
+        key = (path, size)
+        font = self.__fonts.get(key)
+        if font is not None:
+            return font
+        if not pygame.font.get_init():
+            pygame.font.init()
+        with self.__lock:
+            data = self.__font_files.get(path)
+        if data is not None:
+            font = pygame.font.Font(io.BytesIO(data), size)
+        elif path is not None and path.is_file():
+            font = pygame.font.Font(str(path), size)
+        else:
+            font = pygame.font.Font(pygame.font.get_default_font(), size)
+        self.__fonts[key] = font
+        return font
+
+    def sys_font(self, name: str, size: int) -> pygame.font.Font:
+        """Same as pygame.font.SysFont(name, size), loaded once per (name, size)"""
+        key = ("sys", name, size)
+        font = self.__fonts.get(key)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = self.__fonts[key] = pygame.font.SysFont(name, size)
+        return font
+
+    def image(self, path: str | PurePath, size: tuple | None = None,
+              alpha: bool = True) -> pygame.Surface | None:
+        """Image at path, converted to the display format
+
+        Args:
+            path (str | PurePath): Image file
+            size (tuple | None, optional): Scale to this size. Defaults to None.
+            alpha (bool, optional): Keep per-pixel alpha (convert_alpha), else convert.
+            Defaults to True.
+
+        Returns:
+            pygame.Surface | None: image, None when path does not exist
+        """
+        path = resolve_path(path)
+        key = (path, None if size is None else tuple(size), alpha)
+        image = self.__images.get(key)
+        if image is not None:
+            return image
+        # once any variant of path is cached, the preload thread skips it
+        with self.__lock:
+            image = self.__raw_images.pop(path, None)
+            self.__loaded_images.add(path)
+        if image is None:
+            if not path.is_file():
+                return None
+            image = pygame.image.load(str(path))
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha() if alpha else image.convert()
+        if size is not None:
+            image = pygame.transform.scale(image, size)
+        self.__images[key] = image
+        return image
+
+    def preload(self, fonts: Iterable = (), images: Iterable = ()) -> Thread:
+        """Read font files and decode images on a background thread. Converting to the
+        display format still happens on first use, from the main thread.
+
+        Args:
+            fonts (Iterable, optional): Font paths
+            images (Iterable, optional): Image paths
+
+        Returns:
+            Thread: the started loader thread
+        """
+        fonts = [resolve_path(path) for path in fonts]
+        images = [resolve_path(path) for path in images]
+
+        def font_wanted(path):
+            with self.__lock:
+                return path not in self.__font_files
+
+        def image_wanted(path):
+            with self.__lock:
+                return path not in self.__raw_images and path not in self.__loaded_images
+
+        def load():
+            for path in fonts:
+                if path.is_file() and font_wanted(path):
+                    data = path.read_bytes()
+                    with self.__lock:
+                        self.__font_files.setdefault(path, data)
+            for path in images:
+                if path.is_file() and image_wanted(path):
+                    image = pygame.image.load(str(path))
+                    # image() may have loaded path while this thread was decoding it
+                    with self.__lock:
+                        if path not in self.__loaded_images:
+                            self.__raw_images.setdefault(path, image)
+
+        thread = Thread(target=load, name="asset-preload", daemon=True)
+        thread.start()
+        return thread
+
+    def preload_folder(self, folder: str | PurePath) -> Thread:
+        """Preload every font and image under folder on a background thread"""
+        files = [path for path in resolve_path(folder).rglob("*") if path.is_file()]
+        return self.preload(
+            fonts=[path for path in files if path.suffix.lower() in FONT_SUFFIXES],
+            images=[path for path in files if path.suffix.lower() in IMAGE_SUFFIXES])
+
+    def clear(self):
+        """Drop every cached font and image"""
+        with self.__lock:
+            self.__fonts = {}
+            self.__font_files = {}
+            self.__images = {}
+            self.__raw_images = {}
+            self.__loaded_images = set()
+
+
+_ASSETS = AssetManager()
+
+
+def get_assets():
+    """Asset manager shared by every module"""
+    return _ASSETS
@@ -2,19 +2,31 @@
 
 A module for button in pygame
 """
-from pathlib import PosixPath, WindowsPath, Path
-import re
+from pathlib import PosixPath, WindowsPath
 from typing import Any, Callable, Literal
-from threading import Thread
 import pygame
 
+try:
+    from includes.assets import get_assets
+    from includes.colors import is_hex_color
+    from includes.compositor import get_compositor
+    from includes.dispatcher import get_dispatcher
+    from includes.text_cache import render_text
+    from includes.ui_events import get_ui_dispatcher
+except ImportError:
+    from assets import get_assets
+    from colors import is_hex_color
+    from compositor import get_compositor
+    from dispatcher import get_dispatcher
+    from text_cache import render_text
+    from ui_events import get_ui_dispatcher
+
 _NORMAL = "normal"
 _DISABLED = "disabled"
 _WHITE = "#FFFFFF"
 _DEF_DISABLED_STATE = "#9c9c9c"
 _DEF_NORMAL_STATE = "#475F77"
 _DEF_DOWN_STATE = "#D74B4B"
-_HEX_COLOR_PATTERN = "^#([0-9A-Fa-f]{3}){1,2}$"
 _TYPE_MSG = lambda name, param, expect: f"invalid type for {name}: {param}. Expected: {expect}"
 _VAL_MSG = lambda name, param, expect: f"invalid value for {name}: {param}. Expected: {expect}"
 
@@ -96,28 +108,28 @@ class Button:
         else:
             raise TypeError(_TYPE_MSG("border_radius", border_radius, "int"))
         if isinstance(text_color, str):
-            if re.match(_HEX_COLOR_PATTERN, text_color):
+            if is_hex_color(text_color):
                 self.__text_color = text_color
             else:
                 raise ValueError(_VAL_MSG("text_color", text_color, "6-digit HEX value"))
         else:
             raise TypeError(_TYPE_MSG("text_color", text_color, "str"))
         if isinstance(disabled_color, str):
-            if re.match(_HEX_COLOR_PATTERN, disabled_color):
+            if is_hex_color(disabled_color):
                 self.__disabled_color = disabled_color
             else:
                 raise ValueError(_VAL_MSG("disabled_color", disabled_color, "6-digit HEX value"))
         else:
             raise TypeError(_TYPE_MSG("disabled_color", disabled_color, "str"))
         if isinstance(normal_color, str):
-            if re.match(_HEX_COLOR_PATTERN, normal_color):
+            if is_hex_color(normal_color):
                 self.__normal_color = normal_color
             else:
                 raise ValueError(_VAL_MSG("normal_color", normal_color, "6-digit HEX value"))
         else:
             raise TypeError(_TYPE_MSG("normal_color", normal_color, "str"))
         if isinstance(click_color, str):
-            if re.match(_HEX_COLOR_PATTERN, click_color):
+            if is_hex_color(click_color):
                 self.__click_color = click_color
             else:
                 raise ValueError(_VAL_MSG("click_color", click_color, "6-digit HEX value"))
@@ -129,7 +141,6 @@ class Button:
         else:
             self.__button_color = self.__disabled_color
         self.__pressed = False
-        self.__function_executed = False
         
         if image is None:
             self.__image = None
@@ -137,15 +148,8 @@ class Button:
             self.__image = self.__create_image_surface(image)
         
     def __create_image_surface(self, image):
-        if isinstance(image, str):
-            im_path = Path(image)
-            if not im_path.exists() or not im_path.is_file():
-                return None
-            return pygame.image.load(image).convert_alpha()
-        elif isinstance(image, PosixPath | WindowsPath):
-            if not image.exists() or not image.is_file():
-                return None
-            return pygame.image.load(str(image)).convert_alpha()
+        if isinstance(image, str | PosixPath | WindowsPath):
+            return get_assets().image(image)
         elif isinstance(image, pygame.Surface):
             return image.convert_alpha()
         else:
@@ -163,7 +167,7 @@ class Button:
         if not self.__image is None:
             self.__image = pygame.transform.scale(self.__image, (width, height)).convert_alpha()
         self.__top_rect = pygame.Rect((x, y), (width, height))
-        self.__text_surface = self.__font.render(self.__text, True, self.__text_color)
+        self.__text_surface = render_text(self.__font, self.__text, True, self.__text_color)
         self.__text_rect = self.__text_surface.get_rect(topleft=self.__top_rect.topleft)
         self.__text_rect.center = self.__top_rect.center
         pygame.draw.rect(self.__screen, self.__button_color, self.__top_rect,
@@ -172,7 +176,10 @@ class Button:
             im_rect = self.__text_surface.get_rect(topleft=self.__top_rect.topleft)
             self.__screen.blit(self.__image, im_rect)
         self.__screen.blit(self.__text_surface, self.__text_rect)
-        self.__check_click()
+        get_compositor().track(self, self.__top_rect,
+                               (self.__text, self.__font, self.__button_color, self.__text_color,
+                                None if self.__image is None else self.__image.get_alpha()))
+        get_ui_dispatcher().register(self, self.__top_rect)
 
     def config(self, text: str | None = ...,
                font: pygame.font.Font | None = ...,
@@ -220,64 +227,52 @@ class Button:
             self.__args = tuple(args)
         if isinstance(border_radius, int) and border_radius >= 0:
             self.__border_radius = border_radius
-        if isinstance(text_color, str) and re.match(_HEX_COLOR_PATTERN, text_color):
+        if isinstance(text_color, str) and is_hex_color(text_color):
             self.__text_color = text_color
-        if isinstance(disabled_color, str) and re.match(_HEX_COLOR_PATTERN, disabled_color):
+        if isinstance(disabled_color, str) and is_hex_color(disabled_color):
             self.__disabled_color = disabled_color
-        if isinstance(normal_color, str) and re.match(_HEX_COLOR_PATTERN, normal_color):
+        if isinstance(normal_color, str) and is_hex_color(normal_color):
             self.__normal_color = normal_color
-        if isinstance(click_color, str) and re.match(_HEX_COLOR_PATTERN, click_color):
+        if isinstance(click_color, str) and is_hex_color(click_color):
             self.__click_color = click_color
 
-    def __check_click(self):
-        """Check button click
+    def handle_mouse(self, event: pygame.event.Event) -> bool:
+        """Handle a mouse event routed by the UI event dispatcher
+
+        Args:
+            event (pygame.event.Event): MOUSEBUTTONDOWN, MOUSEBUTTONUP or MOUSEWHEEL event
+
+        Returns:
+            bool: True if the event was consumed
         """
-        if self.__state == _DISABLED:
-            return
-        mouse_pos = pygame.mouse.get_pos()
-        if not self.__top_rect.collidepoint(mouse_pos):
-            return
-        if pygame.mouse.get_pressed()[0]:
+        if getattr(event, "button", None) != pygame.BUTTON_LEFT:
+            return False
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if self.__state == _DISABLED:
+                return False
             if self.__image is None:
                 self.__button_color = self.__click_color
             else:
                 self.__image.set_alpha(100)
             self.__pressed = True
-            wc = lambda: Thread(target=self.__wait_click).start()
-            wc()
-        else:
-            wc = Thread(target=self.__wait_click)
-            wc.start()
-            wc.join()
+            return True
+        if event.type == pygame.MOUSEBUTTONUP:
+            if not self.__pressed:
+                return False
+            self.__release()
+            if self.__state != _DISABLED and self.__top_rect.collidepoint(event.pos):
+                if self.__use_thread:
+                    get_dispatcher().submit(self.__command, *self.__args)
+                else:
+                    self.__command(*self.__args)
+            return True
+        return False
 
-    def __wait_click(self):
-        if not self.__pressed:
-            return
-        elif any(pygame.mouse.get_pressed()):
-            return
-        elif self.__function_executed:
-            return
-        elif not any(pygame.mouse.get_pressed()) and not self.__function_executed:
-            if self.__use_thread and self.__args:
-                self.__function_executed = True
-                cd = Thread(target=self.__command, args=tuple(self.__args))
-                cd.start()
-                self.__function_executed = False
-            elif self.__use_thread and not self.__args:
-                self.__function_executed = True
-                cd = Thread(target=self.__command)
-                cd.start()
-                self.__function_executed = False
-            elif not self.__use_thread and self.__args:
-                self.__function_executed = True
-                self.__command(*self.__args)
-                self.__function_executed = False
-            elif not self.__use_thread and not self.__args:
-                self.__function_executed = True
-                self.__command()
-                self.__function_executed = False
-            self.__pressed = False
-            if self.__image is None:
-                self.__button_color = self.__normal_color
-            else:
-                self.__image.set_alpha(255)
\ No newline at end of file
+    def __release(self):
+        self.__pressed = False
+        if self.__image is not None:
+            self.__image.set_alpha(255)
+        elif self.__state == _DISABLED:
+            self.__button_color = self.__disabled_color
+        else:
+            self.__button_color = self.__normal_color
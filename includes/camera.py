@@ -2,16 +2,21 @@
 
 A module for camera in Pygame
 """
-import os
-from pathlib import Path, PosixPath, WindowsPath
+from pathlib import PosixPath, WindowsPath
 import pygame
 
 try:
+    from includes.assets import get_assets
     from includes.constants import CAMERA_SPEED, ENTER
     from includes.constants import W, A, S, D
+    from includes.compositor import get_compositor
+    from includes.render import DrawOrder, TiledSurface, visible_blits
 except ImportError:
+    from assets import get_assets
     from constants import CAMERA_SPEED, ENTER
     from constants import W, A, S, D
+    from compositor import get_compositor
+    from render import DrawOrder, TiledSurface, visible_blits
 
 class CameraGroup(pygame.sprite.Group):
     """CameraGroup
@@ -21,7 +26,8 @@ class CameraGroup(pygame.sprite.Group):
                  limit_x_positive: int | None = None, limit_x_negative: int | None = None,
                  limit_y_positive: int | None = None, limit_y_negative: int | None = None,
                  camera_speed: int = CAMERA_SPEED,
-                 key_binding: tuple | list = (W, A, S, D), reset_key: int | None = ENTER):
+                 key_binding: tuple | list = (W, A, S, D), reset_key: int | None = ENTER,
+                 y_sort: bool = True):
         """CameraGroup
         Camera for pygame
 
@@ -37,7 +43,11 @@ class CameraGroup(pygame.sprite.Group):
                 Example: (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d)
             reset_key (int): Key ID. Reset camera to default position.
                 Example: pygame.K_RETURN
+            y_sort (bool): Draw sprites sorted by rect.centery. Set to False to draw
+                sprites in insertion order (faster with many sprites)
         """
+        self.__draw_order = DrawOrder(y_sort if isinstance(y_sort, bool) else True)
+        self.__last_view = None
         super().__init__()
         self.__display_surface = pygame.display.get_surface()
 
@@ -62,16 +72,11 @@ class CameraGroup(pygame.sprite.Group):
         self.__ground_surface = None
         if isinstance(ground_surface, pygame.Surface):
             self.__ground_surface = ground_surface
-        elif isinstance(ground_surface, str):
-            path = Path(ground_surface)
-            if os.path.exists(path):
-                self.__ground_surface = pygame.image.load(ground_surface).convert_alpha()
-        elif isinstance(ground_surface, WindowsPath | PosixPath):
-            if os.path.exists(ground_surface):
-                self.__ground_surface = pygame.image.load(str(ground_surface)).convert_alpha()
+        elif isinstance(ground_surface, str | WindowsPath | PosixPath):
+            self.__ground_surface = get_assets().image(ground_surface)
         if not self.__ground_surface:
             self.__ground_surface = pygame.Surface((0, 0))
-        self.__ground_rect = self.__ground_surface.get_rect(topleft = (0,0))
+        self.__ground_tiles = TiledSurface(self.__ground_surface, (0, 0))
 
         if isinstance(limit_x_positive, int):
             if limit_x_positive < 0:
@@ -173,7 +178,8 @@ class CameraGroup(pygame.sprite.Group):
                limit_x_positive: int | None = ..., limit_x_negative: int | None = ...,
                limit_y_positive: int | None = ..., limit_y_negative: int | None = ...,
                camera_speed: int = ...,
-               key_binding: tuple | list = ..., reset_key: int | None = ...):
+               key_binding: tuple | list = ..., reset_key: int | None = ...,
+               y_sort: bool = ...):
         """Camera configuration
 
         Args:
@@ -186,16 +192,14 @@ class CameraGroup(pygame.sprite.Group):
             key_binding (tuple | list): Camera keybinding
                 Format: (Up, Left, Down, Right)
                 Example: (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d)
+            y_sort (bool): Draw sprites sorted by rect.centery
         """
         if isinstance(ground_surface, pygame.Surface):
             self.__ground_surface = ground_surface
-        elif isinstance(ground_surface, str):
-            path = Path(ground_surface)
-            if os.path.exists(path):
-                self.__ground_surface = pygame.image.load(ground_surface).convert_alpha()
-        elif isinstance(ground_surface, WindowsPath | PosixPath):
-            if os.path.exists(ground_surface):
-                self.__ground_surface = pygame.image.load(str(ground_surface)).convert_alpha()
+        elif isinstance(ground_surface, str | WindowsPath | PosixPath):
+            self.__ground_surface = get_assets().image(ground_surface) or self.__ground_surface
+        if self.__ground_surface is not self.__ground_tiles.surface:
+            self.__ground_tiles = TiledSurface(self.__ground_surface, (0, 0))
 
         if isinstance(limit_x_positive, int):
             if limit_x_positive < 0:
@@ -233,6 +237,17 @@ class CameraGroup(pygame.sprite.Group):
         if isinstance(reset_key, int):
             self.__reset_key = reset_key
 
+        if isinstance(y_sort, bool):
+            self.__draw_order.y_sort = y_sort
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.__draw_order.add(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.__draw_order.remove(sprite)
+
     def custom_draw(self, allow_vertical: bool = True, allow_horizontal: bool = True):
         """custom draw
         Draw
@@ -243,9 +258,11 @@ class CameraGroup(pygame.sprite.Group):
         """
         self.keyboard_control(allow_vertical, allow_horizontal)
 
-        ground_offset = self.__ground_rect.topleft - self.__offset
-        self.__display_surface.blit(self.__ground_surface, ground_offset)
-
-        for sprite in sorted(self.sprites(), key = lambda sprite: sprite.rect.centery):
-            offset_pos = sprite.rect.topleft - self.__offset
-            self.__display_surface.blit(sprite.image, offset_pos)
+        view = self.__camera_rect
+        compositor = get_compositor()
+        if (view.topleft, self.__ground_tiles) != self.__last_view:
+            self.__last_view = (view.topleft, self.__ground_tiles)
+            compositor.mark_all()
+        blit_sequence = self.__ground_tiles.visible_blits(view)
+        blit_sequence.extend(visible_blits(self.__draw_order.sprites(), view, compositor))
+        self.__display_surface.blits(blit_sequence, doreturn=False)
@@ -0,0 +1,56 @@
+"""Colors
+
+A module for color parsing and validation shared by the widgets
+"""
+from functools import lru_cache
+import re
+
+HEX_COLOR_PATTERN = "^#([0-9A-Fa-f]{3}){1,2}$"
+HEX_COLOR_ALPHA_PATTERN = "^#([0-9A-Fa-f]{6}|[0-9A-Fa-f]{8})$"
+COLOR_CACHE_SIZE = 256
+
+_HEX_COLOR = re.compile(HEX_COLOR_PATTERN)
+_HEX_COLOR_ALPHA = re.compile(HEX_COLOR_ALPHA_PATTERN)
+
+
+@lru_cache(maxsize=64)
+def compile_pattern(pattern: str) -> re.Pattern:
+    """Compile a regex pattern once. Same as re.compile, memoized."""
+    return re.compile(pattern)
+
+
+@lru_cache(maxsize=COLOR_CACHE_SIZE)
+def _is_hex_color(value: str, allow_alpha: bool) -> bool:
+    if allow_alpha:
+        return _HEX_COLOR_ALPHA.match(value) is not None
+    return _HEX_COLOR.match(value) is not None
+
+
+def is_hex_color(value, allow_alpha: bool = False) -> bool:
+    """Check a HEX color code. Results are memoized.
+
+    Args:
+        value (Any): Value to check
+        allow_alpha (bool, optional): Accept "#RRGGBB" and "#RRGGBBAA" instead of "#RGB" and
+        "#RRGGBB". Defaults to False.
+
+    Returns:
+        bool: True if value is a valid HEX color code
+    """
+    return isinstance(value, str) and _is_hex_color(value, allow_alpha)
+
+
+@lru_cache(maxsize=COLOR_CACHE_SIZE)
+def hex_to_rgb(value: str) -> tuple:
+    """Convert a HEX color code to a tuple. Results are memoized.
+
+    Args:
+        value (str): "RGB", "RRGGBB" or "RRGGBBAA", with or without a leading "#"
+
+    Returns:
+        tuple: (r, g, b), or (r, g, b, a) for 8-digit codes
+    """
+    digits = value.lstrip("#")
+    if len(digits) == 3:
+        digits = "".join(digit * 2 for digit in digits)
+    return tuple(int(digits[i:i+2], 16) for i in range(0, len(digits), 2))
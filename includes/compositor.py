@@ -0,0 +1,130 @@
+"""Compositor
+
+A module for dirty-rectangle display updates in pygame
+"""
+import pygame
+
+FULL_UPDATE_RATIO = 0.5
+_EXPOSE_EVENTS = tuple(getattr(pygame, name) for name in (
+    "VIDEOEXPOSE", "VIDEORESIZE", "WINDOWEXPOSED", "WINDOWSHOWN", "WINDOWRESTORED",
+    "WINDOWSIZECHANGED") if hasattr(pygame, name))
+
+
+def _merge(rects: list):
+    """Merge overlapping rects, so no pixel is sent to the display twice"""
+    merged = []
+    for rect in rects:
+        rect = rect.copy()
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+class Compositor:
+    """Compositor
+    Collect the screen regions changed during a frame and send only those to the display
+    """
+    def __init__(self, full_update_ratio: float = FULL_UPDATE_RATIO):
+        """Compositor
+
+        Args:
+            full_update_ratio (float, optional): When dirty regions cover more than this
+            fraction of the screen, flip the whole display instead.
+            Defaults to FULL_UPDATE_RATIO.
+        """
+        self.__full_update_ratio = full_update_ratio
+        self.__rects = []
+        self.__full = True
+        self.__tracked = {}
+        self.__seen = set()
+
+    def mark(self, *rects):
+        """Mark regions as changed
+
+        Args:
+            rects (pygame.Rect | tuple): Changed regions, in screen coordinates
+        """
+        for rect in rects:
+            self.__rects.append(pygame.Rect(rect))
+
+    def mark_all(self):
+        """Mark the whole screen as changed"""
+        self.__full = True
+
+    def track(self, owner, rect: pygame.Rect, state=None):
+        """Report where owner was drawn this frame
+
+        The region is marked changed when owner moved or its state changed since last
+        frame. Owners that are not tracked in a frame have their last region marked at
+        present(), so hidden widgets and removed sprites get erased.
+
+        Args:
+            owner (Hashable): The widget or sprite
+            rect (pygame.Rect): Region owner was drawn on, in screen coordinates
+            state (Any, optional): Anything that changes how owner looks. Compared with ==
+        """
+        self.__seen.add(owner)
+        previous = self.__tracked.get(owner)
+        if previous is not None and previous[0] == rect and previous[1] == state:
+            return
+        rect = pygame.Rect(rect)
+        if previous is not None:
+            self.__rects.append(previous[0])
+        self.__rects.append(rect)
+        self.__tracked[owner] = (rect, state)
+
+    def forget(self, owner):
+        """Stop tracking owner and mark its last region"""
+        previous = self.__tracked.pop(owner, None)
+        self.__seen.discard(owner)
+        if previous is not None:
+            self.__rects.append(previous[0])
+
+    def reset(self):
+        """Forget everything tracked and repaint the whole screen. Use when a new
+        simulation takes over the display."""
+        self.__rects = []
+        self.__tracked = {}
+        self.__seen = set()
+        self.__full = True
+
+    def handle_event(self, event: pygame.event.Event):
+        """Repaint everything when the window was exposed or resized"""
+        if event.type in _EXPOSE_EVENTS:
+            self.__full = True
+
+    def present(self):
+        """Update changed regions of the display, or flip it when most of it changed"""
+        for owner in self.__tracked.keys() - self.__seen:
+            self.__rects.append(self.__tracked.pop(owner)[0])
+        self.__seen = set()
+        rects, self.__rects = self.__rects, []
+        full, self.__full = self.__full, False
+
+        surface = pygame.display.get_surface()
+        if surface is None:
+            return
+        if full:
+            pygame.display.flip()
+            return
+        screen_rect = surface.get_rect()
+        rects = _merge([rect.clip(screen_rect) for rect in rects
+                        if screen_rect.colliderect(rect)])
+        if not rects:
+            return
+        area = sum(rect.width * rect.height for rect in rects)
+        if area > self.__full_update_ratio * screen_rect.width * screen_rect.height:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+
+
+_COMPOSITOR = Compositor()
+
+
+def get_compositor():
+    """Compositor shared by every widget, camera and mainloop"""
+    return _COMPOSITOR
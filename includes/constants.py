@@ -2,21 +2,40 @@
 
 A file store constants for project
 """
-import pygame
-import tkinter as tk
+from functools import lru_cache
+
+try:
+    from includes.colors import hex_to_rgb
+except ImportError:
+    from colors import hex_to_rgb
 
 
 # Main
-root = tk.Tk()
 WM_DELETE_WINDOW = "WM_DELETE_WINDOW"
 
 WIN_WIDTH = 600
 WIN_HEIGHT = 700
-SCREEN_WIDTH = root.winfo_screenwidth()
-SCREEN_HEIGHT = root.winfo_screenheight()
+HEADLESS_SCREEN_SIZE = (1920, 1080)
 GREEN = "#57bd1c"
 
-root.destroy()
+
+@lru_cache(maxsize=1)
+def get_screen_size() -> tuple:
+    """Screen size, read once from Tk on first use
+
+    Returns:
+        tuple: (width, height). HEADLESS_SCREEN_SIZE when there is no display.
+    """
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as error:  # ImportError, or tkinter.TclError when there is no display
+        print(f"Could not read screen size ({error}), using {HEADLESS_SCREEN_SIZE}")
+        return HEADLESS_SCREEN_SIZE
+    try:
+        return root.winfo_screenwidth(), root.winfo_screenheight()
+    finally:
+        root.destroy()
 
 # GAME
 WIN_WIDTH = 600
@@ -51,28 +70,34 @@ ENTRY_ACTIVE = "#1C86EE"
 ENTRY_INACTIVE = "#8DB6CD"
 
 # Lesson 4: Config.py constants
-HEX_TO_RGB = lambda hex: tuple((int(hex[i:i+2], 16) for i in (0, 2, 4)))
-
-# FNP 4: Label, Sprites
-HEX_COLOR_PATTERN = "^#([0-9A-Fa-f]{3}){1,2}$"
+HEX_TO_RGB = hex_to_rgb
 
 # FNP Camera
 CAMERA_SPEED = 30
-ENTER = pygame.K_RETURN
-W = pygame.K_w
-A = pygame.K_a
-S = pygame.K_s
-D = pygame.K_d
 
 # FNP Sprite
 OBJECT_BASE_SPEED = 300
 DEFAULT_FILL_COLOR = "#FFFFFF"
 DEFAULT_SIZE = (100, 100)
-UP = pygame.K_UP
-DOWN = pygame.K_DOWN
-LEFT = pygame.K_LEFT
-RIGHT = pygame.K_RIGHT
 
 # Height meter
 HM_FILL_COLOR = "#000000"
-HM_RECT_SIZE = (20, 5)
\ No newline at end of file
+HM_RECT_SIZE = (20, 5)
+
+# Key codes (FNP Camera, FNP Sprite). Looked up in pygame on first access, so the
+# launcher imports this module without loading pygame.
+_PYGAME_KEYS = {"ENTER": "K_RETURN", "W": "K_w", "A": "K_a", "S": "K_s", "D": "K_d",
+                "UP": "K_UP", "DOWN": "K_DOWN", "LEFT": "K_LEFT", "RIGHT": "K_RIGHT"}
+
+
+def __getattr__(name: str):
+    # SCREEN_WIDTH, SCREEN_HEIGHT and the key codes are resolved on first access, not on
+    # import
+    if name == "SCREEN_WIDTH":
+        return get_screen_size()[0]
+    if name == "SCREEN_HEIGHT":
+        return get_screen_size()[1]
+    if name in _PYGAME_KEYS:
+        import pygame
+        return getattr(pygame, _PYGAME_KEYS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
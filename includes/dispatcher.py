@@ -0,0 +1,189 @@
+"""Dispatcher
+
+A module for running widget commands on a shared thread pool
+"""
+import heapq
+import itertools
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from queue import Empty, SimpleQueue
+from threading import Lock
+from typing import Any, Callable, Hashable
+
+MAX_WORKERS = 4
+
+
+class _Timer:
+    def __init__(self, due: float, command: Callable, args: tuple, key: Hashable | None):
+        self.due = due
+        self.command = command
+        self.args = args
+        self.key = key
+        self.cancelled = False
+
+
+class TaskDispatcher:
+    """TaskDispatcher
+    Run commands on a bounded thread pool, and deliver delayed calls and completion
+    callbacks on the main loop (see pump)
+    """
+    def __init__(self, max_workers: int = MAX_WORKERS):
+        """TaskDispatcher
+
+        Args:
+            max_workers (int, optional): Worker threads. Defaults to MAX_WORKERS.
+        """
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers,
+                                             thread_name_prefix="widget-command")
+        self.__lock = Lock()
+        self.__completed = SimpleQueue()
+        self.__timers = []
+        self.__counter = itertools.count()
+        self.__keyed_timers = {}
+        self.__keyed_futures = {}
+        self.__debounced = {}
+
+    def submit(self, command: Callable[..., Any], *args, key: Hashable | None = None,
+               callback: Callable[[Future], Any] | None = None) -> Future:
+        """Run command(*args) on the pool
+
+        Args:
+            command (Callable[..., Any]): Function to run
+            args: Arguments for command
+            key (Hashable | None, optional): A still pending task with the same key is
+            cancelled and replaced by this one
+            callback (Callable[[Future], Any] | None, optional): Called with the finished
+            future, on the main loop
+
+        Returns:
+            Future: the task
+        """
+        if key is not None:
+            self.cancel(key)
+        future = self.__executor.submit(command, *args)
+        if key is not None:
+            with self.__lock:
+                self.__keyed_futures[key] = future
+            future.add_done_callback(lambda done: self.__forget_future(key, done))
+        if callback is not None:
+            future.add_done_callback(lambda done: self.__completed.put((callback, done)))
+        return future
+
+    def __forget_future(self, key: Hashable, future: Future):
+        with self.__lock:
+            if self.__keyed_futures.get(key) is future:
+                del self.__keyed_futures[key]
+
+    def call_later(self, delay: int | float, command: Callable[..., Any], *args,
+                   key: Hashable | None = None):
+        """Call command(*args) on the main loop after delay seconds. Nothing sleeps.
+
+        Args:
+            delay (int | float): Delay, in seconds
+            command (Callable[..., Any]): Function to call
+            args: Arguments for command
+            key (Hashable | None, optional): A pending call with the same key is cancelled
+            and replaced by this one
+        """
+        timer = _Timer(time.monotonic() + max(0, delay), command, args, key)
+        with self.__lock:
+            if key is not None:
+                previous = self.__keyed_timers.get(key)
+                if previous is not None:
+                    previous.cancelled = True
+                self.__keyed_timers[key] = timer
+            heapq.heappush(self.__timers, (timer.due, next(self.__counter), timer))
+
+    def cancel(self, key: Hashable) -> bool:
+        """Cancel the pending task and delayed call registered with key
+
+        A task that already started can not be cancelled.
+
+        Returns:
+            bool: True if something was cancelled
+        """
+        with self.__lock:
+            future = self.__keyed_futures.pop(key, None)
+            timer = self.__keyed_timers.pop(key, None)
+        cancelled = False
+        if future is not None:
+            cancelled = future.cancel()
+        if timer is not None and not timer.cancelled:
+            timer.cancelled = True
+            cancelled = True
+        return cancelled
+
+    def debounce(self, key: Hashable, interval: int | float) -> bool:
+        """Check whether an action may run again
+
+        Args:
+            key (Hashable): The widget (or action) to debounce
+            interval (int | float): Minimum time between two runs, in seconds
+
+        Returns:
+            bool: False if key already ran less than interval seconds ago
+        """
+        now = time.monotonic()
+        with self.__lock:
+            blocked_until = self.__debounced.get(key)
+            if blocked_until is not None and now < blocked_until:
+                return False
+            self.__debounced[key] = now + interval
+        return True
+
+    def pump(self):
+        """Run completion callbacks and due delayed calls. Call once per frame from the
+        main loop."""
+        while True:
+            try:
+                callback, future = self.__completed.get_nowait()
+            except Empty:
+                break
+            callback(future)
+
+        now = time.monotonic()
+        due = []
+        with self.__lock:
+            if self.__debounced:
+                # a key whose interval is over debounces nothing, drop it
+                self.__debounced = {key: until for key, until in self.__debounced.items()
+                                    if until > now}
+            while self.__timers and self.__timers[0][0] <= now:
+                timer = heapq.heappop(self.__timers)[2]
+                if timer.key is not None and self.__keyed_timers.get(timer.key) is timer:
+                    del self.__keyed_timers[timer.key]
+                if not timer.cancelled:
+                    due.append(timer)
+        for timer in due:
+            timer.command(*timer.args)
+
+    def shutdown(self):
+        """Drop delayed calls, cancel pending tasks and release the workers"""
+        with self.__lock:
+            self.__timers = []
+            self.__keyed_timers = {}
+            self.__keyed_futures = {}
+            self.__debounced = {}
+        self.__executor.shutdown(wait=False, cancel_futures=True)
+
+
+_DISPATCHER = None
+_DISPATCHER_LOCK = Lock()
+
+
+def get_dispatcher():
+    """Dispatcher shared by every widget. Created on first use."""
+    global _DISPATCHER
+    with _DISPATCHER_LOCK:
+        if _DISPATCHER is None:
+            _DISPATCHER = TaskDispatcher()
+        return _DISPATCHER
+
+
+def shutdown_dispatcher():
+    """Shut the shared dispatcher down. The next get_dispatcher() creates a new one."""
+    global _DISPATCHER
+    with _DISPATCHER_LOCK:
+        dispatcher, _DISPATCHER = _DISPATCHER, None
+    if dispatcher is not None:
+        dispatcher.shutdown()
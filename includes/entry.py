@@ -3,14 +3,22 @@
 A module for Entry in pygame
 """
 
-import re
-from threading import Thread
 from typing import Any, Callable, Literal
 import pygame
 
+try:
+    from includes.colors import compile_pattern, is_hex_color
+    from includes.compositor import get_compositor
+    from includes.dispatcher import get_dispatcher
+    from includes.text_cache import render_text
+except ImportError:
+    from colors import compile_pattern, is_hex_color
+    from compositor import get_compositor
+    from dispatcher import get_dispatcher
+    from text_cache import render_text
+
 ENTRY_ACTIVE = "#1C86EE"
 ENTRY_INACTIVE = "#8DB6CD"
-HEX_COLOR_PATTERN = "^#([0-9A-Fa-f]{6})|#([0-9AFa-f]{8})"
 
 class Entry:
     """Entry
@@ -86,7 +94,7 @@ class Entry:
             raise TypeError(f"invalid type for clear_on_focus: {type(clear_on_focus)}. "
                             "Expected: bool")
         if isinstance(regex_filter, str):
-            self.__regex_pattern = regex_filter
+            self.__regex_pattern = compile_pattern(regex_filter)
         elif regex_filter is None:
             self.__regex_pattern = None
         else:
@@ -101,14 +109,14 @@ class Entry:
         else:
             raise TypeError(f"invalid type for border_radius: {type(border_radius)}. Expected: int")
         if isinstance(active_color, str):
-            if (re.match(HEX_COLOR_PATTERN, active_color)):
+            if (is_hex_color(active_color, allow_alpha=True)):
                 self.__active_color = active_color
             else:
                 raise ValueError(f"invalid value {active_color} for active_color")
         else:
             raise TypeError(f"invalid type for active_color: {type(active_color)}. Expected: str")
         if isinstance(border_color, str):
-            if (re.match(HEX_COLOR_PATTERN, border_color)):
+            if (is_hex_color(border_color, allow_alpha=True)):
                 self.__border_color = border_color
             else:
                 raise ValueError(f"invalid value {border_color} for border_color")
@@ -123,14 +131,14 @@ class Entry:
         else:
             raise TypeError(f"invalid type for state: {type(state)}. Expected: str")
         if isinstance(fg, str):
-            if re.match(HEX_COLOR_PATTERN, fg):
+            if is_hex_color(fg, allow_alpha=True):
                 self.__fg = fg
             else:
                 raise ValueError(f"invalid value for fg: {fg}. Expected: 6-digit valid HEX color code")
         else:
             raise TypeError(f"invalid type for fg: {type(fg)}. Expected: str")
         if isinstance(bg, str):
-            if re.match(HEX_COLOR_PATTERN, bg):
+            if is_hex_color(bg, allow_alpha=True):
                 self.__bg = bg
             else:
                 raise ValueError(f"invalid value for bg: {bg}. Expected: 6-digit valid HEX color code")
@@ -174,16 +182,16 @@ class Entry:
             self.__border_radius = border_radius
         if isinstance(border_width, int):
             self.__border_width = border_width
-        if isinstance(active_color, str) and re.match(HEX_COLOR_PATTERN, active_color):
+        if isinstance(active_color, str) and is_hex_color(active_color, allow_alpha=True):
             self.__active_color = active_color
-        if isinstance(border_color, str) and re.match(HEX_COLOR_PATTERN, border_color):
+        if isinstance(border_color, str) and is_hex_color(border_color, allow_alpha=True):
             self.__border_color = border_color
         if isinstance(state, str):
             if state in ("normal", "disabled"):
                 self.__state = state.lower()
-        if isinstance(fg, str) and re.match(HEX_COLOR_PATTERN, fg):
+        if isinstance(fg, str) and is_hex_color(fg, allow_alpha=True):
             self.__fg = fg
-        if isinstance(bg, str) and re.match(HEX_COLOR_PATTERN, bg):
+        if isinstance(bg, str) and is_hex_color(bg, allow_alpha=True):
             self.__bg = bg
 
     def place(self, x: int, y: int, width: int, height: int):
@@ -196,8 +204,8 @@ class Entry:
             height (int): Entry height
         """
         self.__entry_rect = pygame.Rect((x, y), (width, height))
-        self.__text_surface = self.__font.render(self.__text, True,
-                                                 self.__fg, self.__bg)
+        self.__text_surface = render_text(self.__font, self.__text, True,
+                                         self.__fg, self.__bg)
         if self.__text_surface.get_width() > self.__entry_rect.width - 5:
             if self.__expand_max:
                 self.__entry_rect.width = min(self.__text_surface.get_width() + 5, self.__expand_max)
@@ -212,6 +220,9 @@ class Entry:
         pygame.draw.rect(self.__screen, rect_color, self.__entry_rect, self.__border_width, border_radius=self.__border_radius)
         self.__screen.blit(self.__text_surface,
                          (x+5, y + int(height/2 - self.__text_surface.get_height()/2)))
+        get_compositor().track(self, self.__entry_rect,
+                               (self.__text, self.__font, self.__fg, self.__bg, rect_color,
+                                self.__border_width, self.__border_radius))
 
     def handle_entry_events(self, event):
         if self.__state != "normal":
@@ -229,13 +240,13 @@ class Entry:
                     self.__text = self.__text[:-1]
                 elif event.key == pygame.K_RETURN:
                     if self.__command:
-                        Thread(target=self.__command).start()
+                        get_dispatcher().submit(self.__command)
                     self._cleared_inputs.append(self.__text)
                     self.recently_cleared = self.__text
                     self.__text = ""
                 else:
                     if self.__regex_pattern:
-                        if not re.match(self.__regex_pattern, event.unicode):
+                        if not self.__regex_pattern.match(event.unicode):
                             return
                     if not self.__max_len is None:
                         if len(self.__text) < self.__max_len:
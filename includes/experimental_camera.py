@@ -3,16 +3,23 @@
 A module for camera in Pygame
 This is experimental version of Camera
 """
-import os
-from pathlib import Path, PosixPath, WindowsPath
+from math import ceil
+from pathlib import PosixPath, WindowsPath
 import pygame
 
 try:
+    from includes.assets import get_assets
     from includes.constants import CAMERA_SPEED, ENTER
     from includes.constants import W, A, S, D
+    from includes.compositor import get_compositor
+    from includes.render import DrawOrder, ScaledImageCache, TiledSurface, \
+        visible_blits
 except ImportError:
+    from assets import get_assets
     from constants import CAMERA_SPEED, ENTER
     from constants import W, A, S, D
+    from compositor import get_compositor
+    from render import DrawOrder, ScaledImageCache, TiledSurface, visible_blits
 
 class CameraGroup(pygame.sprite.Group):
     """CameraGroup
@@ -22,7 +29,8 @@ class CameraGroup(pygame.sprite.Group):
                  limit_x_positive: int | None = None, limit_x_negative: int | None = None,
                  limit_y_positive: int | None = None, limit_y_negative: int | None = None,
                  camera_speed: int = CAMERA_SPEED,
-                 key_binding: tuple | list = (W, A, S, D), reset_key: int | None = ENTER):
+                 key_binding: tuple | list = (W, A, S, D), reset_key: int | None = ENTER,
+                 y_sort: bool = True):
         """CameraGroup
         Camera for pygame
 
@@ -38,7 +46,11 @@ class CameraGroup(pygame.sprite.Group):
                 Example: (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d)
             reset_key (int): Key ID. Reset camera to default position.
                 Example: pygame.K_RETURN
+            y_sort (bool): Draw sprites sorted by rect.centery. Set to False to draw
+                sprites in insertion order (faster with many sprites)
         """
+        self.draw_order = DrawOrder(y_sort if isinstance(y_sort, bool) else True)
+        self.last_view = None
         super().__init__()
         self.display_surface = pygame.display.get_surface()
 
@@ -63,16 +75,12 @@ class CameraGroup(pygame.sprite.Group):
         self.ground_surface = None
         if isinstance(ground_surface, pygame.Surface):
             self.ground_surface = ground_surface
-        elif isinstance(ground_surface, str):
-            path = Path(ground_surface)
-            if os.path.exists(path):
-                self.ground_surface = pygame.image.load(ground_surface).convert_alpha()
-        elif isinstance(ground_surface, WindowsPath | PosixPath):
-            if os.path.exists(ground_surface):
-                self.ground_surface = pygame.image.load(str(ground_surface)).convert_alpha()
+        elif isinstance(ground_surface, str | WindowsPath | PosixPath):
+            self.ground_surface = get_assets().image(ground_surface)
         if not self.ground_surface:
             self.ground_surface = pygame.Surface((0, 0))
         self.ground_rect = self.ground_surface.get_rect(topleft = (0,0))
+        self.ground_tiles = TiledSurface(self.ground_surface, self.ground_rect.topleft)
 
         if isinstance(limit_x_positive, int):
             if limit_x_positive < 0:
@@ -108,13 +116,8 @@ class CameraGroup(pygame.sprite.Group):
         self.half_w = self.display_surface.get_size()[0] // 2
         self.half_h = self.display_surface.get_size()[1] // 2
         self.zoom_scale = 1
-        self.internal_surf_size = (2500,2500)
-        self.internal_surf = pygame.Surface(self.internal_surf_size, pygame.SRCALPHA)
-        self.internal_rect = self.internal_surf.get_rect(center = (self.half_w,self.half_h))
-        self.internal_surface_size_vector = pygame.math.Vector2(self.internal_surf_size)
-        self.internal_offset = pygame.math.Vector2()
-        self.internal_offset.x = self.internal_surf_size[0] // 2 - self.half_w
-        self.internal_offset.y = self.internal_surf_size[1] // 2 - self.half_h
+        self.scaled_images = ScaledImageCache()
+        self.ground_view = None
 
 
     def keyboard_control(self, allow_vertical: bool = True, allow_horizontal: bool = True):
@@ -170,7 +173,8 @@ class CameraGroup(pygame.sprite.Group):
                limit_x_positive: int | None = ..., limit_x_negative: int | None = ...,
                limit_y_positive: int | None = ..., limit_y_negative: int | None = ...,
                camera_speed: int = ...,
-               key_binding: tuple | list = ..., reset_key: int | None = ...):
+               key_binding: tuple | list = ..., reset_key: int | None = ...,
+               y_sort: bool = ...):
         """Camera configuration
 
         Args:
@@ -183,16 +187,15 @@ class CameraGroup(pygame.sprite.Group):
             key_binding (tuple | list): Camera keybinding
                 Format: (Up, Left, Down, Right)
                 Example: (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d)
+            y_sort (bool): Draw sprites sorted by rect.centery
         """
         if isinstance(ground_surface, pygame.Surface):
             self.ground_surface = ground_surface
-        elif isinstance(ground_surface, str):
-            path = Path(ground_surface)
-            if os.path.exists(path):
-                self.ground_surface = pygame.image.load(ground_surface).convert_alpha()
-        elif isinstance(ground_surface, WindowsPath | PosixPath):
-            if os.path.exists(ground_surface):
-                self.ground_surface = pygame.image.load(str(ground_surface)).convert_alpha()
+        elif isinstance(ground_surface, str | WindowsPath | PosixPath):
+            self.ground_surface = get_assets().image(ground_surface) or self.ground_surface
+        if self.ground_surface is not self.ground_tiles.surface:
+            self.ground_rect = self.ground_surface.get_rect(topleft = (0,0))
+            self.ground_tiles = TiledSurface(self.ground_surface, self.ground_rect.topleft)
 
         if isinstance(limit_x_positive, int):
             if limit_x_positive < 0:
@@ -230,6 +233,17 @@ class CameraGroup(pygame.sprite.Group):
         if isinstance(reset_key, int):
             self.reset_key = reset_key
 
+        if isinstance(y_sort, bool):
+            self.draw_order.y_sort = y_sort
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.draw_order.add(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.draw_order.remove(sprite)
+
     def custom_draw(self, allow_vertical: bool = True, allow_horizontal: bool = True):
         """custom draw
         Draw
@@ -239,36 +253,85 @@ class CameraGroup(pygame.sprite.Group):
             allow_horizontal (bool, optional): control horizontal movement
         """
         self.keyboard_control(allow_vertical, allow_horizontal)
-
-        ground_offset = self.ground_rect.topleft - self.offset
-        self.display_surface.blit(self.ground_surface, ground_offset)
-
-        for sprite in sorted(self.sprites(), key = lambda sprite: sprite.rect.centery):
-            offset_pos = sprite.rect.topleft - self.offset
-            self.display_surface.blit(sprite.image, offset_pos)
+        self.custom_draw_no_control()
+
+    def custom_draw_no_control(self):
+        """Draw at zoom 1, without reading the keyboard"""
+        view = self.camera_rect
+        compositor = get_compositor()
+        if (view.topleft, self.ground_tiles) != self.last_view:
+            self.last_view = (view.topleft, self.ground_tiles)
+            compositor.mark_all()
+        blit_sequence = self.ground_tiles.visible_blits(view)
+        blit_sequence.extend(visible_blits(self.draw_order.sprites(), view, compositor))
+        self.display_surface.blits(blit_sequence, doreturn=False)
 
     def zoom_keyboard_control(self, max_zoom: int | float = 2.0, min_zoom: int | float = 0.5):
         keys = pygame.key.get_pressed()
         if keys[pygame.K_q]:
-            self.zoom_scale = min(self.zoom_scale + 0.1, max_zoom)
+            self.zoom_scale = round(min(self.zoom_scale + 0.1, max_zoom), 2)
         if keys[pygame.K_e]:
-            self.zoom_scale = max(self.zoom_scale - 0.1, min_zoom)
+            self.zoom_scale = round(max(self.zoom_scale - 0.1, min_zoom), 2)
+
+    def __scale_ground(self, view: pygame.Rect, zoom: float):
+        """The part of the ground inside view, scaled by zoom, and its screen position.
+        None when no ground is visible."""
+        clip = self.ground_rect.clip(view)
+        if not clip.width or not clip.height:
+            return None
+        center_x, center_y = self.camera_rect.center
+        left = round(self.half_w + (clip.left - center_x) * zoom)
+        top = round(self.half_h + (clip.top - center_y) * zoom)
+        right = round(self.half_w + (clip.right - center_x) * zoom)
+        bottom = round(self.half_h + (clip.bottom - center_y) * zoom)
+        part = self.ground_surface.subsurface(clip.move(-self.ground_rect.x,
+                                                        -self.ground_rect.y))
+        return (pygame.transform.scale(part, (max(1, right - left), max(1, bottom - top))),
+                (left, top))
 
     def experimental_draw(self, allow_vertical: bool = True, allow_horizontal: bool = True):
+        """experimental draw
+        Draw with zoom. Sprites are scaled once per zoom level (cached) and drawn straight
+        to the display around the camera center. Only the visible part of the ground is
+        scaled, again when the view moves.
+
+        Args:
+            allow_vertical (bool, optional): control vertical movement
+            allow_horizontal (bool, optional): control horizontal movement
+        """
         self.zoom_keyboard_control()
         self.keyboard_control(allow_vertical, allow_horizontal)
 
-        self.internal_surf.fill('#FFFFFF')
-
-        ground_offset = self.ground_rect.topleft - self.offset + self.internal_offset
-        self.internal_surf.blit(self.ground_surface, ground_offset)
-
-        # active elements
-        for sprite in sorted(self.sprites(),key = lambda sprite: sprite.rect.centery):
-            offset_pos = sprite.rect.topleft - self.offset + self.internal_offset
-            self.internal_surf.blit(sprite.image,offset_pos)
-
-        scaled_surf = pygame.transform.scale(self.internal_surf,self.internal_surface_size_vector * self.zoom_scale)
-        scaled_rect = scaled_surf.get_rect(center = (self.half_w,self.half_h))
-
-        self.display_surface.blit(scaled_surf,scaled_rect)
+        zoom = self.zoom_scale
+        if zoom == 1:
+            self.custom_draw_no_control()
+            return
+
+        view = pygame.Rect(0, 0, ceil(self.half_w * 2 / zoom) + 1,
+                           ceil(self.half_h * 2 / zoom) + 1)
+        view.center = self.camera_rect.center
+        center_x, center_y = self.camera_rect.center
+        compositor = get_compositor()
+        if (zoom, view.topleft, self.ground_tiles) != self.last_view:
+            self.last_view = (zoom, view.topleft, self.ground_tiles)
+            self.ground_view = self.__scale_ground(view, zoom)
+            compositor.mark_all()
+
+        blit_sequence = []
+        if self.ground_view is not None:
+            scaled, position = self.ground_view
+            blit_sequence.append(self.ground_view)
+            compositor.track(self, scaled.get_rect(topleft=position).clip(
+                self.display_surface.get_rect()), scaled)
+        else:
+            compositor.forget(self)
+        for sprite in self.draw_order.sprites():
+            rect = sprite.rect
+            if not view.colliderect(rect):
+                continue
+            scaled = self.scaled_images.get(sprite.image, zoom)
+            position = (round(self.half_w + (rect.x - center_x) * zoom),
+                        round(self.half_h + (rect.y - center_y) * zoom))
+            blit_sequence.append((scaled, position))
+            compositor.track(sprite, scaled.get_rect(topleft=position), scaled)
+        self.display_surface.blits(blit_sequence, doreturn=False)
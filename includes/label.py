@@ -4,12 +4,19 @@ A module for Label in pygame
 """
 
 from typing import Literal
-import re
 import pygame
 
+try:
+    from includes.colors import is_hex_color
+    from includes.compositor import get_compositor
+    from includes.text_cache import render_text
+except ImportError:
+    from colors import is_hex_color
+    from compositor import get_compositor
+    from text_cache import render_text
+
 BLACK = "#000000"
 LIGHT_GRAY2 = "#EcEcEc"
-HEX_COLOR_PATTERN = "^#([0-9A-Fa-f]{3}){1,2}$"
 
 class Label:
     """Label
@@ -28,7 +35,6 @@ class Label:
     def __init__(self, master: pygame.Surface, font: pygame.font.Font, text: str | None = ...,
                  fg: str | None = ..., bg: str | None = ..., border_radius: int | None = ...,
                  justify: Literal["left", "right", "center"] = ...):
-        self.__pattern = HEX_COLOR_PATTERN
         if master and isinstance(master, pygame.Surface):
             self.__screen = master
         elif not isinstance(master, pygame.Surface):
@@ -38,14 +44,14 @@ class Label:
         elif not isinstance(font, pygame.font.Font):
             raise TypeError("font must be pygame.font.Font")
         if fg and isinstance(fg, str):
-            if re.match(self.__pattern, fg):
+            if is_hex_color(fg):
                 self.__fg = fg
             else:
                 self.__fg = BLACK
         else:
             self.__fg = BLACK
         if bg and isinstance(bg, str):
-            if re.match(self.__pattern, bg):
+            if is_hex_color(bg):
                 self.__bg = bg
             else:
                 self.__bg = LIGHT_GRAY2
@@ -87,7 +93,7 @@ class Label:
             height = self.__font.size(self.__text)[1]
 
         self.__top_rect = pygame.Rect((x, y, width, height))
-        self.__text_surface = self.__font.render(self.__text, True, self.__fg)
+        self.__text_surface = render_text(self.__font, self.__text, True, self.__fg)
         self.__text_rect = self.__text_surface.get_rect()
         self.__text_rect.centery = self.__top_rect.centery
         if use_justify:
@@ -104,6 +110,9 @@ class Label:
         pygame.draw.rect(self.__screen, self.__bg, self.__top_rect,
                          border_radius=self.__border_radius)
         self.__screen.blit(self.__text_surface, self.__text_rect)
+        get_compositor().track(self, self.__top_rect,
+                               (self.__text, self.__font, self.__fg, self.__bg, self.__justify,
+                                self.__border_radius))
 
     def config(self, text: str | None = ..., font: pygame.font.Font | None = ...,
                fg: str | None = ..., bg: str | None = ..., border_radius: int | None = ...,
@@ -122,9 +131,9 @@ class Label:
             self.__text = text
         if font and isinstance(font, pygame.font.Font):
             self.__font = font
-        if fg and isinstance(fg, str) and re.match(self.__pattern, fg):
+        if fg and isinstance(fg, str) and is_hex_color(fg):
             self.__fg = fg
-        if bg and isinstance(bg, str) and re.match(self.__pattern, bg):
+        if bg and isinstance(bg, str) and is_hex_color(bg):
             self.__bg = bg
         if border_radius and isinstance(border_radius, int):
             self.__border_radius = border_radius
@@ -0,0 +1,197 @@
+"""Launcher
+
+A module for running each simulation in its own process
+
+Every launch starts a new process, so the persistent display and cached assets of
+includes.scene only last for the scene switches made inside one simulation window.
+"""
+import multiprocessing
+from multiprocessing.connection import Connection
+from threading import Thread
+
+try:
+    from includes.simulations import SIMULATIONS
+except ImportError:
+    from simulations import SIMULATIONS
+
+NOT_STARTED = "not started"
+STARTING = "starting"
+RUNNING = "running"
+STOPPED = "stopped"
+FAILED = "failed"
+STOP_TIMEOUT = 2
+
+_STOP = "stop"
+_STATUS = "status"
+
+
+def _listen(conn: Connection, manager):
+    """Wait for the stop message in the simulation process"""
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            # the launcher is gone, nobody can stop this simulation anymore
+            manager.stop()
+            return
+        if message == _STOP:
+            manager.stop()
+            return
+
+
+def _run_simulation(name: str, conn: Connection, scene_aliases: dict | None = None):
+    """Entry point of a simulation process"""
+    try:
+        try:
+            from includes.scene import get_scene_manager
+        except ImportError:
+            from scene import get_scene_manager
+        manager = get_scene_manager()
+        Thread(target=_listen, args=(conn, manager), daemon=True).start()
+        conn.send((_STATUS, RUNNING, None))
+        manager.run(name, scene_aliases)
+    except Exception as error:
+        conn.send((_STATUS, FAILED, repr(error)))
+        raise
+    try:
+        conn.send((_STATUS, STOPPED, None))
+    except OSError:
+        pass
+    conn.close()
+
+
+class SimulationProcess:
+    """SimulationProcess
+    A simulation running in a child process, controlled through a pipe
+    """
+    def __init__(self, name: str, scene_aliases: dict | None = None):
+        """SimulationProcess
+
+        Args:
+            name (str): Key in SIMULATIONS
+            scene_aliases (dict | None, optional): Passed to SceneManager.run.
+            Defaults to None.
+
+        Raises:
+            ValueError: Unknown simulation
+        """
+        if name not in SIMULATIONS:
+            raise ValueError(f"invalid value for name: {name}. "
+                             f"Expected: {', '.join(SIMULATIONS)}")
+        self.__name = name
+        self.__scene_aliases = scene_aliases
+        self.__process = None
+        self.__conn = None
+        self.__status = NOT_STARTED
+        self.__error = None
+
+    @property
+    def name(self):
+        return self.__name
+
+    @property
+    def error(self):
+        return self.__error
+
+    @property
+    def alive(self):
+        return self.__process is not None and self.__process.is_alive()
+
+    def start(self):
+        """Start the simulation. Does nothing if it is already running."""
+        if self.alive:
+            return
+        self.__conn, child_conn = multiprocessing.Pipe()
+        self.__process = multiprocessing.Process(target=_run_simulation,
+                                                 args=(self.__name, child_conn,
+                                                       self.__scene_aliases),
+                                                 name=f"simulation-{self.__name}", daemon=True)
+        self.__status = STARTING
+        self.__error = None
+        self.__process.start()
+        child_conn.close()
+
+    def stop(self, timeout: int | float = STOP_TIMEOUT):
+        """Ask the simulation to close its window, kill it after timeout seconds"""
+        if not self.alive:
+            return
+        try:
+            self.__conn.send(_STOP)
+        except (BrokenPipeError, OSError):
+            pass
+        self.__process.join(timeout)
+        if self.__process.is_alive():
+            self.__process.terminate()
+            self.__process.join()
+        self.poll()
+        if self.__status != FAILED:
+            self.__status = STOPPED
+
+    def poll(self) -> str:
+        """Read pending status messages without blocking
+
+        Returns:
+            str: current status
+        """
+        if self.__conn is None:
+            return self.__status
+        try:
+            while self.__conn.poll():
+                _, self.__status, error = self.__conn.recv()
+                if error is not None:
+                    self.__error = error
+        except (EOFError, OSError):
+            pass
+        if self.__status in (STARTING, RUNNING) and not self.alive:
+            self.__status = FAILED if self.__process.exitcode else STOPPED
+        if self.__status in (STOPPED, FAILED) and not self.alive:
+            self.__conn.close()
+            self.__conn = None
+        return self.__status
+
+    def status(self) -> str:
+        """Current status: "not started", "starting", "running", "stopped" or "failed" """
+        return self.poll()
+
+
+class Launcher:
+    """Launcher
+    Start, stop and watch simulation processes, one process per simulation
+    """
+    def __init__(self, scene_aliases: dict | None = None):
+        """Launcher
+
+        Args:
+            scene_aliases (dict | None, optional): Scene name -> scene the F-key of that
+            scene opens in every simulation, e.g. {"freefall": "freefall_exp"}.
+            Defaults to None.
+        """
+        self.__scene_aliases = scene_aliases
+        self.__processes = {}
+
+    def start(self, name: str):
+        """Start a simulation, or do nothing if it is already running"""
+        process = self.__processes.get(name)
+        if process is None:
+            process = self.__processes[name] = SimulationProcess(name, self.__scene_aliases)
+        process.start()
+
+    def stop(self, name: str):
+        """Stop a simulation"""
+        process = self.__processes.get(name)
+        if process is not None:
+            process.stop()
+
+    def stop_all(self):
+        """Stop every simulation"""
+        for process in self.__processes.values():
+            process.stop()
+
+    def status(self, name: str) -> str:
+        """Status of a simulation"""
+        process = self.__processes.get(name)
+        return NOT_STARTED if process is None else process.status()
+
+    def statuses(self) -> dict:
+        """Status of every simulation started at least once"""
+        return {name: process.status() for name, process in self.__processes.items()}
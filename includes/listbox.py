@@ -4,15 +4,26 @@ Aa module for creating ListBox in pygame
 """
 
 import math
-import time
-import re
 import enum
+from collections import OrderedDict
 from typing import Any, Callable, Literal
-from threading import Thread
 
 import pygame
 from pygame import Surface
 
+try:
+    from includes.colors import is_hex_color
+    from includes.compositor import get_compositor
+    from includes.dispatcher import get_dispatcher
+    from includes.text_cache import render_text
+    from includes.ui_events import get_ui_dispatcher
+except ImportError:
+    from colors import is_hex_color
+    from compositor import get_compositor
+    from dispatcher import get_dispatcher
+    from text_cache import render_text
+    from ui_events import get_ui_dispatcher
+
 _WHITE = "#FFFFFF"
 _BLACK = "#111111"
 _GRAY = "#8c8c8c"
@@ -20,7 +31,8 @@ _YELLOW = "#DDDD00"
 _BLUE = "#00AAFF"
 _RED = "#FF4444"
 _GREEN = "#37c421"
-_HEX_COLOR_PATTERN = "^#([0-9A-Fa-f]{3}){1,2}$"
+ROW_CACHE_SIZE = 256
+SCROLL_SMOOTHING = 0.35
 _TYPE_MSG = lambda name, param, exp: f"invalid type for {name}: {type(param)}. Expected: {exp}"
 _VAL_MSG = lambda name, param, expect: f"invalid value for {name}: {param}. Expected: {expect}"
 
@@ -41,7 +53,7 @@ def _type_check(names: list, *params, expected_types: list):
 
 def _color_check(names: list, params: list, expected_value: str):
     for name, param in zip(names, params):
-        if not re.match(_HEX_COLOR_PATTERN, param):
+        if not is_hex_color(param):
             raise ValueError(_VAL_MSG(name, param, expected_value))
 
 class _ListBoxItem:
@@ -81,40 +93,32 @@ class _ListBoxItem:
         if value in ("available", "unavailable", "selected", "disabled"):
             self.__status = value
 
-    def run_command(self, use_thread: bool = False, wait_join: bool = True,
-                     is_lambda: bool = False):
-        if callable(self.__command) and self.__command.__name__ == "<lambda>":
-            is_lambda = True
-        if not self.__executed:
-            self.__executed = True
-            if is_lambda and self.__args:
-                self.__command(*self.__args)
-                time.sleep(self.__delay)
-                self.__status = ItemStatus.AVAILABLE.value
-                self.__executed = False
-                return
-            elif is_lambda and not self.__args:
-                self.__command()
-                time.sleep(self.__delay)
-                self.__status = ItemStatus.AVAILABLE.value
-                self.__executed = False
-                return
-            if use_thread and self.__args and not wait_join:
-                work = lambda: Thread(target=self.__command, args=tuple(self.__args)).start()
-                work()
-            elif not use_thread and self.__args:
-                self.__command(*self.__args)
-            elif use_thread and not self.__args and not wait_join:
-                work = lambda: Thread(target=self.__command).start()
-                work()
-            elif not use_thread and not self.__args:
-                self.__command()
-            elif use_thread and self.__args and wait_join:
-                work = Thread(target=self.__command, args=tuple(self.__args))
-                work.start()
-                work.join()
-            self.__executed = False
-        time.sleep(self.__delay)
+    def run_command(self, use_thread: bool = True):
+        """Run item command. The item becomes available again delay_between_execution
+        seconds after the command finished.
+
+        Args:
+            use_thread (bool, optional): Run command on the shared dispatcher pool.
+            Defaults to True.
+        """
+        if self.__executed:
+            return
+        self.__executed = True
+        command = self.__command if callable(self.__command) else lambda *args: None
+        args = tuple(self.__args) if self.__args else ()
+        if use_thread:
+            get_dispatcher().submit(command, *args, callback=self.__finish)
+            return
+        try:
+            command(*args)
+        finally:
+            self.__finish()
+
+    def __finish(self, _future=None):
+        get_dispatcher().call_later(self.__delay, self.__release, key=self)
+
+    def __release(self):
+        self.__executed = False
         self.__status = ItemStatus.AVAILABLE.value
 
     def config(self, name = ..., command = ..., text = ..., status = ...):
@@ -166,8 +170,16 @@ class Listbox:
         self.__selected_color = selected_color
         self.__selected_border_color = selected_border_color
 
-        self.__items = []
-        self.__first_index = 0
+        self.__items = {}
+        self.__order = []
+        self.__order_dirty = False
+        self.__row_cache = OrderedDict()
+        self.__main_surface = None
+        self.__main_rect = pygame.Rect(0, 0, 0, 0)
+        self.__view_rect = pygame.Rect(0, 0, 0, 0)
+        self.__drawn_state = None
+        self.__scroll = 0.0
+        self.__target_scroll = 0.0
         self.__colors = {
             "available": self.__available_color,
             "unavailable": self.__unavailable_color,
@@ -175,25 +187,74 @@ class Listbox:
             "disabled": "#9c9c9c"
         }
 
+    def __ordered_items(self):
+        if self.__order_dirty:
+            self.__order = list(self.__items.values())
+            self.__order_dirty = False
+        return self.__order
+
     def add_item(self, name: str = "", command: Callable[[], Any] = ...,
                  args: tuple | list = ..., text: str = "",
                  status: Literal["available", "unavailable", "selected",
                                  "disabled"] = "available"):
-        if len(self.__items) < self.__max_item:
-            item = _ListBoxItem(name, command, args, text, status)
-            self.__items.append(item)
+        """Add an item at the end of the list. Names are unique: adding an existing name
+        replaces that item, in place."""
+        if name not in self.__items and len(self.__items) >= self.__max_item:
+            return
+        item = _ListBoxItem(name, command, args, text, status)
+        previous = self.__items.get(name)
+        self.__items[name] = item
+        if previous is None and not self.__order_dirty:
+            self.__order.append(item)
+        else:
+            self.__row_cache.pop(previous, None)
+            self.__order_dirty = True
 
     def remove_item(self, name: str = ""):
-        for item in self.__items:
-            if item.name == name:
-                self.__items.remove(item)
+        item = self.__items.pop(name, None)
+        if item is None:
+            return
+        self.__row_cache.pop(item, None)
+        self.__order_dirty = True
 
     def config_item(self, index: int, name: str = ..., command: Callable[[], Any] = ...,
                     text: str = ..., status: str = ...):
-        self.__items[index].config(name, command, text, status)
+        item = self.__ordered_items()[index]
+        old_name = item.name
+        item.config(name, command, text, status)
+        if item.name != old_name:
+            del self.__items[old_name]
+            replaced = self.__items.get(item.name)
+            if replaced is not None:
+                self.__row_cache.pop(replaced, None)
+            self.__items[item.name] = item
+            self.__order_dirty = True
+
+    def __row_surface(self, item: _ListBoxItem, width: int):
+        """Row surface of item, rendered on a cache miss"""
+        key = (item.text, item.status, width, self.__font)
+        cached = self.__row_cache.get(item)
+        if cached is not None and cached[0] == key:
+            self.__row_cache.move_to_end(item)
+            return cached[1]
+        row = pygame.Surface((width, self.__item_height))
+        row.fill(self.__bg_color)
+        pygame.draw.rect(row, self.__colors[item.status], row.get_rect(), 3)
+        text_surface = render_text(self.__font, item.text, True, self.__text_color)
+        row.blit(text_surface, (5, (self.__item_height - text_surface.get_height()) // 2))
+        self.__row_cache[item] = (key, row)
+        if len(self.__row_cache) > ROW_CACHE_SIZE:
+            self.__row_cache.popitem(last=False)
+        return row
+
+    def __max_scroll(self):
+        return max(0, len(self.__items) * self.__item_height - self.__view_rect.height)
 
     def place(self, x: int, y: int, width: int, height: int):
-        """Place button on Surface
+        """Place listbox on Surface
+
+        Only the rows in view are drawn. Rows are rendered once and cached, and the list
+        surface is only redrawn when the scroll position or a visible row changed.
 
         Args:
             x (int): Position on x-axis
@@ -201,73 +262,85 @@ class Listbox:
             width (int): Listbox width
             height (int): Listbox height
         """
-        self.__main_surface = pygame.Surface((width - 10, height - 10))
+        size = (max(1, width - 10), max(1, height - 10))
+        if self.__main_surface is None or self.__main_surface.get_size() != size:
+            self.__main_surface = pygame.Surface(size)
+            self.__drawn_state = None
         self.__main_rect = pygame.Rect((x, y), (width, height))
+        self.__view_rect = pygame.Rect((x + 5, y + 5), size)
         self.__max_item_on_page = math.floor(height / self.__item_height)
 
-        self.__main_surface.fill(self.__bg_color)
-        self.__text_rects = []
-        self.__text_surfaces = []
+        self.__target_scroll = min(max(0.0, self.__target_scroll), self.__max_scroll())
+        distance = self.__target_scroll - self.__scroll
+        if abs(distance) < 0.5:
+            self.__scroll = self.__target_scroll
+        else:
+            self.__scroll += distance * SCROLL_SMOOTHING
+        offset = int(self.__scroll)
+
+        items = self.__ordered_items()
+        first = offset // self.__item_height
+        last = min(len(items), (offset + size[1]) // self.__item_height + 1)
+        visible = items[first:last]
+        state = (offset, size, self.__font,
+                 tuple((item, item.text, item.status) for item in visible))
+        if state != self.__drawn_state:
+            self.__main_surface.fill(self.__bg_color)
+            self.__main_surface.blits(
+                [(self.__row_surface(item, size[0]),
+                  (0, (first + index) * self.__item_height - offset))
+                 for index, item in enumerate(visible)],
+                doreturn=False)
+            self.__drawn_state = state
+
         pygame.draw.rect(self.__screen, _BLACK, self.__main_rect)
-        for index, item in enumerate(self.__items[self.__first_index:self.__max_item_on_page]):
-            text_surface = self.__font.render(item.text, True, self.__text_color)
-            display_rect = pygame.Rect(
-                0,
-                index * self.__item_height,
-                width - 10,
-                self.__item_height
-            )
-            collision_rect = pygame.Rect(
-                (x, y + index * self.__item_height), (width, self.__item_height)
-            )
-            pygame.draw.rect(self.__main_surface, self.__colors[item.status], display_rect, 3)
-            self.__text_rects.append(collision_rect)
-            self.__text_surfaces.append(text_surface)
-        self.__screen.blit(self.__main_surface, (x + 5, y + 5))
-        for index, text_surface in enumerate(self.__text_surfaces):
-            self.__screen.blit(
-                text_surface,
-                (
-                    x+10,
-                    int(3 + y + index * self.__item_height + text_surface.get_height() / 2)
-                )
-            )
-        self.__check_click()
+        self.__screen.blit(self.__main_surface, self.__view_rect)
+        get_compositor().track(self, self.__main_rect, state)
+        get_ui_dispatcher().register(self, self.__main_rect)
 
     def scroll_down(self, step: int):
-        if not self.__first_index + abs(step) > len(self.__items):
-            self.__first_index += abs(step)
-        else:
-            self.__first_index += abs(len(self.__items) - self.__first_index)
+        """Scroll step rows down. The view glides there over the next frames."""
+        self.__target_scroll = min(self.__target_scroll + abs(step) * self.__item_height,
+                                   self.__max_scroll())
 
     def scroll_up(self, step: int):
-        if not self.__first_index - abs(step) < 0:
-            self.__first_index -= abs(step)
-        else:
-            self.__first_index = 0
+        """Scroll step rows up. The view glides there over the next frames."""
+        self.__target_scroll = max(0.0, self.__target_scroll - abs(step) * self.__item_height)
 
-    def __check_click(self):
-        """Check button click
+    def handle_mouse(self, event: pygame.event.Event) -> bool:
+        """Handle a mouse event routed by the UI event dispatcher. The clicked row is
+        computed from the mouse position, rows are not hit-tested one by one.
+
+        Args:
+            event (pygame.event.Event): MOUSEBUTTONDOWN, MOUSEBUTTONUP or MOUSEWHEEL event
+
+        Returns:
+            bool: True if the event was consumed
         """
-        if self.__state == WidgetState.DISABLED:
-            return
-        mouse_pos = pygame.mouse.get_pos()
-        if not pygame.mouse.get_pressed()[0]:
-            return
-        if not any(rect.collidepoint(mouse_pos) for rect in self.__text_rects):
-            return
-        for rect, item in zip(self.__text_rects, self.__items):
-            if not rect.collidepoint(mouse_pos):
-                continue
-            if not item.status == ItemStatus.AVAILABLE.value:
-                return
+        if self.__state == WidgetState.DISABLED.value:
+            return False
+        if event.type == pygame.MOUSEWHEEL:
+            if event.y > 0:
+                self.scroll_up(event.y)
+            elif event.y < 0:
+                self.scroll_down(event.y)
+            return True
+        if event.type != pygame.MOUSEBUTTONDOWN or event.button != pygame.BUTTON_LEFT:
+            return False
+        if not self.__view_rect.collidepoint(event.pos):
+            return True
+        row = int(event.pos[1] - self.__view_rect.y + self.__scroll) // self.__item_height
+        items = self.__ordered_items()
+        if not 0 <= row < len(items):
+            return True
+        item = items[row]
+        if item.status == ItemStatus.AVAILABLE.value:
             item.config(status=ItemStatus.SELECTED.value)
-            # if pygame.event.peek(pygame.MOUSEBUTTONDOWN):
-            wc = lambda: Thread(target=item.run_command).start()
-            wc()
+            item.run_command()
+        return True
 
     def get_objects(self):
-        return self.__items
+        return self.__ordered_items()
 
     def __run_checkers(self, *params):
         _type_check(
@@ -0,0 +1,304 @@
+"""Profiler
+
+A module for timing the phases of each frame in pygame
+"""
+import csv
+import json
+import os
+import time
+from pathlib import Path
+from threading import Lock
+import pygame
+
+try:
+    from includes.assets import get_assets
+    from includes.compositor import get_compositor
+    from includes.text_cache import render_text
+except ImportError:
+    from assets import get_assets
+    from compositor import get_compositor
+    from text_cache import render_text
+
+PHASES = ("events", "physics", "draw", "widgets", "flip")
+PROFILE_ENV = "SIM_PROFILE"
+PROFILER_KEY = pygame.K_F12
+WINDOW = 240
+OVERLAY_REFRESH = 0.5
+OVERLAY_POSITION = (5, 5)
+OVERLAY_FONT_SIZE = 18
+PERCENTILES = (50, 95, 99)
+
+
+class RingBuffer:
+    """RingBuffer
+    The last size samples, in a list allocated once. Appending and reading take a lock,
+    so one thread can append while another reads.
+    """
+    def __init__(self, size: int = WINDOW):
+        self.__lock = Lock()
+        self.__samples = [0.0] * size
+        self.__index = 0
+        self.__count = 0
+        self.__total = 0
+
+    @property
+    def count(self):
+        """Samples recorded since the last clear, including the ones dropped"""
+        return self.__total
+
+    def append(self, value: float):
+        with self.__lock:
+            self.__samples[self.__index] = value
+            self.__index = (self.__index + 1) % len(self.__samples)
+            self.__count = min(self.__count + 1, len(self.__samples))
+            self.__total += 1
+
+    def values(self) -> list:
+        """Samples still in the buffer, oldest first"""
+        with self.__lock:
+            return self.__ordered()
+
+    def snapshot(self) -> tuple:
+        """(count, values()) read together"""
+        with self.__lock:
+            return self.__total, self.__ordered()
+
+    def __ordered(self) -> list:
+        if self.__count < len(self.__samples):
+            return self.__samples[:self.__count]
+        return self.__samples[self.__index:] + self.__samples[:self.__index]
+
+    def clear(self):
+        with self.__lock:
+            self.__index = 0
+            self.__count = 0
+            self.__total = 0
+
+
+def _percentile(ordered: list, percent: int | float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class FrameProfiler:
+    """FrameProfiler
+    Time each phase of the main loop over the last WINDOW frames
+
+    The main loop calls begin_frame() and then mark(phase) after each phase; a phase lasts
+    from the previous mark. Work done on other threads is reported with record(). While
+    disabled every call returns at once, so the hooks can stay in the main loop.
+
+    Set the SIM_PROFILE environment variable to start enabled. When it is a path ending
+    in .csv or .json, a summary is written there when the main loop exits. PROFILER_KEY
+    turns profiling and the overlay on and off.
+    """
+    def __init__(self, window: int = WINDOW):
+        """FrameProfiler
+
+        Args:
+            window (int, optional): Frames kept for percentiles. Defaults to WINDOW.
+        """
+        self.__window = window
+        self.__enabled = False
+        self.__overlay = False
+        self.__buffers = {}
+        self.__frame_start = 0.0
+        self.__last = 0.0
+        self.__lines = []
+        self.__next_refresh = 0.0
+        self.__overlay_rect = None
+        self.__dump_path = None
+        self.clear()
+
+        setting = os.environ.get(PROFILE_ENV, "")
+        if setting and setting != "0":
+            self.__enabled = True
+            if Path(setting).suffix.lower() in (".csv", ".json"):
+                self.__dump_path = Path(setting)
+
+    @property
+    def enabled(self):
+        return self.__enabled
+
+    @property
+    def overlay(self):
+        return self.__overlay
+
+    @property
+    def dump_path(self):
+        return self.__dump_path
+
+    def enable(self, overlay: bool = True):
+        """Start recording, and show the overlay when overlay is True"""
+        self.__enabled = True
+        self.__overlay = overlay
+        self.__frame_start = self.__last = time.perf_counter()
+
+    def disable(self):
+        """Stop recording and hide the overlay. Recorded samples are kept."""
+        self.__enabled = False
+        self.__hide_overlay()
+
+    def toggle(self):
+        """Turn profiling and the overlay on, or off when the overlay is shown"""
+        if self.__overlay:
+            self.disable()
+        else:
+            self.enable()
+
+    def clear(self):
+        """Drop every sample"""
+        self.__buffers = {phase: RingBuffer(self.__window) for phase in PHASES + ("frame",)}
+        self.__lines = []
+        self.__next_refresh = 0.0
+
+    def handle_event(self, event: pygame.event.Event) -> bool:
+        """Toggle on PROFILER_KEY
+
+        Returns:
+            bool: True when the event was used
+        """
+        if event.type == pygame.KEYDOWN and event.key == PROFILER_KEY:
+            self.toggle()
+            return True
+        return False
+
+    def begin_frame(self):
+        """Start timing a frame"""
+        if not self.__enabled:
+            return
+        self.__frame_start = self.__last = time.perf_counter()
+
+    def mark(self, phase: str):
+        """End phase, which started at the previous mark"""
+        if not self.__enabled:
+            return
+        now = time.perf_counter()
+        self.record(phase, now - self.__last)
+        self.__last = now
+
+    def end_frame(self):
+        """Record the time since begin_frame() as the frame time"""
+        if not self.__enabled:
+            return
+        self.record("frame", time.perf_counter() - self.__frame_start)
+
+    def record(self, phase: str, seconds: float):
+        """Add a sample to phase. Safe to call from other threads.
+
+        Args:
+            phase (str): Phase name. Names not in PHASES get their own buffer
+            seconds (float): Time spent
+        """
+        if not self.__enabled:
+            return
+        buffer = self.__buffers.get(phase)
+        if buffer is None:
+            buffer = self.__buffers.setdefault(phase, RingBuffer(self.__window))
+        buffer.append(seconds)
+
+    def stats(self) -> dict:
+        """Per-phase statistics over the last frames, in milliseconds
+
+        Returns:
+            dict: phase -> {"samples", "mean", "p50", "p95", "p99", "max"}
+        """
+        stats = {}
+        for phase, buffer in list(self.__buffers.items()):
+            count, values = buffer.snapshot()
+            ordered = sorted(values)
+            if not ordered:
+                continue
+            phase_stats = {"samples": count,
+                           "mean": sum(ordered) / len(ordered) * 1000}
+            for percent in PERCENTILES:
+                phase_stats[f"p{percent}"] = _percentile(ordered, percent) * 1000
+            phase_stats["max"] = ordered[-1] * 1000
+            stats[phase] = phase_stats
+        return stats
+
+    def draw_overlay(self, surface: pygame.Surface):
+        """Draw the statistics on surface. Time spent here is not counted in any phase."""
+        if not self.__overlay:
+            return
+        now = time.perf_counter()
+        if now >= self.__next_refresh:
+            self.__next_refresh = now + OVERLAY_REFRESH
+            self.__lines = self.__format_lines()
+
+        font = get_assets().font(None, OVERLAY_FONT_SIZE)
+        x, y = OVERLAY_POSITION
+        line_height = font.get_linesize()
+        width = max((font.size(line)[0] for line in self.__lines), default=0) + 10
+        rect = pygame.Rect(x, y, width, line_height * len(self.__lines) + 10)
+        pygame.draw.rect(surface, "#000000", rect)
+        for index, line in enumerate(self.__lines):
+            surface.blit(render_text(font, line, True, "#FFFFFF", "#000000"),
+                         (x + 5, y + 5 + index * line_height))
+        compositor = get_compositor()
+        if self.__overlay_rect is not None and self.__overlay_rect != rect:
+            compositor.mark(self.__overlay_rect)
+        compositor.mark(rect)
+        self.__overlay_rect = rect
+        self.__last = time.perf_counter()
+
+    def __hide_overlay(self):
+        self.__overlay = False
+        if self.__overlay_rect is not None:
+            # the scene does not know it has to repaint under the overlay
+            get_compositor().mark_all()
+            self.__overlay_rect = None
+
+    def __format_lines(self) -> list:
+        stats = self.stats()
+        lines = [f"{'ms':<16}{'mean':>7}{'p50':>7}{'p95':>7}{'p99':>7}{'max':>7}"]
+        for phase, values in stats.items():
+            lines.append(f"{phase:<16}" + "".join(
+                f"{values[key]:>7.2f}" for key in ("mean", "p50", "p95", "p99", "max")))
+        frame = stats.get("frame")
+        if frame is not None and frame["mean"] > 0:
+            lines.append(f"{1000 / frame['mean']:.1f} fps")
+        return lines
+
+    def dump(self, path: str | Path | None = None) -> Path | None:
+        """Write stats() to a .csv or .json file
+
+        Args:
+            path (str | Path | None, optional): Output file. Defaults to the path set in
+            SIM_PROFILE.
+
+        Raises:
+            ValueError: path is not a .csv or .json file
+
+        Returns:
+            Path | None: the written file, None when there is nothing to write
+        """
+        path = self.__dump_path if path is None else Path(path)
+        if path is None:
+            return None
+        suffix = path.suffix.lower()
+        if suffix not in (".csv", ".json"):
+            raise ValueError(f"invalid value for path: {path}. Expected: .csv, .json file")
+        stats = self.stats()
+        if suffix == ".json":
+            path.write_text(json.dumps({"unit": "ms", "window": self.__window,
+                                        "phases": stats}, indent=2))
+        else:
+            with path.open("w", newline="") as file:
+                writer = csv.writer(file)
+                columns = ["samples", "mean"] + [f"p{p}" for p in PERCENTILES] + ["max"]
+                writer.writerow(["phase"] + [f"{c}_ms" if c != "samples" else c
+                                             for c in columns])
+                for phase, values in stats.items():
+                    writer.writerow([phase] + [values["samples"]] +
+                                    [f"{values[c]:.4f}" for c in columns[1:]])
+        return path
+
+
+_PROFILER = FrameProfiler()
+
+
+def get_profiler():
+    """Frame profiler shared by the main loop and the simulations"""
+    return _PROFILER
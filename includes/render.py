@@ -0,0 +1,266 @@
+"""Render
+
+A module for sprite rendering helpers shared by the cameras and scenes
+"""
+from collections import OrderedDict
+from operator import attrgetter
+from typing import Any, Callable, Hashable
+import pygame
+
+try:
+    from includes.compositor import get_compositor
+except ImportError:
+    from compositor import get_compositor
+
+TILE_SIZE = 256
+SCALE_CACHE_SIZE = 64
+_CENTERY = attrgetter("rect.centery")
+
+
+class DrawOrder:
+    """DrawOrder
+    Keep a group's sprites sorted by rect.centery between frames
+    """
+    def __init__(self, y_sort: bool = True):
+        """DrawOrder
+
+        Args:
+            y_sort (bool, optional): Sort sprites by rect.centery. When False, sprites are
+            drawn in the order they are stored (fast path). Defaults to True.
+        """
+        self.__sprites = []
+        self.__keys = []
+        self.__dirty = False
+        self.__y_sort = bool(y_sort)
+
+    @property
+    def y_sort(self):
+        return self.__y_sort
+
+    @y_sort.setter
+    def y_sort(self, value: bool):
+        if isinstance(value, bool):
+            self.__y_sort = value
+            self.__dirty = True
+
+    def add(self, sprite):
+        """Add a sprite at the end of the draw order"""
+        self.__sprites.append(sprite)
+        self.__dirty = True
+
+    def remove(self, sprite):
+        """Remove a sprite from the draw order"""
+        try:
+            self.__sprites.remove(sprite)
+        except ValueError:
+            return
+        self.__dirty = True
+
+    def sprites(self):
+        """Sprites in draw order
+
+        Sorting only happens when a sprite was added/removed or a centery changed since
+        the last call. Sorting is done on the cached keys, so no lambda runs per sprite.
+
+        Returns:
+            list: sprites, back to front
+        """
+        if not self.__y_sort:
+            return self.__sprites
+        keys = list(map(_CENTERY, self.__sprites))
+        if self.__dirty or keys != self.__keys:
+            order = sorted(range(len(keys)), key=keys.__getitem__)
+            self.__sprites = [self.__sprites[i] for i in order]
+            self.__keys = [keys[i] for i in order]
+            self.__dirty = False
+        return self.__sprites
+
+
+class TiledSurface:
+    """TiledSurface
+    A large surface split into fixed-size tiles, so only the visible tiles are blitted
+    """
+    def __init__(self, surface: pygame.Surface, topleft: tuple = (0, 0),
+                 tile_size: int = TILE_SIZE):
+        """TiledSurface
+
+        Args:
+            surface (pygame.Surface): Source surface. Tiles are subsurfaces, no pixel is copied
+            topleft (tuple, optional): World position of the surface. Defaults to (0, 0).
+            tile_size (int, optional): Tile width and height. Defaults to TILE_SIZE.
+        """
+        self.__surface = surface
+        self.__rect = surface.get_rect(topleft=topleft)
+        self.__tile_size = tile_size
+        self.__tiles = []
+        for y in range(0, self.__rect.height, tile_size):
+            row = []
+            for x in range(0, self.__rect.width, tile_size):
+                area = pygame.Rect(x, y, min(tile_size, self.__rect.width - x),
+                                   min(tile_size, self.__rect.height - y))
+                row.append(surface.subsurface(area))
+            self.__tiles.append(row)
+
+    @property
+    def surface(self):
+        return self.__surface
+
+    @property
+    def rect(self):
+        return self.__rect
+
+    def visible_blits(self, view: pygame.Rect):
+        """Blit sequence for the tiles overlapping view
+
+        Args:
+            view (pygame.Rect): Visible region, in world coordinates
+
+        Returns:
+            list: (tile, screen position) pairs for Surface.blits()
+        """
+        clip = self.__rect.clip(view)
+        if not clip.width or not clip.height:
+            return []
+        size = self.__tile_size
+        left, top = self.__rect.topleft
+        first_col = (clip.left - left) // size
+        last_col = (clip.right - 1 - left) // size
+        first_row = (clip.top - top) // size
+        last_row = (clip.bottom - 1 - top) // size
+        sequence = []
+        for row in range(first_row, last_row + 1):
+            tiles = self.__tiles[row]
+            y = top + row * size - view.top
+            for col in range(first_col, last_col + 1):
+                sequence.append((tiles[col], (left + col * size - view.left, y)))
+        return sequence
+
+
+class ScaledImageCache:
+    """ScaledImageCache
+    LRU cache of scaled surfaces, keyed by (surface, zoom)
+    """
+    def __init__(self, max_size: int = SCALE_CACHE_SIZE):
+        """ScaledImageCache
+
+        Args:
+            max_size (int, optional): Max number of scaled surfaces kept.
+            Defaults to SCALE_CACHE_SIZE.
+        """
+        self.__cache = OrderedDict()
+        self.__max_size = max(1, max_size)
+
+    def get(self, surface: pygame.Surface, zoom: float):
+        """Get surface scaled by zoom. Scale it on a cache miss.
+
+        Args:
+            surface (pygame.Surface): Source surface
+            zoom (float): Scale factor
+
+        Returns:
+            pygame.Surface: scaled surface
+        """
+        key = (surface, zoom)
+        scaled = self.__cache.get(key)
+        if scaled is not None:
+            self.__cache.move_to_end(key)
+            return scaled
+        width, height = surface.get_size()
+        scaled = pygame.transform.scale(surface, (max(1, round(width * zoom)),
+                                                  max(1, round(height * zoom))))
+        self.__cache[key] = scaled
+        if len(self.__cache) > self.__max_size:
+            self.__cache.popitem(last=False)
+        return scaled
+
+    def clear(self):
+        self.__cache.clear()
+
+
+class StaticLayer:
+    """StaticLayer
+    Content that stays the same between frames, composed once into one surface
+
+    build(surface) draws the content. It runs again only when the layer is drawn at
+    another size, with another state key, or after invalidate().
+    """
+    def __init__(self, build: Callable[[pygame.Surface], Any]):
+        """StaticLayer
+
+        Args:
+            build (Callable[[pygame.Surface], Any]): Draws the content on the surface
+        """
+        self.__build = build
+        self.__surface = None
+        self.__key = None
+
+    def invalidate(self):
+        """Build again on the next draw"""
+        self.__surface = None
+
+    def surface(self, size: tuple, key: Hashable = None) -> pygame.Surface:
+        """The composed surface, built on first use, resize or state change
+
+        Args:
+            size (tuple): Surface size
+            key (Hashable, optional): Anything the content depends on. Defaults to None.
+
+        Returns:
+            pygame.Surface: composed content
+        """
+        size = tuple(size)
+        resized = self.__surface is None or self.__surface.get_size() != size
+        if resized or self.__key != key:
+            if resized:
+                self.__surface = pygame.Surface(size)
+                if pygame.display.get_surface() is not None:
+                    self.__surface = self.__surface.convert()
+            self.__key = key
+            self.__build(self.__surface)
+            get_compositor().mark_all()
+        return self.__surface
+
+    def draw(self, screen: pygame.Surface, key: Hashable = None):
+        """Blit the layer over the whole screen
+
+        Args:
+            screen (pygame.Surface): Surface to draw on, its size is the layer size
+            key (Hashable, optional): Anything the content depends on. Defaults to None.
+        """
+        screen.blit(self.surface(screen.get_size(), key), (0, 0))
+
+
+def visible_blits(sprites, view: pygame.Rect, compositor=None):
+    """Blit sequence for the sprites overlapping view
+
+    Sprites outside view are culled. Sprites larger than view only blit their visible
+    area, so a tall background costs the same at any camera height.
+
+    Args:
+        sprites (Iterable[pygame.sprite.Sprite]): Sprites, in draw order
+        view (pygame.Rect): Visible region, in world coordinates
+        compositor (Compositor | None, optional): Compositor to report visible sprites to
+
+    Returns:
+        list: (image, screen position[, area]) items for Surface.blits()
+    """
+    left, top = view.topleft
+    width, height = view.size
+    colliderect = view.colliderect
+    sequence = []
+    append = sequence.append
+    for sprite in sprites:
+        rect = sprite.rect
+        if not colliderect(rect):
+            continue
+        if rect.width > width or rect.height > height:
+            area = rect.clip(view)
+            append((sprite.image, (area.x - left, area.y - top),
+                    area.move(-rect.x, -rect.y)))
+            if compositor is not None:
+                compositor.track(sprite, area.move(-left, -top), sprite.image)
+        else:
+            append((sprite.image, (rect.x - left, rect.y - top)))
+            if compositor is not None:
+                compositor.track(sprite, rect.move(-left, -top), sprite.image)
+    return sequence
@@ -0,0 +1,250 @@
+"""Scene
+
+A module for running simulations as scenes on one persistent pygame display
+"""
+from pathlib import Path
+import pygame
+
+try:
+    from includes.assets import get_assets
+    from includes.compositor import get_compositor
+    from includes.dispatcher import get_dispatcher, shutdown_dispatcher
+    from includes.profiler import get_profiler
+    from includes.simulations import SIMULATIONS, load_simulation
+    from includes.ui_events import get_ui_dispatcher
+except ImportError:
+    from assets import get_assets
+    from compositor import get_compositor
+    from dispatcher import get_dispatcher, shutdown_dispatcher
+    from profiler import get_profiler
+    from simulations import SIMULATIONS, load_simulation
+    from ui_events import get_ui_dispatcher
+
+DEFAULT_SIZE = (800, 600)
+SCENE_KEYS = {
+    pygame.K_F1: "freefall",
+    pygame.K_F2: "pendulum",
+    pygame.K_F3: "projectile",
+    pygame.K_F4: "light",
+}
+
+
+class Scene:
+    """Scene
+    Base class for a simulation run by the SceneManager
+
+    A scene is created once and kept alive. Switching away calls exit(), switching back
+    calls enter() again, so a scene keeps its state between visits.
+    """
+    name = None
+    caption = "Physics Simulation"
+    size = DEFAULT_SIZE
+    fps = 30
+
+    def init_widgets(self):
+        """Create widgets. Called once, after __init__."""
+
+    def enter(self):
+        """Called when the scene is shown"""
+
+    def exit(self):
+        """Called when the scene is hidden or the window is closed"""
+
+    def get_entries(self) -> list:
+        """Entries receiving every event before the UI event dispatcher"""
+        return []
+
+    def handle_event(self, event: pygame.event.Event):
+        """Handle an event no widget consumed"""
+
+    def update(self, dt: float):
+        """Advance the simulation by dt seconds"""
+
+    def draw(self):
+        """Draw the frame on the display"""
+
+    def draw_widgets(self):
+        """Draw widgets over the frame drawn by draw()"""
+
+    def mainloop(self):
+        """Run this scene until the window is closed"""
+        return get_scene_manager().run(self)
+
+
+class SceneManager:
+    """SceneManager
+    Own the pygame display and the main loop shared by every scene. Fonts and images
+    are cached by includes.assets, so they also survive scene switches.
+
+    The display is created once. Switching scenes only resizes it and closing the window
+    only hides it, so the display surface every widget draws on stays the same object.
+    """
+    def __init__(self):
+        self.__scenes = {}
+        self.__current = None
+        self.__clock = None
+        self.__running = False
+        self.__preloaded = False
+
+    @property
+    def current(self):
+        return self.__current
+
+    def get_screen(self, size: tuple = DEFAULT_SIZE) -> pygame.Surface:
+        """The display surface. Created with size on first use.
+
+        Args:
+            size (tuple, optional): Size used when the display does not exist yet
+
+        Returns:
+            pygame.Surface: display surface
+        """
+        if not pygame.get_init():
+            pygame.init()
+        surface = pygame.display.get_surface()
+        if surface is None:
+            surface = pygame.display.set_mode(size)
+        return surface
+
+    def preload(self):
+        """Preload the assets of every registered simulation on a background thread, so
+        switching to a scene that was not shown yet does not wait on the disk."""
+        if self.__preloaded:
+            return
+        self.__preloaded = True
+        root = Path(__file__).resolve().parent.parent
+        for package in sorted({module.split(".")[0] for module, _ in SIMULATIONS.values()}):
+            folder = root / package / "assets"
+            if folder.is_dir():
+                get_assets().preload_folder(folder)
+
+    def add(self, scene: Scene):
+        """Register a scene that was created outside the manager"""
+        self.__scenes[scene.name] = scene
+
+    def get(self, name: str) -> Scene:
+        """Scene registered with name. Imported and created on first use.
+
+        The display is resized to the scene size before the scene is created, because
+        widgets and cameras read the display size in their __init__.
+        """
+        scene = self.__scenes.get(name)
+        if scene is None:
+            scene_class = load_simulation(name)
+            self.__show(scene_class.size)
+            scene = scene_class()
+            scene.init_widgets()
+            self.__scenes[name] = scene
+        return scene
+
+    def switch(self, scene: Scene | str):
+        """Hide the current scene and show another one
+
+        Args:
+            scene (Scene | str): Scene, or name of a scene in the registry
+        """
+        if isinstance(scene, str):
+            scene = self.get(scene)
+        else:
+            self.add(scene)
+        if scene is self.__current:
+            return
+        if self.__current is not None:
+            self.__current.exit()
+        self.__current = scene
+        self.__show(scene.size)
+        pygame.display.set_caption(scene.caption)
+        get_compositor().reset()
+        get_ui_dispatcher().reset()
+        scene.enter()
+
+    def __show(self, size: tuple):
+        if not pygame.get_init():
+            pygame.init()
+        pygame.display.set_mode(size, pygame.SHOWN)
+
+    def stop(self):
+        """Leave the main loop at the end of the frame"""
+        self.__running = False
+
+    def run(self, scene: Scene | str, scene_aliases: dict | None = None):
+        """Show scene and run the main loop until the window is closed. The window is
+        hidden, not destroyed, so the next run starts instantly.
+
+        Args:
+            scene (Scene | str): First scene to show
+            scene_aliases (dict | None, optional): Scene name -> name of the scene its
+            SCENE_KEYS key opens instead, e.g. {"freefall": "freefall_exp"}.
+            Defaults to None.
+
+        Returns:
+            int: 0
+        """
+        scene_aliases = scene_aliases or {}
+        scene_keys = {key: scene_aliases.get(name, name) for key, name in SCENE_KEYS.items()}
+        self.__current = None
+        self.switch(scene)
+        self.preload()
+        self.__clock = pygame.time.Clock()
+        self.__running = True
+        compositor = get_compositor()
+        dispatcher = get_dispatcher()
+        ui_events = get_ui_dispatcher()
+        profiler = get_profiler()
+        dt = 0.0
+        # leave the scene even when a frame raises, so its threads stop
+        try:
+            while self.__running:
+                profiler.begin_frame()
+                current = self.__current
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        self.__running = False
+                        break
+                    if event.type == pygame.KEYDOWN and event.key in scene_keys:
+                        self.switch(scene_keys[event.key])
+                        current = self.__current
+                        continue
+                    if profiler.handle_event(event):
+                        continue
+                    compositor.handle_event(event)
+                    for entry in current.get_entries():
+                        entry.handle_entry_events(event)
+                    if ui_events.dispatch(event):
+                        continue
+                    current.handle_event(event)
+                if not self.__running:
+                    break
+                dispatcher.pump()
+                profiler.mark("events")
+
+                current.update(dt)
+                profiler.mark("physics")
+                current.draw()
+                profiler.mark("draw")
+                current.draw_widgets()
+                ui_events.end_frame()
+                profiler.mark("widgets")
+                profiler.draw_overlay(pygame.display.get_surface())
+                compositor.present()
+                profiler.mark("flip")
+                dt = self.__clock.tick(current.fps) / 1000
+                profiler.end_frame()
+        finally:
+            self.__current.exit()
+            self.__current = None
+        shutdown_dispatcher()
+        try:
+            profiler.dump()
+        except OSError as error:
+            print(f"could not write profile: {error}")
+        pygame.display.set_mode(pygame.display.get_surface().get_size(), pygame.HIDDEN)
+        return 0
+
+
+_SCENE_MANAGER = SceneManager()
+
+
+def get_scene_manager():
+    """Scene manager shared by every simulation"""
+    return _SCENE_MANAGER
@@ -0,0 +1,34 @@
+"""Simulations
+
+A module for the simulation registry used by the launcher. Simulation packages are
+only imported when started, so pygame, pymunk and numpy stay out of the launcher.
+"""
+import importlib
+
+SIMULATIONS = {
+    "freefall": ("freefall.main", "FreeFallSim"),
+    "freefall_exp": ("freefall.main_2", "FreeFallSimExp"),
+    "pendulum": ("pendulum.main", "PendulumMain"),
+    "projectile": ("projectile.main", "ProjectileMain"),
+    "light": ("light.main", "LightRefraction"),
+}
+
+
+def load_simulation(name: str) -> type:
+    """Import a simulation and get its class
+
+    Args:
+        name (str): Key in SIMULATIONS
+
+    Raises:
+        ValueError: Unknown simulation
+
+    Returns:
+        type: the simulation class
+    """
+    if name not in SIMULATIONS:
+        raise ValueError(f"invalid value for name: {name}. "
+                         f"Expected: {', '.join(SIMULATIONS)}")
+    module_name, class_name = SIMULATIONS[name]
+    return getattr(importlib.import_module(module_name), class_name)
+
@@ -3,14 +3,18 @@
 A module for sprite in this project
 """
 
-import os
-import re
-from pathlib import Path, WindowsPath, PosixPath
+from pathlib import WindowsPath, PosixPath
 import pygame
 
+try:
+    from includes.assets import get_assets
+    from includes.colors import is_hex_color
+except ImportError:
+    from assets import get_assets
+    from colors import is_hex_color
 try:
     from includes.constants import OBJECT_BASE_SPEED, DEFAULT_FILL_COLOR, DEFAULT_SIZE, \
-        UP, DOWN, LEFT, RIGHT, HEX_COLOR_PATTERN, HM_FILL_COLOR, HM_RECT_SIZE
+        UP, DOWN, LEFT, RIGHT, HM_FILL_COLOR, HM_RECT_SIZE
 except ImportError:
     OBJECT_BASE_SPEED = 300
     DEFAULT_FILL_COLOR = "#FFFFFF"
@@ -19,7 +23,6 @@ except ImportError:
     DOWN = pygame.K_DOWN
     LEFT = pygame.K_LEFT
     RIGHT = pygame.K_RIGHT
-    HEX_COLOR_PATTERN = "^#([0-9A-Fa-f]{3}){1,2}$"
     HM_FILL_COLOR = "#000000"
     HM_RECT_SIZE = (20, 5)
     
@@ -62,15 +65,10 @@ class FallObject(pygame.sprite.Sprite):
         super().__init__(group)
         self.image = None
         self.__constraint_flag = False
-        if isinstance(image, str):
-            path = Path(image)
-            if os.path.exists(path):
-                self.image = pygame.image.load(image).convert_alpha()
+        if isinstance(image, str | WindowsPath | PosixPath):
+            self.image = get_assets().image(image)
         elif isinstance(image, pygame.Surface):
             self.image = image
-        elif isinstance(image, WindowsPath | PosixPath):
-            if os.path.exists(image):
-                self.image = pygame.image.load(str(image)).convert_alpha()
         if not self.image:
             self.image = pygame.Surface(rect_size)
             self.image.fill(fill_color)
@@ -158,21 +156,18 @@ class FallObject(pygame.sprite.Sprite):
                 Format: (Up, Left, Down, Right)
                 Example: (pygame.K_UP, pygame.K_LEFT, pygame.K_DOWN, pygame.K_RIGHT)
         """
-        if isinstance(image, str):
-            path = Path(image)
-            if os.path.exists(path):
-                self.image = pygame.image.load(image).convert_alpha()
+        if isinstance(image, str | WindowsPath | PosixPath):
+            self.image = get_assets().image(image) or self.image
         elif isinstance(image, pygame.Surface):
             self.image = image
-        elif isinstance(image, WindowsPath | PosixPath):
-            if os.path.exists(image):
-                self.image = pygame.image.load(str(image)).convert_alpha()
         if isinstance(constraint, bool):
             self.__constraint_flag = constraint
         if isinstance(constraints, tuple | list):
             self.__constraints = constraints
         if isinstance(fill_color, str):
-            if re.match(HEX_COLOR_PATTERN, fill_color):
+            if is_hex_color(fill_color):
+                # loaded images are shared by the asset cache
+                self.image = self.image.copy()
                 self.image.fill(fill_color)
         if isinstance(movement_speed, int):
             if movement_speed > 0:
@@ -233,15 +228,10 @@ class BackgroundSprite(pygame.sprite.Sprite):
         super().__init__(groups)
         
         self.image = None
-        if isinstance(image, str):
-            path = Path(image)
-            if os.path.exists(path):
-                self.image = pygame.image.load(image).convert_alpha()
+        if isinstance(image, str | WindowsPath | PosixPath):
+            self.image = get_assets().image(image)
         elif isinstance(image, pygame.Surface):
             self.image = image
-        elif isinstance(image, WindowsPath | PosixPath):
-            if os.path.exists(image):
-                self.image = pygame.image.load(str(image)).convert_alpha()
         if not image:
             raise ValueError("please provide a value for image")
         self.rect = self.image.get_rect(topleft = (0, 75))
@@ -276,7 +266,7 @@ class HeightMeter(pygame.sprite.Sprite):
             self.fill_color = fill_color
         else:
             raise TypeError(f"Invalid type for fill_color: {type(fill_color)}. Expected: str")
-        if not re.match(HEX_COLOR_PATTERN, self.fill_color):
+        if not is_hex_color(self.fill_color):
             raise ValueError(f"Invalid value for fill_color: {self.fill_color}. Expected: 6-digit"
                              "HEX value for a color")
         if isinstance(rect_size, tuple):
@@ -0,0 +1,92 @@
+"""Text cache
+
+A module for caching rendered text surfaces in pygame
+"""
+from collections import OrderedDict
+import pygame
+
+TEXT_CACHE_SIZE = 512
+
+
+def _color_key(color):
+    if color is None or isinstance(color, str | tuple):
+        return color
+    return tuple(color)
+
+
+class TextCache:
+    """TextCache
+    LRU cache of surfaces returned by pygame.font.Font.render
+
+    Cached surfaces are shared. Blit them, do not draw on them.
+    """
+    def __init__(self, max_size: int = TEXT_CACHE_SIZE):
+        """TextCache
+
+        Args:
+            max_size (int, optional): Max number of surfaces kept. Defaults to TEXT_CACHE_SIZE.
+        """
+        self.__cache = OrderedDict()
+        self.__max_size = max(1, max_size)
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def hits(self):
+        return self.__hits
+
+    @property
+    def misses(self):
+        return self.__misses
+
+    def __len__(self):
+        return len(self.__cache)
+
+    def render(self, font: pygame.font.Font, text: str, antialias: bool,
+               color, background=None):
+        """Same as font.render(text, antialias, color, background), cached
+
+        Args:
+            font (pygame.font.Font): Font
+            text (str): Text to render
+            antialias (bool): Antialiasing
+            color (str | tuple | pygame.Color): Text color
+            background (str | tuple | pygame.Color | None, optional): Background color
+
+        Returns:
+            pygame.Surface: rendered text
+        """
+        key = (font, text, bool(antialias), _color_key(color), _color_key(background))
+        surface = self.__cache.get(key)
+        if surface is not None:
+            self.__hits += 1
+            self.__cache.move_to_end(key)
+            return surface
+        self.__misses += 1
+        if background is None:
+            surface = font.render(text, antialias, color)
+        else:
+            surface = font.render(text, antialias, color, background)
+        self.__cache[key] = surface
+        if len(self.__cache) > self.__max_size:
+            self.__cache.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """Drop every cached surface and reset counters"""
+        self.__cache.clear()
+        self.__hits = 0
+        self.__misses = 0
+
+
+_TEXT_CACHE = TextCache()
+
+
+def get_text_cache():
+    """Text cache shared by every widget"""
+    return _TEXT_CACHE
+
+
+def render_text(font: pygame.font.Font, text: str, antialias: bool, color, background=None):
+    """Render text through the shared text cache"""
+    return _TEXT_CACHE.render(font, text, antialias, color, background)
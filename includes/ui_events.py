@@ -0,0 +1,134 @@
+"""UI events
+
+A module for routing mouse events to widgets in pygame
+"""
+import pygame
+
+CELL_SIZE = 64
+
+
+class UIEventDispatcher:
+    """UIEventDispatcher
+    Route mouse events to the widget under the cursor
+
+    Widgets register the rect they were drawn on from place(). Rects are kept in a grid of
+    CELL_SIZE cells, so finding the widget under the cursor only looks at one cell, once
+    per event. Only widgets drawn in the last frame receive events; when widgets overlap,
+    the one drawn last wins.
+
+    A widget receives events through handle_mouse(event) -> bool. Returning True from a
+    MOUSEBUTTONDOWN captures the mouse: the matching MOUSEBUTTONUP goes to that widget
+    wherever it happens.
+    """
+    def __init__(self, cell_size: int = CELL_SIZE):
+        """UIEventDispatcher
+
+        Args:
+            cell_size (int, optional): Grid cell size, in pixels. Defaults to CELL_SIZE.
+        """
+        self.__cell_size = cell_size
+        self.__grid = {}
+        self.__rects = {}
+        self.__placed = {}
+        self.__visible = {}
+        self.__captured = None
+
+    def __cells(self, rect: pygame.Rect):
+        size = self.__cell_size
+        for col in range(rect.left // size, (rect.right - 1) // size + 1):
+            for row in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield col, row
+
+    def register(self, widget, rect: pygame.Rect):
+        """Report that widget was drawn on rect this frame
+
+        Args:
+            widget (Any): Widget with a handle_mouse(event) method
+            rect (pygame.Rect): Region the widget reacts to, in screen coordinates
+        """
+        previous = self.__rects.get(widget)
+        if previous != rect:
+            if previous is not None:
+                self.unregister(widget)
+            rect = pygame.Rect(rect)
+            self.__rects[widget] = rect
+            for cell in self.__cells(rect):
+                self.__grid.setdefault(cell, set()).add(widget)
+        self.__placed[widget] = len(self.__placed)
+
+    def unregister(self, widget):
+        """Remove widget from the index"""
+        rect = self.__rects.pop(widget, None)
+        self.__placed.pop(widget, None)
+        self.__visible.pop(widget, None)
+        if self.__captured is widget:
+            self.__captured = None
+        if rect is None:
+            return
+        for cell in self.__cells(rect):
+            widgets = self.__grid.get(cell)
+            if widgets is not None:
+                widgets.discard(widget)
+                if not widgets:
+                    del self.__grid[cell]
+
+    def end_frame(self):
+        """Call once per frame, after every widget was placed"""
+        self.__visible, self.__placed = self.__placed, {}
+
+    def reset(self):
+        """Forget every widget. Use when a new simulation takes over the display."""
+        self.__grid = {}
+        self.__rects = {}
+        self.__placed = {}
+        self.__visible = {}
+        self.__captured = None
+
+    def widget_at(self, pos: tuple):
+        """Topmost widget drawn last frame under pos, or None"""
+        size = self.__cell_size
+        found = None
+        found_order = -1
+        for widget in self.__grid.get((pos[0] // size, pos[1] // size), ()):
+            order = self.__visible.get(widget)
+            if order is not None and order > found_order \
+                    and self.__rects[widget].collidepoint(pos):
+                found = widget
+                found_order = order
+        return found
+
+    def dispatch(self, event: pygame.event.Event) -> bool:
+        """Route a mouse event to the widget under the cursor
+
+        Args:
+            event (pygame.event.Event): Any event. Non-mouse events are ignored.
+
+        Returns:
+            bool: True if a widget consumed the event
+        """
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            widget = self.widget_at(event.pos)
+            if widget is None:
+                return False
+            if widget.handle_mouse(event):
+                self.__captured = widget
+                return True
+            return False
+        if event.type == pygame.MOUSEBUTTONUP:
+            widget = self.__captured
+            self.__captured = None
+            if widget is None:
+                widget = self.widget_at(event.pos)
+            return widget is not None and bool(widget.handle_mouse(event))
+        if event.type == pygame.MOUSEWHEEL:
+            widget = self.widget_at(pygame.mouse.get_pos())
+            return widget is not None and bool(widget.handle_mouse(event))
+        return False
+
+
+_UI_EVENTS = UIEventDispatcher()
+
+
+def get_ui_dispatcher():
+    """UI event dispatcher shared by every widget and mainloop"""
+    return _UI_EVENTS
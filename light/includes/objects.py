@@ -3,6 +3,7 @@ from typing import Any
 
 import pygame
 
+from includes.text_cache import render_text
 from light.includes.constants import BLACK, WIDTH, HEIGHT, CENTER, RED, \
     AIR, GLASS
 
@@ -27,7 +28,8 @@ class IncidentRay:
             self.__x = CENTER[0] + math.cos(math.radians(self.__angle)) * self.__ray_length
             self.__y = CENTER[1] + math.sin(math.radians(self.__angle)) * self.__ray_length
             self.__angle_f = 180 - self.__angle - 270 + 270
-            text_surface = self.__font.render(f"I : {(180 - self.__angle - 270)}", False, BLACK)
+            text_surface = render_text(self.__font, f"I : {(180 - self.__angle - 270)}", False,
+                                       BLACK)
             self.__screen.blit(text_surface, (20, 470))
 
     @property
@@ -114,12 +116,13 @@ class RefractedRay:
                 math.radians(self.__refracted_angle)) * self.__ray_length
             self.__y = CENTER[1] + math.sin(
                 math.radians(self.__refracted_angle)) * self.__ray_length
-            text_surface1 = self.__font.render(f"R  : {((self.__refracted_angle - 90) * -1)}",
-                                               False, (0, 0, 0))
-            text_surface2 = self.__font.render(f"N1 : {self.__air_material[0]}",
-                                               False, (0, 0, 0))
-            text_surface3 = self.__font.render(f"N2 : {self.__surface_material[0]}",
-                                               False, (0, 0, 0))
+            text_surface1 = render_text(self.__font,
+                                        f"R  : {((self.__refracted_angle - 90) * -1)}",
+                                        False, (0, 0, 0))
+            text_surface2 = render_text(self.__font, f"N1 : {self.__air_material[0]}",
+                                        False, (0, 0, 0))
+            text_surface3 = render_text(self.__font, f"N2 : {self.__surface_material[0]}",
+                                        False, (0, 0, 0))
             self.__screen.blit(text_surface1, (20, 500))
             self.__screen.blit(text_surface2, (20, 150))
             self.__screen.blit(text_surface3, (20, 400))
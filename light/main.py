@@ -1,34 +1,36 @@
 import math
-from pathlib import Path
 
 import pygame
 
 from includes.label import Label
 from includes.button import Button
 from includes.entry import Entry
+from includes.compositor import get_compositor
+from includes.assets import asset_path, get_assets
+from includes.scene import Scene, get_scene_manager
 from light.includes.constants import *
 from light.includes.objects import IncidentRay, ReflectedRay, RefractionSurface, \
     RefractedRay
 
 
-class LightRefraction:
+class LightRefraction(Scene):
+    name = "light"
+    caption = "Light Refraction Simulation"
+    size = (WIDTH, HEIGHT)
+    fps = FPS
+
     def __init__(self) -> None:
-        pygame.init()
-        pygame.display.set_caption('Light Refraction Simulation')
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
-        self.clock = pygame.time.Clock()
+        self.screen = get_scene_manager().get_screen(self.size)
+        assets = get_assets()
 
-        self.running = True
         self.ray_angle = 0
         self.entries = []
 
-        self.btn_font = pygame.font.Font(rf"{Path(__file__).parent}\assets\fonts\times.ttf", 20)
-        self.entry_font = pygame.font.Font(rf"{Path(__file__).parent}\assets\fonts\times.ttf", 14)
-        self.label_font = pygame.font.Font(rf"{Path(__file__).parent}\assets\fonts\times.ttf", 22)
-        self.flashlight = pygame.image.load(
-            rf"{Path(__file__).parent}\assets\images\flashlight.jpg"
-        ).convert()
-        self.flashlight = pygame.transform.scale(self.flashlight, (150, 50)).convert()
+        self.btn_font = assets.font(asset_path(__file__, "fonts", "times.ttf"), 20)
+        self.entry_font = assets.font(asset_path(__file__, "fonts", "times.ttf"), 14)
+        self.label_font = assets.font(asset_path(__file__, "fonts", "times.ttf"), 22)
+        self.flashlight = assets.image(asset_path(__file__, "images", "flashlight.jpg"),
+                                       (150, 50), alpha=False)
         self.ignore_zone = pygame.Rect((900, 75, 280, 180))
 
         self.incident_ray = IncidentRay(self.screen, 0, self.label_font)
@@ -68,37 +70,32 @@ class LightRefraction:
     def change_param(self):
         self.refracted_ray.config_material((self.entry_param_n1.get(False, float), "air"),
                                            (self.entry_param_n2.get(False, float), "mat"))
-
-    def mainloop(self):
+        get_compositor().mark_all()
+
+    def get_entries(self):
+        return self.entries
+
+    def handle_event(self, event: pygame.event.Event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            mouse_pos = pygame.mouse.get_pos()
+            if not self.ignore_zone.collidepoint(mouse_pos):
+                # rays, flashlight and angle texts all move
+                get_compositor().mark_all()
+                # mouse_press = pygame.mouse.get_pressed()
+                angle = math.atan2(
+                    mouse_pos[1] - (HEIGHT / 2),
+                    mouse_pos[0] - (WIDTH / 2)
+                ) * 180 / math.pi
+                self.flashlight = pygame.transform.scale(self.flashlight, (150, 50))
+                self.flashlight = pygame.transform.rotate(self.flashlight, self.incident_ray.angle_f)
+                self.incident_ray.config(angle)
+                self.reflected_ray.config(angle)
+                self.refracted_ray.config(angle)
+                self.flashlight.blit(self.screen, (self.incident_ray.x, self.incident_ray.y))
+
+    def draw(self):
+        self.screen.fill("#FFFFFF")
         self.draw_objects()
-        while self.running:
-            if pygame.event.peek(pygame.QUIT):
-                self.running = False
-                pygame.quit()
-                return 0
-            for event in pygame.event.get():
-                for entry in self.entries:
-                    entry.handle_entry_events(event)
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    mouse_pos = pygame.mouse.get_pos()
-                    if not self.ignore_zone.collidepoint(mouse_pos):
-                        # mouse_press = pygame.mouse.get_pressed()
-                        angle = math.atan2(
-                            mouse_pos[1] - (HEIGHT / 2),
-                            mouse_pos[0] - (WIDTH / 2)
-                        ) * 180 / math.pi
-                        self.flashlight = pygame.transform.scale(self.flashlight, (150, 50))
-                        self.flashlight = pygame.transform.rotate(self.flashlight, self.incident_ray.angle_f)
-                        self.incident_ray.config(angle)
-                        self.reflected_ray.config(angle)
-                        self.refracted_ray.config(angle)
-                        self.flashlight.blit(self.screen, (self.incident_ray.x, self.incident_ray.y))
-
-            self.screen.fill("#FFFFFF")
-            self.draw_objects()
-            self.draw_widgets()
-            pygame.display.flip()
-            self.clock.tick(FPS)
 
 
 
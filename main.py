@@ -4,14 +4,10 @@ Main file. Run this file
 """
 import sys
 import tkinter as tk
-from threading import Thread
-from includes.constants import WIN_WIDTH, WIN_HEIGHT, SCREEN_WIDTH, SCREEN_HEIGHT, \
-    GREEN
-from freefall.main import FreeFallSim
-from freefall.main_2 import FreeFallSimExp
-from light.main import LightRefraction
-from pendulum.main import PendulumMain
-from projectile.main import ProjectileMain
+from includes.constants import WIN_WIDTH, WIN_HEIGHT, GREEN
+from includes.launcher import Launcher, RUNNING, STARTING
+
+STATUS_POLL_MS = 500
 
 class Main:
     """Main
@@ -24,19 +20,20 @@ class Main:
         self.__root.title("S4VN: Final Project")
         self.__root.resizable(False, False)
         self.__root.geometry(f"{WIN_WIDTH}x{WIN_HEIGHT}"
-                           f"+{int(SCREEN_WIDTH / 2 - WIN_WIDTH / 2)}"
-                           f"+{int(SCREEN_HEIGHT / 2 - WIN_HEIGHT / 2)}")
+                           f"+{int(self.__root.winfo_screenwidth() / 2 - WIN_WIDTH / 2)}"
+                           f"+{int(self.__root.winfo_screenheight() / 2 - WIN_HEIGHT / 2)}")
         self.__root.protocol("WM_DELETE_WINDOW", self.protocol_quit)
 
         if isinstance(ff_exp, bool):
             self.__ff_exp = ff_exp
+        self.__launcher = Launcher(scene_aliases={"freefall": self.__ff_name})
 
     def init_widget(self):
         """Init widget.
         Init widgets displayed on screen
         """
         self.__freefall_button = tk.Button(self.__root, text="Freefall",
-                                         command=lambda: Thread(target=self.start_ff).start(),
+                                         command=self.start_ff,
                                          font=("Times New Roman", 25), bg=GREEN)
         self.__pendulum_button = tk.Button(self.__root, text="Pendulum",
                                            command=self.start_pen,
@@ -61,50 +58,48 @@ class Main:
         """start_ff
         Start freefall simulation
         """
-        if self.__ff_exp:
-            ffs = FreeFallSimExp()
-        else:
-            ffs = FreeFallSim()
-        self.__root.withdraw()
-        #ffsr = ffs.mainloop()
-        ffs.init_widgets()
-        ffs.mainloop()
-        self.__root.deiconify()
+        self.__launcher.start(self.__ff_name)
 
     def start_pen(self):
         """start_pen
         Start Pendulum simulation
         """
-        self.__root.withdraw()
-        pendulum = PendulumMain()
-        pendulum.init_widgets()
-        pendulum.mainloop()
-        self.__root.deiconify()
+        self.__launcher.start("pendulum")
 
     def legacy_start(self):
         print("Deprecated")
 
     def start_pms(self):
-        self.__root.withdraw()
-        pms = ProjectileMain()
-        pms.init_widgets()
-        pms.mainloop()
-        self.__root.deiconify()
+        self.__launcher.start("projectile")
 
     def start_light(self):
-        self.__root.withdraw()
-        light = LightRefraction()
-        light.init_widgets()
-        light.mainloop()
-        self.__root.deiconify()
+        self.__launcher.start("light")
+
+    @property
+    def __ff_name(self):
+        return "freefall_exp" if self.__ff_exp else "freefall"
+
+    def poll_status(self):
+        """Show which simulations are running on their buttons. Runs every STATUS_POLL_MS
+        on the Tk mainloop, nothing blocks."""
+        for name, button, text in ((self.__ff_name, self.__freefall_button, "Freefall"),
+                                   ("pendulum", self.__pendulum_button, "Pendulum"),
+                                   ("projectile", self.__projectile_button,
+                                    "Projectile Motion"),
+                                   ("light", self.__light_refraction, "Light Refraction")):
+            status = self.__launcher.status(name)
+            button.config(text=f"{text} ({status})" if status in (RUNNING, STARTING) else text)
+        self.__root.after(STATUS_POLL_MS, self.poll_status)
 
     def protocol_quit(self):
         """For root.protocol
         """
+        self.__launcher.stop_all()
         self.__root.destroy()
         sys.exit()
 
     def run(self):
+        self.poll_status()
         self.__root.mainloop()
 
 
@@ -2,18 +2,18 @@
 
 A module for button in pygame
 """
-import re
 from typing import Any, Callable, Literal
 from threading import Thread
 import pygame
 
+from includes.colors import is_hex_color
+
 NORMAL = "normal"
 DISABLED = "disabled"
 WHITE = "#FFFFFF"
 DEF_DISABLED_STATE = "#9c9c9c"
 DEF_NORMAL_STATE = "#475F77"
 DEF_DOWN_STATE = "#D74B4B"
-HEX_COLOR_PATTERN = "^#([0-9A-Fa-f]{3}){1,2}$"
 
 class Button:
     """Button
@@ -68,7 +68,7 @@ class Button:
             raise TypeError(f"invalid type for border_radius: {type(border_radius)}."
                             " Expected: str")
         if isinstance(text_bg_color, str):
-            if re.match(HEX_COLOR_PATTERN, text_bg_color):
+            if is_hex_color(text_bg_color):
                 self.__text_bg_color = text_bg_color
             else:
                 raise ValueError(f"invalid value for text_bg_color: {text_bg_color}."
@@ -77,7 +77,7 @@ class Button:
             raise TypeError(f"invalid type for text_bg_color: {type(text_bg_color)}."
                             " Expected: str")
         if isinstance(disabled_color, str):
-            if re.match(HEX_COLOR_PATTERN, disabled_color):
+            if is_hex_color(disabled_color):
                 self.__disabled_color = disabled_color
             else:
                 raise ValueError(f"invalid value for disabled_color: {disabled_color}."
@@ -86,7 +86,7 @@ class Button:
             raise TypeError(f"invalid type for disabled_color: {type(disabled_color)}."
                             " Expected: str")
         if isinstance(normal_color, str):
-            if re.match(HEX_COLOR_PATTERN, normal_color):
+            if is_hex_color(normal_color):
                 self.__normal_color = normal_color
             else:
                 raise ValueError(f"invalid value for normal_color: {normal_color}."
@@ -95,7 +95,7 @@ class Button:
             raise TypeError(f"invalid type for normal_color: {type(normal_color)}."
                             " Expected: str")
         if isinstance(click_color, str):
-            if re.match(HEX_COLOR_PATTERN, click_color):
+            if is_hex_color(click_color):
                 self.__click_color = click_color
             else:
                 raise ValueError(f"invalid value for click_color: {click_color}."
@@ -171,13 +171,13 @@ class Button:
                 self.__button_color = self.__disabled_color
         if isinstance(border_radius, int) and border_radius >= 0:
             self.__border_radius = border_radius
-        if isinstance(text_bg_color, str) and re.match(HEX_COLOR_PATTERN, text_bg_color):
+        if is_hex_color(text_bg_color):
             self.__text_bg_color = text_bg_color
-        if isinstance(disabled_color, str) and re.match(HEX_COLOR_PATTERN, disabled_color):
+        if is_hex_color(disabled_color):
             self.__disabled_color = disabled_color
-        if isinstance(normal_color, str) and re.match(HEX_COLOR_PATTERN, normal_color):
+        if is_hex_color(normal_color):
             self.__normal_color = normal_color
-        if isinstance(click_color, str) and re.match(HEX_COLOR_PATTERN, click_color):
+        if is_hex_color(click_color):
             self.__click_color = click_color
 
 
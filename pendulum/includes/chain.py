@@ -0,0 +1,327 @@
+import numpy as np
+
+from pendulum.includes.physics import GRAVITY, MAX_FRAME_TIME
+
+RTOL = 1e-8
+ATOL = 1e-10
+FIRST_STEP = 1e-3
+MIN_STEP = 1e-9
+MAX_STEP = 0.05
+
+# Dormand-Prince 5(4) tableau
+_A = (
+    (),
+    (1 / 5,),
+    (3 / 40, 9 / 40),
+    (44 / 45, -56 / 15, 32 / 9),
+    (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+    (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+    (35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+)
+_ERROR = (71 / 57600, 0, -71 / 16695, 71 / 1920, -17253 / 339200, 22 / 525, -1 / 40)
+
+
+class PendulumChain:
+    """PendulumChain
+    A batch of N-link pendulums (point masses on massless rods), integrated with adaptive
+    Dormand-Prince RK45
+
+    The state is a (batch, 2 * links) array: angles from the vertical, then angular
+    velocities. Every member has the same lengths and masses, only the state differs, so
+    one batch can hold thousands of slightly perturbed copies of a chain. The whole batch
+    shares one step size, sized for its least accurate member.
+    """
+    def __init__(self, lengths, masses=None, angles=None, angular_velocities=None,
+                 gravity: float = GRAVITY, damping: float = 0,
+                 rtol: float = RTOL, atol: float = ATOL):
+        """PendulumChain
+
+        Args:
+            lengths (array-like): Length of each link, meters. Two for a double pendulum
+            masses (array-like, optional): Mass of each bob, kg. Defaults to 1 each.
+            angles (array-like, optional): (links,) or (batch, links) angles, radians.
+            Defaults to hanging straight down.
+            angular_velocities (array-like, optional): Same shape as angles, rad/s.
+            Defaults to 0.
+            gravity (float, optional): m/s^2. Defaults to GRAVITY.
+            damping (float, optional): Viscous friction on every joint, a torque of
+            -damping * angular velocity, N m s. Defaults to 0.
+            rtol (float, optional): Relative tolerance per step. Defaults to RTOL.
+            atol (float, optional): Absolute tolerance per step. Defaults to ATOL.
+
+        Raises:
+            ValueError: lengths or masses are not positive, or shapes do not match
+        """
+        lengths = np.atleast_1d(np.asarray(lengths, dtype=np.float64))
+        masses = np.ones_like(lengths) if masses is None else \
+            np.atleast_1d(np.asarray(masses, dtype=np.float64))
+        if lengths.ndim != 1 or masses.shape != lengths.shape:
+            raise ValueError("invalid value for masses. Expected: one mass per link")
+        if np.any(lengths <= 0) or np.any(masses <= 0):
+            raise ValueError("invalid value for lengths, masses. Expected: > 0")
+        links = len(lengths)
+        angles = np.zeros(links) if angles is None else np.asarray(angles, dtype=np.float64)
+        angles = np.atleast_2d(angles)
+        velocities = np.zeros_like(angles) if angular_velocities is None else \
+            np.broadcast_to(np.asarray(angular_velocities, dtype=np.float64), angles.shape)
+        if angles.shape[1] != links:
+            raise ValueError(f"invalid value for angles. Expected: {links} per chain")
+
+        self.__gravity = gravity
+        self.__damping = damping
+        self.time = 0.0
+        self.__rtol = rtol
+        self.__atol = atol
+        self.__lengths = lengths
+        self.__masses = masses
+        # mass below joint i and j, for every pair of links
+        tail = np.cumsum(masses[::-1])[::-1]
+        index = np.arange(links)
+        self.__tail = tail
+        self.__coupling = tail[np.maximum.outer(index, index)] * np.outer(lengths, lengths)
+        self.__state = np.concatenate((angles, velocities), axis=1)
+        self.__step = FIRST_STEP
+        self.__rejected = 0
+        self.__accepted = 0
+        self.__initial_separation = self.separation()[1:]
+        self.__restart_energy()
+
+    @classmethod
+    def perturbed(cls, lengths, angles, count: int, epsilon: float = 1e-9,
+                  seed: int | None = None, **kwargs):
+        """A batch of count chains starting epsilon radians around angles. Member 0 starts
+        exactly at angles.
+
+        Args:
+            lengths (array-like): Length of each link, meters
+            angles (array-like): Reference angles, radians
+            count (int): Chains in the batch
+            epsilon (float, optional): Size of the perturbation. Defaults to 1e-9.
+            seed (int | None, optional): Random seed. Defaults to None.
+            kwargs: Passed to PendulumChain
+
+        Returns:
+            PendulumChain: the batch
+        """
+        angles = np.asarray(angles, dtype=np.float64)
+        noise = np.random.default_rng(seed).standard_normal((count, len(angles)))
+        noise[0] = 0
+        return cls(lengths, angles=angles + epsilon * noise, **kwargs)
+
+    @property
+    def gravity(self):
+        return self.__gravity
+
+    @gravity.setter
+    def gravity(self, gravity: float):
+        self.__gravity = gravity
+        self.__restart_energy()
+
+    @property
+    def damping(self):
+        return self.__damping
+
+    @damping.setter
+    def damping(self, damping: float):
+        self.__damping = damping
+        self.__restart_energy()
+
+    def __restart_energy(self):
+        """Measure the energy drift from the current state. The cached derivative and the
+        energy so far belong to the old state, gravity and damping."""
+        self.__derivative = None
+        self.__initial_energy = self.energy()
+        self.__dissipated = np.zeros(self.batch)
+        self.__max_drift = 0.0
+
+    @property
+    def links(self):
+        return len(self.__lengths)
+
+    @property
+    def batch(self):
+        return self.__state.shape[0]
+
+    @property
+    def state(self):
+        """(batch, 2 * links) copy of the state: angles, then angular velocities"""
+        return self.__state.copy()
+
+    @state.setter
+    def state(self, state):
+        state = np.atleast_2d(np.asarray(state, dtype=np.float64))
+        if state.shape != self.__state.shape:
+            raise ValueError(f"invalid value for state. Expected: shape {self.__state.shape}")
+        self.__state = state.copy()
+        self.__restart_energy()
+
+    @property
+    def angles(self):
+        return self.__state[:, :self.links].copy()
+
+    @property
+    def angular_velocities(self):
+        return self.__state[:, self.links:].copy()
+
+    @property
+    def dissipated(self):
+        """(batch,) energy taken out by damping so far, J"""
+        return self.__dissipated.copy()
+
+    @property
+    def step_size(self):
+        return self.__step
+
+    @property
+    def rejected_steps(self):
+        return self.__rejected
+
+    @property
+    def accepted_steps(self):
+        return self.__accepted
+
+    def derivative(self, state: np.ndarray) -> np.ndarray:
+        """Time derivative of a (batch, 2 * links) state, from the Lagrangian of the chain:
+        M(angles) * angular accelerations = f(angles, angular velocities)"""
+        links = self.links
+        angles, velocities = state[:, :links], state[:, links:]
+        difference = angles[:, :, None] - angles[:, None, :]
+        mass_matrix = self.__coupling * np.cos(difference)
+        forces = (-np.einsum("bij,bj->bi", self.__coupling * np.sin(difference),
+                             velocities * velocities)
+                  - self.gravity * self.__tail * self.__lengths * np.sin(angles)
+                  - self.damping * velocities)
+        accelerations = np.linalg.solve(mass_matrix, forces[..., None])[..., 0]
+        return np.concatenate((velocities, accelerations), axis=1)
+
+    def advance(self, dt: float) -> int:
+        """Integrate exactly dt seconds further, in as many adaptive steps as needed
+
+        Args:
+            dt (float): Seconds
+
+        Returns:
+            int: accepted steps
+        """
+        accepted = self.__accepted
+        remaining = dt
+        while remaining > 1e-12:
+            remaining -= self.__try_step(min(self.__step, remaining))
+        return self.__accepted - accepted
+
+    def step(self, dt: float) -> int:
+        """Advance by dt seconds of real time, capped at MAX_FRAME_TIME. Same as
+        PendulumPhysics.step, for the animation thread."""
+        return self.advance(min(max(dt, 0.0), MAX_FRAME_TIME))
+
+    def __try_step(self, h: float) -> float:
+        """Take one accepted step of at most h seconds, shrinking it until the error fits
+        the tolerances. Returns the step taken."""
+        # a step cut short to land on the end of advance() says nothing about the next one
+        clipped = h < self.__step
+        state = self.__state
+        if self.__derivative is None:
+            self.__derivative = self.derivative(state)
+        while True:
+            stages = [self.__derivative]
+            for row in _A[1:]:
+                increment = sum(weight * stage for weight, stage in zip(row, stages) if weight)
+                stages.append(self.derivative(state + h * increment))
+            # the last row is the 5th order solution, its derivative is the next first stage
+            new_state = state + h * sum(w * k for w, k in zip(_A[-1], stages) if w)
+            stages.append(self.derivative(new_state))
+            error = h * sum(w * k for w, k in zip(_ERROR, stages) if w)
+            scale = self.__atol + self.__rtol * np.maximum(np.abs(state), np.abs(new_state))
+            norm = float(np.sqrt(np.mean((error / scale) ** 2, axis=1)).max())
+            factor = 5.0 if norm == 0 else min(5.0, max(0.2, 0.9 * norm ** -0.2))
+            if norm <= 1 or h <= MIN_STEP:
+                break
+            self.__rejected += 1
+            clipped = False
+            h = max(h * factor, MIN_STEP)
+
+        if self.damping:
+            # the damping torque -damping * angular velocity on every joint removes
+            # damping * sum(angular velocity^2) watts. The first half of every stage is
+            # the angular velocities there, so the step's own weights integrate it.
+            links = self.links
+            power = sum(w * np.sum(k[:, :links] ** 2, axis=1)
+                        for w, k in zip(_A[-1], stages) if w)
+            self.__dissipated += self.damping * power * h
+        self.__state = new_state
+        self.__derivative = stages[-1]
+        self.time += h
+        self.__accepted += 1
+        proposal = min(max(h * factor, MIN_STEP), MAX_STEP)
+        self.__step = max(proposal, self.__step) if clipped else proposal
+        drift = float(self.energy_drift().max())
+        if drift > self.__max_drift:
+            self.__max_drift = drift
+        return h
+
+    def positions(self) -> tuple:
+        """Bob positions relative to the pivot, meters, y pointing down
+
+        Returns:
+            tuple: (x, y), each (batch, links)
+        """
+        angles = self.__state[:, :self.links]
+        x = np.cumsum(self.__lengths * np.sin(angles), axis=1)
+        y = np.cumsum(self.__lengths * np.cos(angles), axis=1)
+        return x, y
+
+    def kinetic_energy(self) -> np.ndarray:
+        """Kinetic energy of each chain, J"""
+        links = self.links
+        angles, velocities = self.__state[:, :links], self.__state[:, links:]
+        vx = np.cumsum(self.__lengths * np.cos(angles) * velocities, axis=1)
+        vy = np.cumsum(-self.__lengths * np.sin(angles) * velocities, axis=1)
+        return 0.5 * np.sum(self.__masses * (vx * vx + vy * vy), axis=1)
+
+    def potential_energy(self) -> np.ndarray:
+        """Potential energy of each chain above hanging at rest, J"""
+        _, y = self.positions()
+        lowest = np.cumsum(self.__lengths)
+        return self.gravity * np.sum(self.__masses * (lowest - y), axis=1)
+
+    def energy(self) -> np.ndarray:
+        """Kinetic plus potential energy of each chain, J. Zero when hanging at rest."""
+        return self.kinetic_energy() + self.potential_energy()
+
+    def energy_scale(self) -> float:
+        """Potential energy of the chain held straight up, J. The unit energy drift is
+        measured in."""
+        return 2 * self.gravity * float(np.sum(self.__masses * np.cumsum(self.__lengths)))
+
+    def energy_drift(self) -> np.ndarray:
+        """Change of energy plus dissipated energy of each chain since the start, or since
+        the state, gravity or damping last changed, relative to energy_scale(). Only the
+        integrator's error, with or without damping."""
+        return (np.abs(self.energy() + self.__dissipated - self.__initial_energy)
+                / self.energy_scale())
+
+    @property
+    def max_energy_drift(self):
+        """Largest energy_drift() seen after any step"""
+        return self.__max_drift
+
+    def separation(self) -> np.ndarray:
+        """Distance in state space of each chain from chain 0, angles wrapped to [-pi, pi]
+
+        Returns:
+            np.ndarray: (batch,) distances. Entry 0 is 0
+        """
+        difference = self.__state - self.__state[0]
+        links = self.links
+        difference[:, :links] = (difference[:, :links] + np.pi) % (2 * np.pi) - np.pi
+        return np.sqrt(np.sum(difference * difference, axis=1))
+
+    def lyapunov_estimate(self) -> float:
+        """Mean exponential divergence rate from chain 0 so far, 1/s. Positive for chaotic
+        motion. Needs a batch of at least 2 perturbed chains."""
+        separation = self.separation()[1:]
+        initial = self.__initial_separation
+        valid = (separation > 0) & (initial > 0)
+        if self.time <= 0 or not np.any(valid):
+            return 0.0
+        return float(np.mean(np.log(separation[valid] / initial[valid])) / self.time)
@@ -0,0 +1,160 @@
+import math
+from typing import NamedTuple
+
+import numpy as np
+import pygame
+
+from includes.text_cache import render_text
+from pendulum.includes.history import ANGLE, ANGULAR_VELOCITY, TraceHistory
+from pendulum.includes.panel import PANEL_REFRESH, CachedPanel
+
+DRIFT_THRESHOLD = 1e-3
+_TEXT_HEIGHT = 92
+_BACKGROUND = "#FFFFFF"
+_AXIS = "#B0B0B0"
+_TEXT = "#000000"
+_PHASE = "#1F4E9C"
+_FLAG = "#C62828"
+
+
+class EnergyReading(NamedTuple):
+    """EnergyReading
+    The energies and drift after one step. flagged is set once the drift went past the
+    threshold since the last restart.
+    """
+    kinetic: float
+    potential: float
+    total: float
+    drift: float
+    max_drift: float
+    flagged: bool
+
+
+_NO_READING = EnergyReading(0.0, 0.0, 0.0, 0.0, 0.0, False)
+
+
+class EnergyMonitor:
+    """EnergyMonitor
+    Kinetic, potential and total energy of the pendulum, and how far the total strays
+    from where it should be
+
+    Energy taken out by damping is added back before comparing, so the drift is the
+    integrator's error alone. update() does a fixed amount of work per tick. Only the
+    physics thread calls update() and restart(); other threads read the immutable
+    reading they publish.
+    """
+    def __init__(self, threshold: float = DRIFT_THRESHOLD):
+        """EnergyMonitor
+
+        Args:
+            threshold (float, optional): Relative drift flagged. Defaults to
+            DRIFT_THRESHOLD.
+
+        Raises:
+            ValueError: threshold is not positive
+        """
+        if threshold <= 0:
+            raise ValueError(f"invalid value for threshold: {threshold}. Expected: > 0")
+        self.threshold = threshold
+        self.restart()
+
+    def restart(self):
+        """Take the next update as the new reference. Call when the pendulum is released
+        or its gravity, damping or integrator change."""
+        self.__reference = None
+        self.__max_drift = 0.0
+        self.__reading = _NO_READING
+
+    @property
+    def reading(self) -> EnergyReading:
+        """The last published EnergyReading"""
+        return self.__reading
+
+    def update(self, kinetic: float, potential: float, dissipated: float, scale: float):
+        """Record the energy after a step
+
+        Args:
+            kinetic (float): Kinetic energy
+            potential (float): Potential energy
+            dissipated (float): Energy taken out by damping since the release
+            scale (float): Energy the drift is relative to, e.g. held straight up
+        """
+        balance = kinetic + potential + dissipated
+        if self.__reference is None:
+            self.__reference = balance
+        drift = abs(balance - self.__reference) / scale if scale > 0 else 0.0
+        self.__max_drift = max(self.__max_drift, drift)
+        self.__reading = EnergyReading(kinetic, potential, kinetic + potential, drift,
+                                       self.__max_drift, self.__max_drift > self.threshold)
+
+
+class DiagnosticsPanel(CachedPanel):
+    """DiagnosticsPanel
+    Phase portrait (angular velocity against angle) of the pendulum history, with the
+    energies and drift of an EnergyReading under it
+
+    Redrawn into a cached surface every PANEL_REFRESH seconds. The drift line turns red
+    once the reading is flagged.
+    """
+    def __init__(self, rect: pygame.Rect, font: pygame.font.Font,
+                 refresh: float = PANEL_REFRESH):
+        """DiagnosticsPanel
+
+        Args:
+            rect (pygame.Rect): Where the panel is drawn on screen
+            font (pygame.font.Font): Font for the energies
+            refresh (float, optional): Seconds between redraws. Defaults to PANEL_REFRESH.
+        """
+        super().__init__(rect, refresh)
+        self.__font = font
+
+    def draw(self, screen: pygame.Surface, history: TraceHistory, reading: EnergyReading,
+             unit: str = "J/kg"):
+        """Draw the panel on screen, redrawing it when it is due"""
+        super().draw(screen, history, reading, unit)
+
+    def render(self, surface: pygame.Surface, history: TraceHistory,
+               reading: EnergyReading, unit: str):
+        surface.fill(_BACKGROUND)
+        pygame.draw.rect(surface, _AXIS, surface.get_rect(), 1)
+        area = pygame.Rect(1, 1, self.rect.width - 2, self.rect.height - _TEXT_HEIGHT)
+        pygame.draw.line(surface, _AXIS, (area.left, area.centery), (area.right, area.centery))
+        pygame.draw.line(surface, _AXIS, (area.centerx, area.top), (area.centerx, area.bottom))
+        surface.blit(render_text(self.__font, "phase (angle, velocity)", True, _TEXT),
+                     (area.x + 4, area.y + 2))
+        self.__render_phase(surface, area, history)
+
+        lines = ((f"kinetic {reading.kinetic:.3f} {unit}", _TEXT),
+                 (f"potential {reading.potential:.3f} {unit}", _TEXT),
+                 (f"total {reading.total:.3f} {unit}", _TEXT),
+                 (f"drift {reading.drift:.1e} (max {reading.max_drift:.1e})",
+                  _FLAG if reading.flagged else _TEXT))
+        y = area.bottom + 2
+        for text, color in lines:
+            rendered = render_text(self.__font, text, True, color)
+            surface.blit(rendered, (area.x + 4, y))
+            y += rendered.get_height()
+
+    @staticmethod
+    def __render_phase(surface: pygame.Surface, area: pygame.Rect, history: TraceHistory):
+        # one consistent copy, the physics thread keeps writing the buffer
+        trace = history.snapshot()[[ANGLE, ANGULAR_VELOCITY]]
+        if trace.shape[1] < 2:
+            return
+        angles = (trace[0] + math.pi) % (2 * math.pi) - math.pi
+        velocities = trace[1]
+        angle_limit = float(np.abs(angles).max()) or 1.0
+        velocity_limit = float(np.abs(velocities).max()) or 1.0
+        x = (area.centerx + angles / angle_limit * (area.width // 2 - 2)).astype(int)
+        y = (area.centery - velocities / velocity_limit * (area.height // 2 - 2)).astype(int)
+        # a pendulum going over the top jumps from pi to -pi, break the curve there
+        breaks = np.flatnonzero(np.abs(np.diff(angles)) > math.pi) + 1
+        for start, end in zip(np.concatenate(([0], breaks)),
+                              np.concatenate((breaks, [len(angles)]))):
+            xs, ys = x[start:end], y[start:end]
+            # one point per pixel is enough
+            keep = np.flatnonzero((np.diff(xs, prepend=-1) != 0)
+                                  | (np.diff(ys, prepend=-1) != 0))
+            points = list(zip(xs[keep].tolist(), ys[keep].tolist()))
+            if len(points) > 1:
+                pygame.draw.lines(surface, _PHASE, False, points)
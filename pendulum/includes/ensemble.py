@@ -0,0 +1,245 @@
+import math
+from threading import Lock
+
+import numpy as np
+
+from pendulum.includes.physics import DEFAULT_INTEGRATOR, GRAVITY, INTEGRATORS, \
+    MAX_FRAME_TIME, SUBSTEP
+
+WAVE_COUNT = 24
+WAVE_PERIOD = 60
+WAVE_LONGEST = 2.4
+
+
+class PendulumEnsemble:
+    """PendulumEnsemble
+    Many independent pendulums, stepped together
+
+    Lengths, angles, angular velocities, gravity and damping are NumPy arrays with one
+    value per pendulum, so one substep is a few array
+    operations however many pendulums there are. Same equations, units and fixed substeps
+    as PendulumPhysics. Safe to add pendulums from one thread while another steps: the
+    arrays are replaced, never changed in place.
+    """
+    def __init__(self, gravity: float = GRAVITY, damping: float = 0,
+                 integrator: str = DEFAULT_INTEGRATOR, substep: float = SUBSTEP):
+        """PendulumEnsemble
+
+        Args:
+            gravity (float, optional): m/s^2, for pendulums added without their own.
+            Defaults to GRAVITY.
+            damping (float, optional): Damping coefficient, 1/s, for pendulums added
+            without their own. Defaults to 0.
+            integrator (str, optional): "verlet", "leapfrog" or "rk4".
+            Defaults to DEFAULT_INTEGRATOR.
+            substep (float, optional): Fixed step, seconds. Defaults to SUBSTEP.
+
+        Raises:
+            ValueError: substep is not positive, or unknown integrator
+        """
+        if substep <= 0:
+            raise ValueError(f"invalid value for substep: {substep}. Expected: > 0")
+        self.gravity = gravity
+        self.damping = damping
+        self.time = 0.0
+        self.__lock = Lock()
+        self.__length = np.empty(0)
+        self.__angle = np.empty(0)
+        self.__velocity = np.empty(0)
+        self.__gravity = np.empty(0)
+        self.__damping = np.empty(0)
+        self.__substep = substep
+        self.__accumulator = 0.0
+        self.__step = None
+        self.integrator = integrator
+
+    @property
+    def integrator(self):
+        return self.__integrator
+
+    @integrator.setter
+    def integrator(self, integrator: str):
+        if integrator not in INTEGRATORS:
+            raise ValueError(f"invalid value for integrator: {integrator}. "
+                             f"Expected: {', '.join(INTEGRATORS)}")
+        self.__integrator = integrator
+        self.__step = {"verlet": self.__verlet, "leapfrog": self.__leapfrog,
+                       "rk4": self.__rk4}[integrator]
+
+    @property
+    def substep(self):
+        return self.__substep
+
+    @property
+    def lengths(self):
+        return self.__length
+
+    @property
+    def angles(self):
+        """Angles, radians. The array is replaced on every step, never changed in place."""
+        return self.__angle
+
+    @property
+    def angular_velocities(self):
+        """Angular velocities, rad/s. Replaced on every step like angles."""
+        return self.__velocity
+
+    def __len__(self):
+        return len(self.__length)
+
+    def add(self, lengths, angles, angular_velocities=0, gravity=None, damping=None):
+        """Add pendulums
+
+        Args:
+            lengths (float | array-like): Rod lengths, meters
+            angles (float | array-like): Angles from the vertical, radians
+            angular_velocities (float | array-like, optional): rad/s. Defaults to 0.
+            gravity (float | array-like | None, optional): m/s^2. Defaults to
+            self.gravity.
+            damping (float | array-like | None, optional): Damping coefficients, 1/s.
+            Defaults to self.damping.
+
+        Raises:
+            ValueError: a length is not positive
+        """
+        gravity = self.gravity if gravity is None else gravity
+        damping = self.damping if damping is None else damping
+        lengths, angles, angular_velocities, gravity, damping = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(lengths, dtype=np.float64)),
+            np.asarray(angles, dtype=np.float64),
+            np.asarray(angular_velocities, dtype=np.float64),
+            np.asarray(gravity, dtype=np.float64),
+            np.asarray(damping, dtype=np.float64))
+        if np.any(lengths <= 0):
+            raise ValueError("invalid value for lengths. Expected: > 0")
+        with self.__lock:
+            self.__length = np.concatenate((self.__length, lengths))
+            self.__angle = np.concatenate((self.__angle, angles))
+            self.__velocity = np.concatenate((self.__velocity, angular_velocities))
+            self.__gravity = np.concatenate((self.__gravity, gravity))
+            self.__damping = np.concatenate((self.__damping, damping))
+
+    def add_wave(self, angle: float, count: int = WAVE_COUNT, period: float = WAVE_PERIOD,
+                 longest: float = WAVE_LONGEST):
+        """Add a pendulum wave: pendulum i swings n + i times in period seconds, so the row
+        drifts out of phase and lines up again every period
+
+        Args:
+            angle (float): Starting angle of every pendulum, radians
+            count (int, optional): Pendulums. Defaults to WAVE_COUNT.
+            period (float, optional): Seconds until they line up again.
+            Defaults to WAVE_PERIOD.
+            longest (float, optional): Upper bound for the longest pendulum, meters. Sets n.
+            Defaults to WAVE_LONGEST.
+        """
+        first = math.ceil(period / (2 * math.pi) * math.sqrt(self.gravity / longest))
+        oscillations = first + np.arange(count)
+        lengths = self.gravity * (period / (2 * math.pi * oscillations)) ** 2
+        self.add(lengths, angle)
+
+    def set_parameters(self, gravity: float | None = None, damping: float | None = None):
+        """Change gravity and damping of every pendulum, and the defaults for pendulums
+        added later
+
+        Args:
+            gravity (float | None, optional): m/s^2. Defaults to None, unchanged.
+            damping (float | None, optional): Damping coefficient, 1/s. Defaults to None,
+            unchanged.
+        """
+        with self.__lock:
+            if gravity is not None:
+                self.gravity = gravity
+                self.__gravity = np.full(len(self.__length), gravity, dtype=np.float64)
+            if damping is not None:
+                self.damping = damping
+                self.__damping = np.full(len(self.__length), damping, dtype=np.float64)
+
+    def clear(self):
+        """Remove every pendulum"""
+        with self.__lock:
+            self.__length = np.empty(0)
+            self.__angle = np.empty(0)
+            self.__velocity = np.empty(0)
+            self.__gravity = np.empty(0)
+            self.__damping = np.empty(0)
+            self.time = 0.0
+            self.__accumulator = 0.0
+
+    def positions(self, pivot: tuple, pixels_per_meter: float) -> tuple:
+        """Bob positions on screen
+
+        Args:
+            pivot (tuple): Pivot on screen, pixels
+            pixels_per_meter (float): Screen scale
+
+        Returns:
+            tuple: (x, y) integer arrays, pixels
+        """
+        with self.__lock:
+            length, angle = self.__length, self.__angle
+        scaled = length * pixels_per_meter
+        x = np.rint(pivot[0] + scaled * np.sin(angle)).astype(np.int32)
+        y = np.rint(pivot[1] + scaled * np.cos(angle)).astype(np.int32)
+        return x, y
+
+    def energy(self) -> np.ndarray:
+        """Kinetic plus potential energy per unit mass of each pendulum, J/kg"""
+        with self.__lock:
+            length, angle, velocity = self.__length, self.__angle, self.__velocity
+            gravity = self.__gravity
+        return (0.5 * (length * velocity) ** 2
+                + gravity * length * (1 - np.cos(angle)))
+
+    def step(self, dt: float) -> int:
+        """Advance every pendulum by dt seconds of real time
+
+        Args:
+            dt (float): Elapsed time, capped at MAX_FRAME_TIME
+
+        Returns:
+            int: substeps taken
+        """
+        with self.__lock:
+            self.__accumulator += min(max(dt, 0.0), MAX_FRAME_TIME)
+            steps = int(self.__accumulator / self.__substep)
+            self.__accumulator -= steps * self.__substep
+            if len(self.__length):
+                # gravity / length is the same for every substep of this call
+                omega_squared = self.__gravity / self.__length
+                damping = self.__damping
+                angle, velocity = self.__angle, self.__velocity
+                for _ in range(steps):
+                    angle, velocity = self.__step(angle, velocity, omega_squared, damping,
+                                                  self.__substep)
+                self.__angle, self.__velocity = angle, velocity
+            self.time += steps * self.__substep
+        return steps
+
+    @staticmethod
+    def __acceleration(angle, velocity, omega_squared, damping):
+        return -omega_squared * np.sin(angle) - damping * velocity
+
+    def __verlet(self, angle, velocity, omega_squared, damping, h):
+        acc = self.__acceleration(angle, velocity, omega_squared, damping)
+        angle = angle + velocity * h + 0.5 * h * h * acc
+        new_acc = self.__acceleration(angle, velocity + acc * h, omega_squared, damping)
+        return angle, velocity + 0.5 * h * (acc + new_acc)
+
+    def __leapfrog(self, angle, velocity, omega_squared, damping, h):
+        acceleration = self.__acceleration
+        velocity = velocity + 0.5 * h * acceleration(angle, velocity, omega_squared, damping)
+        angle = angle + velocity * h
+        return angle, velocity + 0.5 * h * acceleration(angle, velocity, omega_squared,
+                                                        damping)
+
+    def __rk4(self, angle, velocity, omega_squared, damping, h):
+        acceleration = self.__acceleration
+        k1_a, k1_v = velocity, acceleration(angle, velocity, omega_squared, damping)
+        k2_a = velocity + 0.5 * h * k1_v
+        k2_v = acceleration(angle + 0.5 * h * k1_a, k2_a, omega_squared, damping)
+        k3_a = velocity + 0.5 * h * k2_v
+        k3_v = acceleration(angle + 0.5 * h * k2_a, k3_a, omega_squared, damping)
+        k4_a = velocity + h * k3_v
+        k4_v = acceleration(angle + h * k3_a, k4_a, omega_squared, damping)
+        return (angle + h / 6 * (k1_a + 2 * k2_a + 2 * k3_a + k4_a),
+                velocity + h / 6 * (k1_v + 2 * k2_v + 2 * k3_v + k4_v))
@@ -0,0 +1,98 @@
+from threading import Lock
+
+import numpy as np
+
+FIELDS = ("time", "angle", "angular_velocity", "x", "y", "energy")
+TIME, ANGLE, ANGULAR_VELOCITY, X, Y, ENERGY = range(len(FIELDS))
+DEFAULT_CAPACITY = 4096
+
+
+class TraceHistory:
+    """TraceHistory
+    The last capacity pendulum samples, in float arrays allocated once
+
+    Every sample is written twice, at i and i + capacity, so the samples in order always
+    sit in one contiguous slice and view() never copies. One thread writes. Other threads
+    read with snapshot(), which copies under a lock the writer takes only to write.
+    """
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """TraceHistory
+
+        Args:
+            capacity (int, optional): Samples kept. Defaults to DEFAULT_CAPACITY.
+
+        Raises:
+            TypeError: capacity is not an int
+            ValueError: capacity is not positive
+        """
+        if not isinstance(capacity, int):
+            raise TypeError(f"invalid type for capacity: {type(capacity)}. Expected: int")
+        if capacity <= 0:
+            raise ValueError(f"invalid value for capacity: {capacity}. Expected: > 0")
+        self.__capacity = capacity
+        self.__data = np.zeros((len(FIELDS), 2 * capacity), dtype=np.float64)
+        self.__index = 0
+        self.__size = 0
+        self.__lock = Lock()
+
+    @property
+    def capacity(self):
+        return self.__capacity
+
+    def __len__(self):
+        return self.__size
+
+    def append(self, time: float, angle: float, angular_velocity: float,
+               x: float, y: float, energy: float):
+        """Add a sample, dropping the oldest one when full"""
+        sample = (time, angle, angular_velocity, x, y, energy)
+        with self.__lock:
+            index = self.__index
+            self.__data[:, index] = sample
+            self.__data[:, index + self.__capacity] = sample
+            self.__index = (index + 1) % self.__capacity
+            self.__size = min(self.__size + 1, self.__capacity)
+
+    def view(self) -> np.ndarray:
+        """Samples oldest first, without copying. From the writing thread only, use
+        snapshot() from the others.
+
+        Returns:
+            np.ndarray: read-only array of shape (len(FIELDS), len(self)). Index rows
+            with TIME, ANGLE, ANGULAR_VELOCITY, X, Y, ENERGY
+        """
+        size = self.__size
+        end = self.__index if size < self.__capacity else self.__index + self.__capacity
+        view = self.__data[:, end - size:end]
+        view.flags.writeable = False
+        return view
+
+    def latest(self, field: int = TIME) -> float | None:
+        """Newest value of field, None when there are no samples. Safe from any thread."""
+        with self.__lock:
+            if not self.__size:
+                return None
+            return float(self.__data[field, self.__index - 1 + self.__capacity])
+
+    def snapshot(self, since: float | None = None) -> np.ndarray:
+        """Copy of the samples oldest first, consistent even while another thread appends
+        or clears
+
+        Args:
+            since (float | None, optional): Only samples at or after this time.
+            Defaults to None, every sample.
+
+        Returns:
+            np.ndarray: array of shape (len(FIELDS), samples)
+        """
+        with self.__lock:
+            view = self.view()
+            if since is not None:
+                view = view[:, int(np.searchsorted(view[TIME], since)):]
+            return np.array(view)
+
+    def clear(self):
+        """Drop every sample. The arrays are kept."""
+        with self.__lock:
+            self.__index = 0
+            self.__size = 0
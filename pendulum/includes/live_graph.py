@@ -0,0 +1,106 @@
+import numpy as np
+import pygame
+
+from includes.text_cache import render_text
+from pendulum.includes.history import ANGULAR_VELOCITY, ENERGY, TIME, X, TraceHistory
+from pendulum.includes.panel import PANEL_REFRESH, CachedPanel
+
+GRAPH_WINDOW = 10
+GRAPH_REFRESH = PANEL_REFRESH
+PLOTS = ((X, "position (px)", "#960000", True),
+         (ANGULAR_VELOCITY, "velocity (rad/s)", "#1F4E9C", True),
+         (ENERGY, "energy", "#2E7D32", False))
+_BACKGROUND = "#FFFFFF"
+_AXIS = "#B0B0B0"
+_TEXT = "#000000"
+
+
+def decimate(times: np.ndarray, values: np.ndarray, start: float, end: float,
+             width: int) -> tuple:
+    """Reduce samples to at most two per pixel column, the lowest and the highest, so
+    peaks survive however many samples fall in one column
+
+    Args:
+        times (np.ndarray): Sample times, increasing
+        values (np.ndarray): Sample values
+        start (float): Time at the left edge
+        end (float): Time at the right edge
+        width (int): Columns
+
+    Returns:
+        tuple: (columns, lows, highs) arrays, one entry per column that has samples
+    """
+    if not len(times) or end <= start:
+        empty = np.empty(0)
+        return empty.astype(int), empty, empty
+    columns = ((times - start) / (end - start) * (width - 1)).astype(int)
+    columns = np.clip(columns, 0, width - 1)
+    # times are sorted, so every column is one run of samples
+    firsts = np.flatnonzero(np.diff(columns, prepend=-1))
+    return (columns[firsts], np.minimum.reduceat(values, firsts),
+            np.maximum.reduceat(values, firsts))
+
+
+class LiveGraph(CachedPanel):
+    """LiveGraph
+    Position, velocity and energy of the last GRAPH_WINDOW seconds, drawn inside the
+    window from the pendulum history
+
+    The plots are redrawn into a cached surface every GRAPH_REFRESH seconds and blitted
+    in between. Drawing reads a snapshot of the history, the physics thread only waits
+    while it is copied.
+    """
+    def __init__(self, rect: pygame.Rect, font: pygame.font.Font,
+                 window: float = GRAPH_WINDOW, refresh: float = GRAPH_REFRESH):
+        """LiveGraph
+
+        Args:
+            rect (pygame.Rect): Where the graph is drawn on screen
+            font (pygame.font.Font): Font for the plot names
+            window (float, optional): Seconds shown. Defaults to GRAPH_WINDOW.
+            refresh (float, optional): Seconds between redraws. Defaults to GRAPH_REFRESH.
+        """
+        super().__init__(rect, refresh)
+        self.__font = font
+        self.__window = window
+
+    def draw(self, screen: pygame.Surface, history: TraceHistory):
+        """Draw the graph on screen, redrawing the plots when they are due"""
+        super().draw(screen, history)
+
+    def render(self, surface: pygame.Surface, history: TraceHistory):
+        surface.fill(_BACKGROUND)
+        pygame.draw.rect(surface, _AXIS, surface.get_rect(), 1)
+        # copy only the plotted window, the physics thread keeps writing the buffer
+        latest = history.latest()
+        end = 0.0 if latest is None else latest
+        start = end - self.__window
+        trace = history.snapshot(since=start)
+        if trace.shape[1]:
+            end = trace[TIME, -1]
+
+        width = self.rect.width - 2
+        height = self.rect.height // len(PLOTS)
+        for index, (field, name, color, symmetric) in enumerate(PLOTS):
+            top = index * height
+            area = pygame.Rect(1, top + 1, width, height - 2)
+            surface.blit(render_text(self.__font, name, True, _TEXT), (area.x + 4, area.y + 2))
+            values = trace[field]
+            if not len(values):
+                continue
+            if symmetric:
+                limit = float(np.abs(values).max()) or 1.0
+                low, high = -limit, limit
+                middle = area.y + area.height // 2
+                pygame.draw.line(surface, _AXIS, (area.left, middle), (area.right, middle))
+            else:
+                low, high = 0.0, float(values.max()) or 1.0
+            columns, lows, highs = decimate(trace[TIME], values, start, end, width)
+            scale = (area.height - 1) / (high - low)
+            y_high = (area.bottom - 1 - (highs - low) * scale).astype(int)
+            y_low = (area.bottom - 1 - (lows - low) * scale).astype(int)
+            x = (area.left + columns).tolist()
+            points = [point for pair in zip(zip(x, y_high.tolist()), zip(x, y_low.tolist()))
+                      for point in pair]
+            if len(points) > 1:
+                pygame.draw.lines(surface, color, False, points)
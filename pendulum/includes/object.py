@@ -1,9 +1,13 @@
-import re
 import math
+from itertools import repeat
+
+import numpy as np
 import pygame
 
+from includes.colors import is_hex_color
+from includes.compositor import get_compositor
+
 
-HEX_COLOR_PATTERN = "^#([0-9A-Fa-f]{3}){1,2}$"
 DEF_LINE_COLOR = "#000000"
 DEF_BORDER_COLOR = "#000000"
 DEF_FILL_COLOR = "#960000"
@@ -18,36 +22,105 @@ class Pendulum:
         self.balance = balance
         self.vel = 0
         self.angacc = 0
+        self.__colors_key = None
+        self.__colors = None
 
     def angle_length(self):
         self.length = math.sqrt(math.pow(self.x - self.balance, 2)
                             + math.pow(self.y - 50, 2))
-        self.angle = math.asin((self.x - self.balance) / self.length)
+        self.angle = math.atan2(self.x - self.balance, self.y - 50)
 
     def update_position(self):
         self.x = round(self.balance + self.length * math.sin(self.angle))
         self.y = round(50 + self.length * math.cos(self.angle))
 
-    def draw(self, screen: pygame.Surface, click_region: pygame.Surface,
-             line_color: str = DEF_LINE_COLOR, border_color: str = DEF_BORDER_COLOR,
-             fill_color: str = DEF_FILL_COLOR):
+    def draw(self, screen: pygame.Surface, line_color: str = DEF_LINE_COLOR,
+             border_color: str = DEF_BORDER_COLOR, fill_color: str = DEF_FILL_COLOR):
         if not isinstance(screen, pygame.Surface):
             raise TypeError("screen must be a pygame.Surface")
-        if not isinstance(click_region, pygame.Surface):
-            raise TypeError("click_region must be a pygame.Surface")
-        if not re.match(HEX_COLOR_PATTERN, line_color) or not isinstance(line_color, str):
-            line_color = DEF_LINE_COLOR
-        if not re.match(HEX_COLOR_PATTERN, border_color) or not isinstance(border_color, str):
-            border_color = DEF_BORDER_COLOR
-        if not re.match(HEX_COLOR_PATTERN, fill_color) or not isinstance(fill_color, str):
-            fill_color = DEF_FILL_COLOR
+        if (line_color, border_color, fill_color) != self.__colors_key:
+            self.__colors_key = (line_color, border_color, fill_color)
+            self.__colors = (line_color if is_hex_color(line_color) else DEF_LINE_COLOR,
+                             border_color if is_hex_color(border_color) else DEF_BORDER_COLOR,
+                             fill_color if is_hex_color(fill_color) else DEF_FILL_COLOR)
+        line_color, border_color, fill_color = self.__colors
         pygame.draw.lines(screen, line_color, False,
                           [(self.balance, 50), (self.x, self.y)], 2)
         pygame.draw.circle(screen, border_color,
                            (self.x, self.y), self.radius)
-        pygame.draw.line(click_region, fill_color,
-                         (self.old_x, self.old_y),
-                         (self.x, self.y), 2)
-        screen.blit(click_region, (0, 0))
         pygame.draw.circle(screen, fill_color,
-                           (self.x, self.y), self.radius - 2)
\ No newline at end of file
+                           (self.x, self.y), self.radius - 2)
+        dirty = pygame.Rect(self.balance, 50, 0, 0).unionall(
+            [pygame.Rect(self.x, self.y, 0, 0), pygame.Rect(self.old_x, self.old_y, 0, 0)])
+        get_compositor().track(self, dirty.inflate(2 * self.radius + 4, 2 * self.radius + 4),
+                               (self.x, self.y, self.old_x, self.old_y))
+
+
+class PendulumGroupDrawer:
+    """PendulumGroupDrawer
+    Draw many pendulums hanging from one pivot: every rod in one polyline, every bob in
+    one blits call
+    """
+    def __init__(self, radius: int, line_color: str = DEF_LINE_COLOR,
+                 border_color: str = DEF_BORDER_COLOR, fill_color: str = DEF_FILL_COLOR):
+        self.__radius = radius
+        self.__line_color = line_color if is_hex_color(line_color) else DEF_LINE_COLOR
+        border_color = border_color if is_hex_color(border_color) else DEF_BORDER_COLOR
+        fill_color = fill_color if is_hex_color(fill_color) else DEF_FILL_COLOR
+        self.__bob = pygame.Surface((2 * radius, 2 * radius), pygame.SRCALPHA, 32)
+        pygame.draw.circle(self.__bob, border_color, (radius, radius), radius)
+        pygame.draw.circle(self.__bob, fill_color, (radius, radius), radius - 2)
+        self.__frame = 0
+
+    def draw(self, screen: pygame.Surface, pivot: tuple, x: np.ndarray, y: np.ndarray):
+        """Draw pendulums with bobs at (x[i], y[i])
+
+        Args:
+            screen (pygame.Surface): Surface to draw on
+            pivot (tuple): Pivot of every rod
+            x (np.ndarray): Bob x, pixels
+            y (np.ndarray): Bob y, pixels
+        """
+        if not len(x):
+            get_compositor().forget(self)
+            return
+        points = np.empty((2 * len(x), 2), dtype=np.int32)
+        points[0::2] = pivot
+        points[1::2, 0] = x
+        points[1::2, 1] = y
+        pygame.draw.lines(screen, self.__line_color, False, points.tolist(), 1)
+        radius = self.__radius
+        screen.blits(zip(repeat(self.__bob), zip((x - radius).tolist(), (y - radius).tolist())),
+                     doreturn=False)
+        left, top = min(pivot[0], int(x.min())), min(pivot[1], int(y.min()))
+        right, bottom = max(pivot[0], int(x.max())), max(pivot[1], int(y.max()))
+        dirty = pygame.Rect(left, top, right - left, bottom - top).inflate(
+            2 * radius + 4, 2 * radius + 4)
+        # the bobs move every frame, a new state marks the old and the new region
+        self.__frame += 1
+        get_compositor().track(self, dirty, self.__frame)
+
+
+
+class ChainDrawer:
+    """ChainDrawer
+    Draw an N-link pendulum
+    """
+    def __init__(self, radius: int, line_color: str = DEF_LINE_COLOR,
+                 border_color: str = DEF_BORDER_COLOR, fill_color: str = DEF_FILL_COLOR):
+        self.__radius = radius
+        self.__line_color = line_color if is_hex_color(line_color) else DEF_LINE_COLOR
+        self.__border_color = border_color if is_hex_color(border_color) else DEF_BORDER_COLOR
+        self.__fill_color = fill_color if is_hex_color(fill_color) else DEF_FILL_COLOR
+
+    def draw(self, screen: pygame.Surface, pivot: tuple, x: np.ndarray, y: np.ndarray):
+        """Draw a chain with bobs at (x[i], y[i]), pixels"""
+        points = [tuple(pivot)] + list(zip(x.tolist(), y.tolist()))
+        pygame.draw.lines(screen, self.__line_color, False, points, 2)
+        for point in points[1:]:
+            pygame.draw.circle(screen, self.__border_color, point, self.__radius)
+            pygame.draw.circle(screen, self.__fill_color, point, self.__radius - 2)
+        dirty = pygame.Rect(pivot, (0, 0)).unionall([pygame.Rect(point, (0, 0))
+                                                     for point in points[1:]])
+        get_compositor().track(self, dirty.inflate(2 * self.__radius + 4,
+                                                   2 * self.__radius + 4), tuple(points))
@@ -0,0 +1,59 @@
+import time
+
+import pygame
+
+from includes.compositor import get_compositor
+
+PANEL_REFRESH = 0.1
+
+
+class CachedPanel:
+    """CachedPanel
+    Base class for a togglable panel drawn into a cached surface
+
+    render() redraws the surface at most every refresh seconds, draw() blits it in
+    between, so a panel costs one blit on most frames. Subclasses override render().
+    """
+    def __init__(self, rect: pygame.Rect, refresh: float = PANEL_REFRESH):
+        """CachedPanel
+
+        Args:
+            rect (pygame.Rect): Where the panel is drawn on screen
+            refresh (float, optional): Seconds between redraws. Defaults to PANEL_REFRESH.
+        """
+        self.__rect = pygame.Rect(rect)
+        self.__refresh = refresh
+        self.__surface = pygame.Surface(self.__rect.size)
+        self.__visible = False
+        self.__next_refresh = 0.0
+        self.__version = 0
+
+    @property
+    def rect(self):
+        return self.__rect
+
+    @property
+    def visible(self):
+        return self.__visible
+
+    def toggle(self):
+        """Show or hide the panel"""
+        self.__visible = not self.__visible
+        self.__next_refresh = 0.0
+
+    def draw(self, screen: pygame.Surface, *args, **kwargs):
+        """Draw the panel on screen, calling render(surface, *args, **kwargs) when a redraw
+        is due"""
+        if not self.__visible:
+            get_compositor().forget(self)
+            return
+        now = time.perf_counter()
+        if now >= self.__next_refresh:
+            self.__next_refresh = now + self.__refresh
+            self.render(self.__surface, *args, **kwargs)
+            self.__version += 1
+        screen.blit(self.__surface, self.__rect)
+        get_compositor().track(self, self.__rect, self.__version)
+
+    def render(self, surface: pygame.Surface, *args, **kwargs):
+        """Redraw the cached surface"""
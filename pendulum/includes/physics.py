@@ -0,0 +1,153 @@
+import math
+
+GRAVITY = 9.81
+PIXELS_PER_METER = 100
+SUBSTEP = 1 / 600
+MAX_FRAME_TIME = 0.25
+INTEGRATORS = ("verlet", "leapfrog", "rk4")
+DEFAULT_INTEGRATOR = "verlet"
+
+
+class PendulumPhysics:
+    """PendulumPhysics
+    A damped simple pendulum, in seconds, meters and radians
+
+    angular acceleration = -(gravity / length) * sin(angle) - damping * angular velocity
+
+    step(dt) advances by whole SUBSTEP steps and keeps the remainder for the next call,
+    so the motion does not depend on how often or how regularly step is called.
+    """
+    def __init__(self, length: float, angle: float = 0, angular_velocity: float = 0,
+                 gravity: float = GRAVITY, damping: float = 0,
+                 integrator: str = DEFAULT_INTEGRATOR, substep: float = SUBSTEP):
+        """PendulumPhysics
+
+        Args:
+            length (float): Rod length, meters
+            angle (float, optional): Angle from the vertical, radians. Defaults to 0.
+            angular_velocity (float, optional): Radians per second. Defaults to 0.
+            gravity (float, optional): m/s^2. Defaults to GRAVITY.
+            damping (float, optional): Damping coefficient, 1/s. Defaults to 0.
+            integrator (str, optional): "verlet", "leapfrog" or "rk4".
+            Defaults to DEFAULT_INTEGRATOR.
+            substep (float, optional): Fixed step, seconds. Defaults to SUBSTEP.
+
+        Raises:
+            ValueError: length or substep is not positive, or unknown integrator
+        """
+        if length <= 0:
+            raise ValueError(f"invalid value for length: {length}. Expected: > 0")
+        if substep <= 0:
+            raise ValueError(f"invalid value for substep: {substep}. Expected: > 0")
+        self.length = length
+        self.gravity = gravity
+        self.damping = damping
+        self.angle = angle
+        self.angular_velocity = angular_velocity
+        self.time = 0.0
+        self.dissipated = 0.0
+        self.__substep = substep
+        self.__accumulator = 0.0
+        self.__step = None
+        self.integrator = integrator
+
+    @property
+    def integrator(self):
+        return self.__integrator
+
+    @integrator.setter
+    def integrator(self, integrator: str):
+        if integrator not in INTEGRATORS:
+            raise ValueError(f"invalid value for integrator: {integrator}. "
+                             f"Expected: {', '.join(INTEGRATORS)}")
+        self.__integrator = integrator
+        self.__step = {"verlet": self.__verlet, "leapfrog": self.__leapfrog,
+                       "rk4": self.__rk4}[integrator]
+
+    @property
+    def substep(self):
+        return self.__substep
+
+    def acceleration(self, angle: float, angular_velocity: float) -> float:
+        """Angular acceleration, rad/s^2"""
+        return (-(self.gravity / self.length) * math.sin(angle)
+                - self.damping * angular_velocity)
+
+    def kinetic_energy(self) -> float:
+        """Kinetic energy per unit mass, J/kg"""
+        return 0.5 * (self.length * self.angular_velocity) ** 2
+
+    def potential_energy(self) -> float:
+        """Potential energy per unit mass above the lowest point, J/kg"""
+        return self.gravity * self.length * (1 - math.cos(self.angle))
+
+    def energy(self) -> float:
+        """Kinetic plus potential energy per unit mass, J/kg. Zero at rest at the bottom."""
+        return self.kinetic_energy() + self.potential_energy()
+
+    def energy_scale(self) -> float:
+        """Potential energy held straight up, J/kg. The unit energy drift is measured in."""
+        return 2 * self.gravity * self.length
+
+    def step(self, dt: float) -> int:
+        """Advance by dt seconds of real time
+
+        Args:
+            dt (float): Elapsed time. Capped at MAX_FRAME_TIME, so a stalled thread does
+            not make the pendulum jump.
+
+        Returns:
+            int: substeps taken
+        """
+        self.__accumulator += min(max(dt, 0.0), MAX_FRAME_TIME)
+        steps = int(self.__accumulator / self.__substep)
+        self.__accumulator -= steps * self.__substep
+        step = self.__step
+        h = self.__substep
+        # energy taken out by damping, damping * length^2 * angular velocity^2 watts per
+        # kg, so energy() + dissipated only drifts by the integrator's error. Every step
+        # returns the mean squared angular velocity over the step, integrated to the
+        # integrator's own order.
+        damping = self.damping * self.length ** 2
+        for _ in range(steps):
+            squared = step(h)
+            if damping:
+                self.dissipated += damping * squared * h
+        self.time += steps * h
+        return steps
+
+    def __verlet(self, h: float) -> float:
+        # velocity Verlet. The velocity in the new acceleration is predicted, which only
+        # matters when damping is on
+        angle, velocity = self.angle, self.angular_velocity
+        acc = self.acceleration(angle, velocity)
+        angle += velocity * h + 0.5 * acc * h * h
+        new_acc = self.acceleration(angle, velocity + acc * h)
+        self.angle = angle
+        self.angular_velocity = velocity + 0.5 * (acc + new_acc) * h
+        # trapezoid rule, second order like the step
+        return 0.5 * (velocity * velocity + self.angular_velocity ** 2)
+
+    def __leapfrog(self, h: float) -> float:
+        # kick, drift, kick
+        start = self.angular_velocity
+        velocity = start + 0.5 * h * self.acceleration(self.angle, start)
+        self.angle += velocity * h
+        self.angular_velocity = velocity + 0.5 * h * self.acceleration(self.angle, velocity)
+        return 0.5 * (start * start + self.angular_velocity ** 2)
+
+    def __rk4(self, h: float) -> float:
+        acceleration = self.acceleration
+        angle, velocity = self.angle, self.angular_velocity
+        k1_a, k1_v = velocity, acceleration(angle, velocity)
+        k2_a = velocity + 0.5 * h * k1_v
+        k2_v = acceleration(angle + 0.5 * h * k1_a, k2_a)
+        k3_a = velocity + 0.5 * h * k2_v
+        k3_v = acceleration(angle + 0.5 * h * k2_a, k3_a)
+        k4_a = velocity + h * k3_v
+        k4_v = acceleration(angle + h * k3_a, k4_a)
+        self.angle = angle + h / 6 * (k1_a + 2 * k2_a + 2 * k3_a + k4_a)
+        self.angular_velocity = velocity + h / 6 * (k1_v + 2 * k2_v + 2 * k3_v + k4_v)
+        # the stage velocities are the angle derivatives, so the RK4 weights integrate
+        # their squares to fourth order
+        return (k1_a * k1_a + 2 * k2_a * k2_a + 2 * k3_a * k3_a + k4_a * k4_a) / 6
@@ -0,0 +1,79 @@
+from queue import Empty, SimpleQueue
+from typing import Any, Callable, NamedTuple
+
+import numpy as np
+
+
+class PendulumState(NamedTuple):
+    """PendulumState
+    What the renderer needs of the swinging pendulum after one physics tick. Immutable, so
+    it can be handed to another thread as is.
+
+    generation changes whenever a new pendulum is released or the model changes. x and y
+    hold one bob per link, in pixels, and are empty when nothing swings. ensemble_x and
+    ensemble_y are read-only arrays with one bob per ensemble pendulum, in pixels.
+    """
+    generation: int
+    time: float
+    angle: float
+    angular_velocity: float
+    x: tuple
+    y: tuple
+    ensemble_x: np.ndarray
+    ensemble_y: np.ndarray
+
+
+_NO_BOBS = np.empty(0, dtype=np.int32)
+_NO_BOBS.flags.writeable = False
+IDLE_STATE = PendulumState(0, 0.0, 0.0, 0.0, (), (), _NO_BOBS, _NO_BOBS)
+
+
+class StateBuffer:
+    """StateBuffer
+    Double buffer of PendulumState for one writer and any number of readers
+
+    publish() fills the back slot, then flips which slot is the front one. latest() reads
+    the front slot. States are never changed after they are published, so neither side
+    takes a lock and a reader always gets one whole tick.
+    """
+    def __init__(self, state: PendulumState = IDLE_STATE):
+        self.__slots = [state, state]
+        self.__front = 0
+
+    def publish(self, state: PendulumState):
+        """Make state the latest one. From the physics thread only."""
+        back = 1 - self.__front
+        self.__slots[back] = state
+        self.__front = back
+
+    def latest(self) -> PendulumState:
+        """The last published state"""
+        return self.__slots[self.__front]
+
+
+class CommandQueue:
+    """CommandQueue
+    Calls sent from the main thread and run on the physics thread between ticks, so the
+    physics thread is the only one that touches the objects it steps
+    """
+    def __init__(self):
+        self.__commands = SimpleQueue()
+
+    def send(self, command: Callable[..., Any], *args):
+        """Run command(*args) before the next tick"""
+        self.__commands.put((command, args))
+
+    def run_pending(self) -> int:
+        """Run every command sent so far, in order
+
+        Returns:
+            int: commands run
+        """
+        count = 0
+        while True:
+            try:
+                command, args = self.__commands.get_nowait()
+            except Empty:
+                return count
+            command(*args)
+            count += 1
@@ -0,0 +1,106 @@
+import pygame
+
+from includes.colors import is_hex_color
+from includes.compositor import get_compositor
+
+TRAIL_LENGTH = 240
+REBUILD_INTERVAL = 30
+DEF_TRAIL_COLOR = "#960000"
+
+
+class Trail:
+    """Trail
+    The path of a moving point, as its last length segments
+
+    Segments are kept in a ring buffer and drawn into one surface allocated once. A new
+    segment is drawn on its own. Every REBUILD_INTERVAL segments the region the trail
+    covers is cleared and the ring buffer is drawn again with older segments more
+    transparent, which fades the trail and drops segments that fell out of the buffer.
+    Both cost at most length line draws. Use from the main thread only.
+    """
+    def __init__(self, size: tuple, color: str = DEF_TRAIL_COLOR,
+                 length: int = TRAIL_LENGTH, width: int = 2):
+        """Trail
+
+        Args:
+            size (tuple): Size of the area the point moves in, pixels
+            color (str, optional): Hex color. Defaults to DEF_TRAIL_COLOR.
+            length (int, optional): Segments kept. Defaults to TRAIL_LENGTH.
+            width (int, optional): Line width. Defaults to 2.
+
+        Raises:
+            ValueError: length is not positive
+        """
+        if length <= 0:
+            raise ValueError(f"invalid value for length: {length}. Expected: > 0")
+        self.__surface = pygame.Surface(size, pygame.SRCALPHA, 32)
+        self.__color = pygame.Color(color if is_hex_color(color) else DEF_TRAIL_COLOR)
+        self.__width = width
+        self.__segments = [None] * length
+        self.__index = 0
+        self.__count = 0
+        self.__since_rebuild = 0
+        self.__last_point = None
+        self.__rect = None
+        self.__version = 0
+
+    def __len__(self):
+        return self.__count
+
+    def add(self, point: tuple):
+        """Extend the trail to point"""
+        point = (int(point[0]), int(point[1]))
+        last, self.__last_point = self.__last_point, point
+        if last is None or last == point:
+            return
+        segments = self.__segments
+        segments[self.__index] = (last, point)
+        self.__index = (self.__index + 1) % len(segments)
+        self.__count = min(self.__count + 1, len(segments))
+        self.__since_rebuild += 1
+        if self.__since_rebuild >= REBUILD_INTERVAL:
+            self.__rebuild()
+        else:
+            self.__include(pygame.draw.line(self.__surface, self.__color, last, point,
+                                            self.__width))
+        self.__version += 1
+
+    def clear(self):
+        """Remove the trail. The next add() starts a new one."""
+        if self.__rect is not None:
+            self.__surface.fill((0, 0, 0, 0), self.__rect)
+            get_compositor().mark(self.__rect)
+        self.__segments = [None] * len(self.__segments)
+        self.__index = 0
+        self.__count = 0
+        self.__since_rebuild = 0
+        self.__last_point = None
+        self.__rect = None
+        self.__version += 1
+
+    def draw(self, screen: pygame.Surface, offset: tuple = (0, 0)):
+        """Blit the part of the trail surface that has segments on it"""
+        if self.__rect is None:
+            get_compositor().forget(self)
+            return
+        screen.blit(self.__surface, (offset[0] + self.__rect.x, offset[1] + self.__rect.y),
+                    self.__rect)
+        get_compositor().track(self, self.__rect.move(offset), self.__version)
+
+    def __include(self, rect: pygame.Rect):
+        self.__rect = rect if self.__rect is None else self.__rect.union(rect)
+
+    def __rebuild(self):
+        self.__since_rebuild = 0
+        if self.__rect is not None:
+            self.__surface.fill((0, 0, 0, 0), self.__rect)
+        self.__rect = None
+        segments = self.__segments
+        count = self.__count
+        start = (self.__index - count) % len(segments)
+        color = pygame.Color(self.__color)
+        for age in range(count):
+            color.a = self.__color.a * (age + 1) // count
+            start_point, end_point = segments[(start + age) % len(segments)]
+            self.__include(pygame.draw.line(self.__surface, color, start_point, end_point,
+                                            self.__width))
@@ -1,157 +1,364 @@
-import math
-import time
-from pathlib import Path
-from threading import Thread
-
-import matplotlib.pyplot as plt
-import pygame
-
-from includes.button import Button
-from pendulum.includes.graph import coordinates_process
-from includes.label import Label
-from pendulum.includes.object import Pendulum
-
-_WIDTH = 950
-_HEIGHT = 600
-_WHITE = "#FFFFFF"
-_BLACK = "#000000"
-_DARK_RED = "#960000"
-_FPS = 60
-
-
-class PendulumMain:
-    def __init__(self) -> None:
-        pygame.init()
-        self.__screen = pygame.display.set_mode((_WIDTH, _HEIGHT))
-        self.__clock = pygame.time.Clock()
-        self.__click_region = pygame.Surface(
-            (_WIDTH, _HEIGHT), pygame.SRCALPHA, 32).convert_alpha()
-        self.__button_font = pygame.font.SysFont("times new roman", 40)
-        self.__label_font = pygame.font.SysFont("times new roman", 20)
-        self.__background = pygame.image.load(rf"{Path(__file__).parent}"
-                                              r"\assets\background.png").convert_alpha()
-        self.__exception_region = pygame.Rect(645, 100, 270, 175)
-
-        self.__running = True
-        self.__acceleration = False
-        self.__times_loop = []
-        self.__arr_x = []
-        self.__count_loop = 0
-        self.__angular_accel_change = 0
-        self.__vel_change = 0
-
-        self.__balance = int(_WIDTH / 2)
-        self.__pendulum = Pendulum((self.__balance, -10), 2, self.__balance)
-
-    def init_widgets(self):
-        self.__btn_vel_increase = Button(self.__screen, font=self.__button_font,text="+",
-                                         command=self.increase_vel, use_thread=False)
-        self.__btn_vel_decrease = Button(self.__screen, font=self.__button_font, text="-",
-                                         command=self.decrease_vel, use_thread=False)
-        self.__btn_damp_increase = Button(self.__screen, font=self.__button_font, text="+",
-                                          command=self.increase_damp, use_thread=False)
-        self.__btn_damp_decrease = Button(self.__screen, font=self.__button_font, text="-",
-                                          command=self.decrease_damp, use_thread=False)
-        self.__btn_reset_value = Button(self.__screen, font=self.__button_font, text="Reset",
-                                        command=self.reset_value, use_thread=False)
-        self.__btn_draw_graph = Button(self.__screen, font=self.__button_font,
-                                       text="Graph", command=self.draw_graph, use_thread=False)
-        self.__label_velocity = Label(
-            self.__screen, font=self.__label_font, text="VELOCITY")
-        self.__label_damping = Label(
-            self.__screen, font=self.__label_font, text="DAMPING")
-
-    def draw_widget(self):
-        self.__label_velocity.place(705, 100, 150, 55)
-        self.__label_damping.place(705, 160, 150, 55)
-        self.__btn_vel_increase.place(645, 100, 55, 55)
-        self.__btn_vel_decrease.place(860, 100, 55, 55)
-        self.__btn_damp_increase.place(645, 160, 55, 55)
-        self.__btn_damp_decrease.place(860, 160, 55, 55)
-        self.__btn_draw_graph.place(645, 220, 130, 55)
-        self.__btn_reset_value.place(785, 220, 130, 55)
-        self.__pendulum.draw(
-            self.__screen, self.__click_region, _BLACK, _BLACK, _DARK_RED)
-
-    def increase_vel(self):
-        if self.__angular_accel_change + 0.0005 <= 1:
-            self.__angular_accel_change += 0.0005
-
-    def decrease_vel(self):
-        if self.__angular_accel_change - 0.0005 >= 0:
-            self.__angular_accel_change -= 0.0005
-
-    def increase_damp(self):
-        if self.__vel_change - 0.0005 >= -0.01:
-            self.__vel_change -= 0.0005
-
-    def decrease_damp(self):
-        if self.__vel_change + 0.0005 <= 0:
-            self.__vel_change += 0.0005
-
-    def reset_value(self):
-        self.__vel_change = self.__angular_accel_change = 0
-
-    def draw_graph(self):
-        plt.clf()
-        position_x, position_y = coordinates_process(
-            " ".join(self.__arr_x), " ".join(self.__times_loop))
-        plt.plot(position_y, position_x)
-        plt.title('Pendulum Graph')
-        plt.xlabel('Position update instance')
-        plt.ylabel('Position with respect to balance')
-        plt.show()
-
-    def animation(self, fps):
-        while self.__running:
-            if self.__acceleration:
-                self.__times_loop.append(str(self.__count_loop))
-                self.__pendulum.old_x = self.__pendulum.x
-                self.__pendulum.old_y = self.__pendulum.y
-                self.__arr_x.append(
-                    str(self.__pendulum.x - self.__pendulum.balance))
-                self.__pendulum.angacc = - \
-                    (0.0005 + self.__angular_accel_change) * \
-                    math.sin(self.__pendulum.angle)
-                self.__pendulum.vel += self.__pendulum.angacc
-                self.__pendulum.vel *= (1 + self.__vel_change)
-                self.__pendulum.angle += self.__pendulum.vel
-                self.__pendulum.update_position()
-                self.__count_loop += 1
-            if self.__count_loop % 180 == 0:
-                self.reset_region()
-            time.sleep(1/fps)
-
-
-    def reset_region(self):
-        try:
-            self.__click_region = self.__click_region = pygame.Surface(
-                                (_WIDTH, _HEIGHT), pygame.SRCALPHA, 32).convert_alpha()
-        except pygame.error:
-            pass
-
-    def mainloop(self):
-        Thread(target=self.animation, args=(_FPS,)).start()
-        while self.__running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    return 0
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    mouse_pos = pygame.mouse.get_pos()
-                    if not self.__exception_region.collidepoint(mouse_pos):
-                        self.__arr_x = []
-                        self.__times_loop = []
-                        self.__count_loop = 0
-                        self.reset_region()
-                        self.__pendulum = Pendulum(
-                            pygame.mouse.get_pos(), 15, self.__balance)
-                        self.__pendulum.angle_length()
-                        self.__acceleration = True
-
-            self.__screen.fill(_WHITE)
-            self.__screen.blit(pygame.transform.scale(
-                self.__background, (955, 555)), (0, 0))
-            self.draw_widget()
-            pygame.display.flip()
-            self.__clock.tick(_FPS)
\ No newline at end of file
+import math
+import time
+from threading import Event, Thread
+
+import numpy as np
+import pygame
+
+from includes.button import Button
+from includes.assets import asset_path, get_assets
+from includes.scene import Scene, get_scene_manager
+from includes.label import Label
+from includes.profiler import get_profiler
+from includes.render import StaticLayer
+from pendulum.includes.chain import PendulumChain
+from pendulum.includes.diagnostics import DiagnosticsPanel, EnergyMonitor
+from pendulum.includes.history import TraceHistory
+from pendulum.includes.live_graph import LiveGraph
+from pendulum.includes.ensemble import PendulumEnsemble
+from pendulum.includes.object import ChainDrawer, Pendulum, PendulumGroupDrawer
+from pendulum.includes.physics import GRAVITY, INTEGRATORS, PIXELS_PER_METER, PendulumPhysics
+from pendulum.includes.state import IDLE_STATE, CommandQueue, PendulumState, StateBuffer
+from pendulum.includes.trail import Trail
+
+_WIDTH = 950
+_HEIGHT = 600
+_WHITE = "#FFFFFF"
+_BLACK = "#000000"
+_DARK_RED = "#960000"
+_FPS = 60
+_HISTORY_CAPACITY = 4096
+_INTEGRATOR = "verlet"
+_GRAVITY_STEP = GRAVITY
+_MAX_GRAVITY = 20 * GRAVITY
+_DAMPING_STEP = 0.03
+_MAX_DAMPING = 0.6
+_PIVOT_Y = 50
+_ENSEMBLE_RADIUS = 8
+_WAVE_ANGLE = math.radians(20)
+_MODELS = {"single": 1, "double": 2, "triple": 3}
+_CHAIN_RADIUS = 12
+
+
+class PendulumMain(Scene):
+    name = "pendulum"
+    caption = "Pendulum Simulation"
+    size = (_WIDTH, _HEIGHT)
+    fps = _FPS
+
+    def __init__(self) -> None:
+        assets = get_assets()
+        self.__screen = get_scene_manager().get_screen(self.size)
+        self.__trail = Trail((_WIDTH, _HEIGHT), _DARK_RED)
+        self.__button_font = assets.sys_font("times new roman", 40)
+        self.__label_font = assets.sys_font("times new roman", 20)
+        self.__background = assets.image(asset_path(__file__, "background.png"), (955, 555))
+        self.__static_layer = StaticLayer(self.draw_static)
+        self.__exception_region = pygame.Rect(645, 100, 270, 175)
+        self.__graph = LiveGraph(pygame.Rect(645, 290, 270, 270), self.__label_font)
+        self.__diagnostics = DiagnosticsPanel(pygame.Rect(30, 290, 270, 270),
+                                              self.__label_font)
+
+        self.__stop = Event()
+        self.__animation = None
+        self.__commands = CommandQueue()
+        self.__states = StateBuffer()
+        self.__generation = 0
+        self.__drawn_generation = 0
+        self.__history = TraceHistory(_HISTORY_CAPACITY)
+        self.__monitor = EnergyMonitor()
+        self.__integrator = _INTEGRATOR
+        self.__gravity = GRAVITY
+        self.__damping = 0
+        self.__physics = None
+        self.__model = "single"
+        self.__chain = None
+        self.__chain_drawer = ChainDrawer(_CHAIN_RADIUS, _BLACK, _BLACK, _DARK_RED)
+        self.__ensemble = PendulumEnsemble(integrator=_INTEGRATOR)
+        self.__ensemble_drawer = PendulumGroupDrawer(_ENSEMBLE_RADIUS, _BLACK, _BLACK, _DARK_RED)
+
+        self.__balance = int(_WIDTH / 2)
+        self.__pendulum = Pendulum((self.__balance, -10), 2, self.__balance)
+
+    def init_widgets(self):
+        self.__btn_vel_increase = Button(self.__screen, font=self.__button_font,text="+",
+                                         command=self.increase_vel, use_thread=False)
+        self.__btn_vel_decrease = Button(self.__screen, font=self.__button_font, text="-",
+                                         command=self.decrease_vel, use_thread=False)
+        self.__btn_damp_increase = Button(self.__screen, font=self.__button_font, text="+",
+                                          command=self.increase_damp, use_thread=False)
+        self.__btn_damp_decrease = Button(self.__screen, font=self.__button_font, text="-",
+                                          command=self.decrease_damp, use_thread=False)
+        self.__btn_reset_value = Button(self.__screen, font=self.__button_font, text="Reset",
+                                        command=self.reset_value, use_thread=False)
+        self.__btn_draw_graph = Button(self.__screen, font=self.__button_font,
+                                       text="Graph", command=self.draw_graph, use_thread=False)
+
+    def draw_widgets(self):
+        self.__btn_vel_increase.place(645, 100, 55, 55)
+        self.__btn_vel_decrease.place(860, 100, 55, 55)
+        self.__btn_damp_increase.place(645, 160, 55, 55)
+        self.__btn_damp_decrease.place(860, 160, 55, 55)
+        self.__btn_draw_graph.place(645, 220, 130, 55)
+        self.__btn_reset_value.place(785, 220, 130, 55)
+        self.__graph.draw(self.__screen, self.__history)
+        self.__diagnostics.draw(self.__screen, self.__history, self.__monitor.reading,
+                                "J/kg" if self.__model == "single" else "J")
+
+    def increase_vel(self):
+        self.__set_parameters(min(self.__gravity + _GRAVITY_STEP, _MAX_GRAVITY),
+                              self.__damping)
+
+    def decrease_vel(self):
+        self.__set_parameters(max(self.__gravity - _GRAVITY_STEP, GRAVITY), self.__damping)
+
+    def increase_damp(self):
+        self.__set_parameters(self.__gravity,
+                              min(self.__damping + _DAMPING_STEP, _MAX_DAMPING))
+
+    def decrease_damp(self):
+        self.__set_parameters(self.__gravity, max(self.__damping - _DAMPING_STEP, 0))
+
+    def reset_value(self):
+        self.__set_parameters(GRAVITY, 0)
+
+    def __set_parameters(self, gravity: float, damping: float):
+        """Gravity in m/s^2 and damping coefficient in 1/s, also for the swinging pendulum"""
+        self.__gravity = gravity
+        self.__damping = damping
+        self.__commands.send(self.__apply_parameters, gravity, damping)
+
+    def next_model(self):
+        """Switch between the single pendulum and the 2 and 3 link chains"""
+        models = list(_MODELS)
+        self.__model = models[(models.index(self.__model) + 1) % len(models)]
+        self.__commands.send(self.__stop_pendulum)
+        self.__update_caption()
+
+    def next_integrator(self):
+        """Switch the single pendulum to the next integrator. The energy drift starts over,
+        so the diagnostics compare the integrators."""
+        self.__integrator = INTEGRATORS[(INTEGRATORS.index(self.__integrator) + 1)
+                                        % len(INTEGRATORS)]
+        self.__commands.send(self.__apply_integrator, self.__integrator)
+        self.__update_caption()
+
+    def __update_caption(self):
+        detail = f"single, {self.__integrator}" if self.__model == "single" else self.__model
+        pygame.display.set_caption(f"{self.caption} ({detail})")
+
+    def draw_graph(self):
+        """Show or hide the live graph"""
+        self.__graph.toggle()
+
+    def draw_diagnostics(self):
+        """Show or hide the phase portrait and energy panel"""
+        self.__diagnostics.toggle()
+
+    # The methods below run on the animation thread, the only one that steps the physics,
+    # the chain and the ensemble and writes the history and the energy monitor. The main thread sends
+    # them through self.__commands and draws from the published PendulumState, history
+    # snapshots and energy readings.
+
+    def animation(self, fps):
+        profiler = get_profiler()
+        last = time.perf_counter()
+        while not self.__stop.is_set():
+            start = time.perf_counter()
+            self.__commands.run_pending()
+            # physics runs on real elapsed time in fixed substeps, fps only sets how often
+            # the drawn position is refreshed
+            dt, last = start - last, start
+            self.__tick(dt)
+            # the pendulum moves on this thread, the main loop physics phase stays empty
+            profiler.record("physics thread", time.perf_counter() - start)
+            # returns as soon as exit() sets the event
+            self.__stop.wait(1 / fps)
+
+    def __tick(self, dt: float):
+        physics, chain = self.__physics, self.__chain
+        energy = None
+        if physics is not None:
+            physics.step(dt)
+            kinetic, potential = physics.kinetic_energy(), physics.potential_energy()
+            self.__monitor.update(kinetic, potential, physics.dissipated,
+                                  physics.energy_scale())
+            energy = kinetic + potential
+        elif chain is not None:
+            chain.step(dt)
+            kinetic, potential = chain.kinetic_energy()[0], chain.potential_energy()[0]
+            self.__monitor.update(kinetic, potential, chain.dissipated[0],
+                                  chain.energy_scale())
+            energy = kinetic + potential
+        self.__ensemble.step(dt)
+        state = self.__publish()
+        if energy is not None:
+            self.__history.append(state.time, state.angle, state.angular_velocity,
+                                  state.x[-1] - self.__balance, state.y[-1], energy)
+
+    def __publish(self) -> PendulumState:
+        """Publish the state of the swinging pendulum or chain, and of the ensemble, for
+        the main thread"""
+        physics, chain = self.__physics, self.__chain
+        ensemble_x, ensemble_y = self.__ensemble.positions((self.__balance, _PIVOT_Y),
+                                                           PIXELS_PER_METER)
+        ensemble_x.flags.writeable = False
+        ensemble_y.flags.writeable = False
+        if physics is not None:
+            length = physics.length * PIXELS_PER_METER
+            state = PendulumState(self.__generation, physics.time, physics.angle,
+                                  physics.angular_velocity,
+                                  (round(self.__balance + length * math.sin(physics.angle)),),
+                                  (round(_PIVOT_Y + length * math.cos(physics.angle)),),
+                                  ensemble_x, ensemble_y)
+        elif chain is not None:
+            x, y = chain.positions()
+            state = PendulumState(
+                self.__generation, chain.time, float(chain.angles[0, 0]),
+                float(chain.angular_velocities[0, 0]),
+                tuple(np.rint(self.__balance + x[0] * PIXELS_PER_METER).astype(int).tolist()),
+                tuple(np.rint(_PIVOT_Y + y[0] * PIXELS_PER_METER).astype(int).tolist()),
+                ensemble_x, ensemble_y)
+        else:
+            state = IDLE_STATE._replace(generation=self.__generation, ensemble_x=ensemble_x,
+                                        ensemble_y=ensemble_y)
+        self.__states.publish(state)
+        return state
+
+    def __start_over(self):
+        """A new pendulum or none: new generation, empty history, new energy reference"""
+        self.__generation += 1
+        self.__history.clear()
+        self.__monitor.restart()
+        self.__publish()
+
+    def __apply_parameters(self, gravity: float, damping: float):
+        for model in (self.__physics, self.__chain):
+            if model is not None:
+                model.gravity = gravity
+                model.damping = damping
+        self.__ensemble.set_parameters(gravity, damping)
+        self.__monitor.restart()
+
+    def __apply_integrator(self, integrator: str):
+        if self.__physics is not None:
+            self.__physics.integrator = integrator
+        self.__monitor.restart()
+
+    def __stop_pendulum(self):
+        self.__physics = None
+        self.__chain = None
+        self.__start_over()
+
+    def __release_pendulum(self, length: float, angle: float, gravity: float,
+                           damping: float, integrator: str):
+        self.__chain = None
+        self.__physics = PendulumPhysics(length, angle, gravity=gravity, damping=damping,
+                                         integrator=integrator)
+        self.__start_over()
+
+    def __release_chain(self, lengths: list, angles: list, gravity: float, damping: float):
+        self.__physics = None
+        self.__chain = PendulumChain(lengths, angles=angles, gravity=gravity,
+                                     damping=damping)
+        self.__start_over()
+
+    def enter(self):
+        self.__stop.clear()
+        self.__animation = Thread(target=self.animation, args=(_FPS,), daemon=True)
+        self.__animation.start()
+
+    def exit(self):
+        self.__stop.set()
+        if self.__animation is not None:
+            self.__animation.join()
+            self.__animation = None
+
+    def add_to_ensemble(self, position: tuple):
+        """Add a pendulum with its bob at position to the ensemble"""
+        dx, dy = position[0] - self.__balance, position[1] - _PIVOT_Y
+        length = math.hypot(dx, dy)
+        if length:
+            self.__commands.send(self.__ensemble.add, length / PIXELS_PER_METER,
+                                 math.atan2(dx, dy))
+
+    def release_pendulum(self, position: tuple):
+        """Release a single pendulum from rest with its bob at position"""
+        if position[0] == self.__balance and position[1] == _PIVOT_Y:
+            return
+        pendulum = Pendulum(position, 15, self.__balance)
+        pendulum.angle_length()
+        self.__commands.send(self.__release_pendulum, pendulum.length / PIXELS_PER_METER,
+                             pendulum.angle, self.__gravity, self.__damping,
+                             self.__integrator)
+
+    def release_chain(self, position: tuple):
+        """Release a chain of the current model, held straight with its last bob at
+        position"""
+        dx, dy = position[0] - self.__balance, position[1] - _PIVOT_Y
+        length = math.hypot(dx, dy)
+        if not length:
+            return
+        links = _MODELS[self.__model]
+        self.__commands.send(self.__release_chain,
+                             [length / links / PIXELS_PER_METER] * links,
+                             [math.atan2(dx, dy)] * links, self.__gravity, self.__damping)
+
+    def handle_event(self, event: pygame.event.Event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_w:
+                self.__commands.send(self.__ensemble.add_wave, _WAVE_ANGLE)
+            elif event.key == pygame.K_c:
+                self.__commands.send(self.__ensemble.clear)
+            elif event.key == pygame.K_m:
+                self.next_model()
+            elif event.key == pygame.K_i:
+                self.next_integrator()
+            elif event.key == pygame.K_d:
+                self.draw_diagnostics()
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            mouse_pos = pygame.mouse.get_pos()
+            if self.__exception_region.collidepoint(mouse_pos):
+                return
+            if self.__graph.visible and self.__graph.rect.collidepoint(mouse_pos):
+                return
+            if self.__diagnostics.visible and self.__diagnostics.rect.collidepoint(mouse_pos):
+                return
+            if pygame.key.get_mods() & pygame.KMOD_SHIFT:
+                self.add_to_ensemble(mouse_pos)
+            elif self.__model != "single":
+                self.release_chain(mouse_pos)
+            else:
+                self.release_pendulum(mouse_pos)
+
+    def draw_static(self, surface: pygame.Surface):
+        """Background and labels, composed once by the static layer"""
+        surface.fill(_WHITE)
+        surface.blit(self.__background, (0, 0))
+        Label(surface, font=self.__label_font, text="GRAVITY").place(705, 100, 150, 55)
+        Label(surface, font=self.__label_font, text="DAMPING").place(705, 160, 150, 55)
+
+    def draw(self):
+        self.__static_layer.draw(self.__screen)
+        # one immutable state for the whole frame, however far the physics thread gets
+        state = self.__states.latest()
+        if state.generation != self.__drawn_generation:
+            self.__drawn_generation = state.generation
+            self.__trail.clear()
+            self.__pendulum = Pendulum((state.x[0], state.y[0]), 15, self.__balance) \
+                if len(state.x) == 1 else Pendulum((self.__balance, -10), 2, self.__balance)
+        if len(state.x) > 1:
+            self.__trail.add((state.x[-1], state.y[-1]))
+            self.__trail.draw(self.__screen)
+            self.__chain_drawer.draw(self.__screen, (self.__balance, _PIVOT_Y),
+                                     np.array(state.x), np.array(state.y))
+        else:
+            if state.x:
+                pendulum = self.__pendulum
+                pendulum.old_x, pendulum.old_y = pendulum.x, pendulum.y
+                pendulum.x, pendulum.y = state.x[0], state.y[0]
+                self.__trail.add((pendulum.x, pendulum.y))
+            self.__trail.draw(self.__screen)
+            self.__pendulum.draw(self.__screen, _BLACK, _BLACK, _DARK_RED)
+        self.__ensemble_drawer.draw(self.__screen, (self.__balance, _PIVOT_Y),
+                                    state.ensemble_x, state.ensemble_y)
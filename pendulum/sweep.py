@@ -0,0 +1,216 @@
+"""Pendulum sweep
+
+Measure the period and amplitude decay of a pendulum over a grid of initial angles,
+lengths, gravities and damping coefficients, without a window. Run from the project's
+root folder:
+
+    python3 -m pendulum.sweep --angles 5:170:34 --lengths 0.5,1,2 --damping 0:0.2:5
+
+A range is start:stop:count (inclusive), a list is comma separated. Angles are in
+degrees. Results are written to an .npz file, one array entry per configuration.
+"""
+import argparse
+import sys
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+from pendulum.includes.ensemble import PendulumEnsemble
+from pendulum.includes.physics import DEFAULT_INTEGRATOR, GRAVITY, INTEGRATORS
+
+DURATION = 20
+SUBSTEP = 1e-3
+CHUNK_SIZE = 65536
+AGM_TOLERANCE = 1e-15
+
+
+def complete_elliptic_k(k: np.ndarray) -> np.ndarray:
+    """Complete elliptic integral of the first kind K(k), k the modulus, with the
+    arithmetic-geometric mean: K(k) = pi / (2 * AGM(1, sqrt(1 - k^2)))"""
+    a = np.ones_like(k, dtype=np.float64)
+    b = np.sqrt(1 - np.asarray(k, dtype=np.float64) ** 2)
+    for _ in range(64):
+        if np.all(np.abs(a - b) <= AGM_TOLERANCE * a):
+            break
+        a, b = (a + b) / 2, np.sqrt(a * b)
+    return np.pi / (2 * a)
+
+
+def small_angle_period(lengths: np.ndarray, gravity: np.ndarray) -> np.ndarray:
+    """2 pi sqrt(L / g)"""
+    return 2 * np.pi * np.sqrt(lengths / gravity)
+
+
+def elliptic_period(angles: np.ndarray, lengths: np.ndarray,
+                    gravity: np.ndarray) -> np.ndarray:
+    """Exact undamped period released from rest at angles: 4 sqrt(L / g) K(sin(angle / 2))"""
+    return 4 * np.sqrt(lengths / gravity) * complete_elliptic_k(np.sin(angles / 2))
+
+
+def measure(angles: np.ndarray, lengths: np.ndarray, gravity: np.ndarray,
+            damping: np.ndarray, duration: float = DURATION, substep: float = SUBSTEP,
+            integrator: str = DEFAULT_INTEGRATOR) -> dict:
+    """Release every configuration from rest and time its zero crossings
+
+    The period is twice the mean time between zero crossings. The decay rate is the
+    slope of log(amplitude) between the first and the last half swing.
+
+    Args:
+        angles (np.ndarray): Initial angles, radians, in (0, pi)
+        lengths (np.ndarray): Meters
+        gravity (np.ndarray): m/s^2
+        damping (np.ndarray): Damping coefficients, 1/s
+        duration (float, optional): Simulated seconds. Defaults to DURATION.
+        substep (float, optional): Integration step, seconds. Defaults to SUBSTEP.
+        integrator (str, optional): "verlet", "leapfrog" or "rk4".
+        Defaults to DEFAULT_INTEGRATOR.
+
+    Returns:
+        dict: "period", "decay_rate" (nan when fewer than 2 crossings) and "crossings"
+    """
+    count = len(angles)
+    ensemble = PendulumEnsemble(integrator=integrator, substep=substep)
+    ensemble.add(lengths, angles, gravity=gravity, damping=damping)
+
+    crossings = np.zeros(count, dtype=np.int64)
+    first_crossing = np.full(count, np.nan)
+    last_crossing = np.full(count, np.nan)
+    # peak of the half swing in progress, and of the first and last completed ones
+    peak = np.abs(np.asarray(angles, dtype=np.float64))
+    peak_time = np.zeros(count)
+    first_peak = np.full(count, np.nan)
+    first_peak_time = np.full(count, np.nan)
+    last_peak = np.full(count, np.nan)
+    last_peak_time = np.full(count, np.nan)
+
+    previous = ensemble.angles
+    for step in range(1, int(round(duration / substep)) + 1):
+        ensemble.step(substep)
+        current = ensemble.angles
+        now = step * substep
+        size = np.abs(current)
+        higher = size > peak
+        peak = np.where(higher, size, peak)
+        peak_time = np.where(higher, now, peak_time)
+
+        crossed = np.flatnonzero(((previous > 0) & (current <= 0))
+                                 | ((previous < 0) & (current >= 0)))
+        if len(crossed):
+            before, after = previous[crossed], current[crossed]
+            at = now - substep + substep * before / (before - after)
+            first = np.isnan(first_crossing[crossed])
+            first_crossing[crossed[first]] = at[first]
+            last_crossing[crossed] = at
+            crossings[crossed] += 1
+            first = np.isnan(first_peak[crossed])
+            first_peak[crossed[first]] = peak[crossed[first]]
+            first_peak_time[crossed[first]] = peak_time[crossed[first]]
+            last_peak[crossed] = peak[crossed]
+            last_peak_time[crossed] = peak_time[crossed]
+            peak[crossed] = 0
+        previous = current
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        period = np.where(crossings >= 2,
+                          2 * (last_crossing - first_crossing) / (crossings - 1), np.nan)
+        decay_rate = np.where(crossings >= 2, np.log(first_peak / last_peak)
+                              / (last_peak_time - first_peak_time), np.nan)
+    return {"period": period, "decay_rate": decay_rate, "crossings": crossings}
+
+
+def _measure_chunk(arguments: tuple) -> dict:
+    return measure(*arguments)
+
+
+def sweep(angles, lengths, gravity, damping, duration: float = DURATION,
+          substep: float = SUBSTEP, integrator: str = DEFAULT_INTEGRATOR,
+          workers: int | None = None, chunk_size: int = CHUNK_SIZE) -> dict:
+    """Measure every combination of the given values, split in chunks across processes
+
+    Args:
+        angles (array-like): Initial angles, radians
+        lengths (array-like): Meters
+        gravity (array-like): m/s^2
+        damping (array-like): Damping coefficients, 1/s
+        duration (float, optional): Simulated seconds. Defaults to DURATION.
+        substep (float, optional): Integration step, seconds. Defaults to SUBSTEP.
+        integrator (str, optional): Defaults to DEFAULT_INTEGRATOR.
+        workers (int | None, optional): Processes. None for one per CPU, 1 to stay in
+        this process. Defaults to None.
+        chunk_size (int, optional): Configurations per task. Defaults to CHUNK_SIZE.
+
+    Returns:
+        dict: flat arrays, one entry per configuration: the inputs ("angle", "length",
+        "gravity", "damping"), the measurements (see measure) and the references
+        "small_angle_period" and "elliptic_period"
+    """
+    grid = np.meshgrid(*(np.atleast_1d(np.asarray(values, dtype=np.float64))
+                         for values in (angles, lengths, gravity, damping)), indexing="ij")
+    angle, length, g, c = (values.ravel() for values in grid)
+    tasks = [(angle[i:i + chunk_size], length[i:i + chunk_size], g[i:i + chunk_size],
+              c[i:i + chunk_size], duration, substep, integrator)
+             for i in range(0, len(angle), chunk_size)]
+    if workers == 1 or len(tasks) == 1:
+        parts = [_measure_chunk(task) for task in tasks]
+    else:
+        with Pool(workers) as pool:
+            parts = pool.map(_measure_chunk, tasks)
+
+    results = {"angle": angle, "length": length, "gravity": g, "damping": c}
+    for key in parts[0]:
+        results[key] = np.concatenate([part[key] for part in parts])
+    results["small_angle_period"] = small_angle_period(length, g)
+    results["elliptic_period"] = elliptic_period(angle, length, g)
+    return results
+
+
+def _values(spec: str) -> np.ndarray:
+    """Parse "start:stop:count" or "a,b,c" to an array"""
+    if ":" in spec:
+        start, stop, count = spec.split(":")
+        return np.linspace(float(start), float(stop), int(count))
+    return np.array([float(value) for value in spec.split(",")])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pendulum period and decay sweep")
+    parser.add_argument("--angles", type=_values, default=_values("5:170:34"),
+                        help="initial angles, degrees")
+    parser.add_argument("--lengths", type=_values, default=_values("1"), help="meters")
+    parser.add_argument("--gravity", type=_values, default=_values(str(GRAVITY)),
+                        help="m/s^2")
+    parser.add_argument("--damping", type=_values, default=_values("0"), help="1/s")
+    parser.add_argument("--duration", type=float, default=DURATION, help="seconds")
+    parser.add_argument("--substep", type=float, default=SUBSTEP, help="seconds")
+    parser.add_argument("--integrator", choices=INTEGRATORS, default=DEFAULT_INTEGRATOR)
+    parser.add_argument("--workers", type=int, default=None, help="processes")
+    parser.add_argument("--chunk", type=int, default=CHUNK_SIZE,
+                        help="configurations per task")
+    parser.add_argument("--output", default="sweep.npz", help=".npz file")
+    options = parser.parse_args()
+
+    if np.any(options.angles <= 0) or np.any(options.angles >= 180):
+        parser.error("angles must be between 0 and 180 degrees")
+    started = time.perf_counter()
+    results = sweep(np.radians(options.angles), options.lengths, options.gravity,
+                    options.damping, options.duration, options.substep, options.integrator,
+                    options.workers, options.chunk)
+    elapsed = time.perf_counter() - started
+    np.savez(options.output, **results)
+
+    count = len(results["angle"])
+    print(f"{count} configurations in {elapsed:.1f} s, written to {options.output}")
+    undamped = (results["damping"] == 0) & np.isfinite(results["period"])
+    if np.any(undamped):
+        error = np.abs(results["period"][undamped] / results["elliptic_period"][undamped] - 1)
+        print(f"undamped period vs elliptic integral: max relative error {error.max():.2e}")
+    missing = int(np.sum(~np.isfinite(results["period"])))
+    if missing:
+        print(f"{missing} configurations crossed zero less than twice, "
+              f"try a longer --duration")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
 from projectile.includes.camera import Camera
-from projectile.includes.function import after, blur_screen, get_offset, pg_coord, pm_coord
+from projectile.includes.function import after, blur_screen, get_offset, pg_coord, pm_coord, \
+    toggle_buttons
 from projectile.includes.selector import ObjectSelector
 from projectile.includes.sprites import Projectile, Boundary, StaticObstacle
 from projectile.includes.constants import *
\ No newline at end of file
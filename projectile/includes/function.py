@@ -1,31 +1,29 @@
-import time
 from typing import Callable, Any
-from threading import Thread
 
 import numpy as np
 import pygame
 from pymunk.pygame_util import to_pygame, from_pygame
 
+from includes.dispatcher import get_dispatcher
 from projectile.includes.constants import SIZE
 
 def after(time_value: int, command: Callable[[], Any] | str = ...,
           args: list | tuple = ..., use_thread_and_join: bool = True):
-    time.sleep(time_value)
-    pass_args = None
-    if isinstance(args, tuple | list):
-        pass_args = tuple(args)
+    """Call command after time_value seconds. Returns immediately.
+
+    Args:
+        time_value (int): Delay, in seconds
+        command (Callable[[], Any]): Function to call
+        args (list | tuple, optional): Arguments for command
+        use_thread_and_join (bool, optional): Run command on the dispatcher pool.
+        Otherwise command is called on the main loop. Defaults to True.
+    """
+    pass_args = tuple(args) if isinstance(args, tuple | list) else ()
+    dispatcher = get_dispatcher()
     if use_thread_and_join:
-        if pass_args:
-            th = Thread(target=command, args=pass_args)
-        else:
-            th = Thread(target=command)
-        th.start()
-        th.join()
+        dispatcher.call_later(time_value, dispatcher.submit, command, *pass_args)
     else:
-        if pass_args:
-            command(*pass_args)
-        else:
-            command()
+        dispatcher.call_later(time_value, command, *pass_args)
             
 def blur_screen(screen: pygame.Surface, strength: int | str = ..., color: str = "#7A7A7A"):
     if color.startswith("#"):
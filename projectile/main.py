@@ -16,8 +16,6 @@ Main file for projectile motion
     - Move obstacle (by name)
     - Reset game window
 """
-import time
-from pathlib import Path
 from collections import deque
 
 import pymunk
@@ -27,31 +25,41 @@ import pygame
 from pygame.locals import *
 
 from includes import Button, Label, Entry, Listbox
+from includes.compositor import get_compositor
+from includes.dispatcher import get_dispatcher
+from includes.assets import asset_path, get_assets
+from includes.scene import Scene, get_scene_manager
 from projectile.includes import (
     Projectile, Boundary, StaticObstacle, Camera, ObjectSelector, SIZE, GRAY, RED, FPS,
-    G_HORIZONTAL, G_VERTICAL, after, blur_screen, get_offset, pg_coord, pm_coord
+    G_HORIZONTAL, G_VERTICAL, after, blur_screen, get_offset, pg_coord, pm_coord,
+    toggle_buttons
 )
 
-class ProjectileMain:
+_DEBOUNCE = 0.5
+
+class ProjectileMain(Scene):
     """Projectile Motion main class. Entry point for menu
     """
+    name = "projectile"
+    caption = "Projectile Motion Simulation (PMS)"
+    size = SIZE
+    fps = FPS
+
     def __init__(self):
         """Initiate the simulation
         """
-        pygame.init()
+        assets = get_assets()
         self.__space = pymunk.Space()
-        self.__screen = pygame.display.set_mode(SIZE)
-        self.__clock = pygame.time.Clock()
+        self.__screen = get_scene_manager().get_screen(self.size)
         self.__draw_options = DrawOptions(self.__screen)
-        self.__times_15 = pygame.font.Font(rf"{Path(__file__).parent}\assets\fonts\times.ttf", 15)
-        self.__times_20 = pygame.font.Font(rf"{Path(__file__).parent}\assets\fonts\times.ttf", 20)
-        self.__times_25 = pygame.font.Font(rf"{Path(__file__).parent}\assets\fonts\times.ttf", 25)
+        self.__times_15 = assets.font(asset_path(__file__, "fonts", "times.ttf"), 15)
+        self.__times_20 = assets.font(asset_path(__file__, "fonts", "times.ttf"), 20)
+        self.__times_25 = assets.font(asset_path(__file__, "fonts", "times.ttf"), 25)
 
         self.__camera = Camera(5, 0.01, 0.01)
         self.__selected_object = ObjectSelector.Line.name
         self.__object_queue = deque(ObjectSelector)
 
-        self.__running = True
         self.__is_menu_visible = True
         self.__is_description_visible = False
         self.__is_object_list_visible = False
@@ -131,7 +139,7 @@ class ProjectileMain:
                           self.__btn_remove_object, self.__btn_menu_visibility,
                           self.__btn_description_visibility, self.__btn_show_object_list]
 
-    def __draw_widgets(self):
+    def draw_widgets(self):
         """Draw widgets on screen
         """
         if self.__show_info:
@@ -170,13 +178,18 @@ class ProjectileMain:
         self.__btn_create_object.config(text=f"Create {self.__selected_object}",
                                         command=self.__create, args=(self.__selected_object,))
 
+    def __hold_buttons(self, *buttons):
+        """Disable buttons for _DEBOUNCE seconds"""
+        toggle_buttons("disabled", *buttons)
+        get_dispatcher().call_later(_DEBOUNCE, toggle_buttons, "normal", *buttons, key=buttons)
+
     def __change_object(self, rotation: int):
-        self.__btn_up.config(state="disabled")
+        if not get_dispatcher().debounce(self.__btn_up, _DEBOUNCE):
+            return
+        self.__hold_buttons(self.__btn_up, self.__btn_down)
         self.__object_queue.rotate(rotation)
         self.__selected_object = self.__object_queue[0].name
         self.__update_create_button()
-        time.sleep(0.5)
-        self.__btn_up.config(state="normal")
 
     def __create(self, shape):
         while self.__ready_to_step or self.__during_query:
@@ -196,12 +209,22 @@ class ProjectileMain:
                 self.__btn_remove_object.config(state="normal")
                 after(2, self.__remove_error_message)
                 return
+            obj_name = self.__entry_name.get()
+            # the object list keys its rows by name
+            if any(obj.name == obj_name for obj in self.__objects):
+                self.__show_info = True
+                self.__label_info.config(f"An object named {obj_name} already exists")
+                for entry in self.__entries:
+                    entry.config(state="normal")
+                self.__btn_create_object.config(state="normal")
+                self.__btn_remove_object.config(state="normal")
+                after(2, self.__remove_error_message)
+                return
             self.__show_info = False
             self.__btn_create_object.config(state="normal")
             self.__btn_remove_object.config(state="normal")
             for entry in self.__entries:
                 entry.config(state="normal")
-            obj_name = self.__entry_name.get()
             pos = (self.__entry_pos_x.get(as_type=int), self.__entry_pos_y.get(as_type=int))
             radius = multiplier = self.__entry_multiplier.get(as_type=int)
             tmp_object = StaticObstacle(obj_name, pos, shape, multiplier, radius=radius)
@@ -273,25 +296,25 @@ class ProjectileMain:
             self.__btn_menu_visibility.config(state="normal")
 
     def __toggle_menu_visibility(self):
-        self.__btn_description_visibility.config(state="disabled")
-        self.__btn_menu_visibility.config(state="disabled")
+        if not get_dispatcher().debounce(self.__btn_menu_visibility, _DEBOUNCE):
+            return
+        self.__hold_buttons(self.__btn_description_visibility, self.__btn_menu_visibility)
         if self.__is_menu_visible:
             self.__is_menu_visible = False
             self.__menu_visible_before_pull = False
             self.__btn_menu_visibility.config("+")
             if self.__is_description_visible:
-                self.__toggle_desc_visibility()
+                self.__toggle_desc_visibility(debounce=False)
         else:
             self.__is_menu_visible = True
             self.__menu_visible_before_pull = True
             self.__btn_menu_visibility.config("Collapse")
-        time.sleep(0.5)
-        self.__btn_description_visibility.config(state="normal")
-        self.__btn_menu_visibility.config(state="normal")
 
-    def __toggle_desc_visibility(self):
-        self.__btn_description_visibility.config(state="disabled")
-        self.__btn_menu_visibility.config(state="disabled")
+    def __toggle_desc_visibility(self, debounce: bool = True):
+        if debounce and not get_dispatcher().debounce(self.__btn_description_visibility,
+                                                      _DEBOUNCE):
+            return
+        self.__hold_buttons(self.__btn_description_visibility, self.__btn_menu_visibility)
         if self.__is_description_visible:
             self.__is_description_visible = False
             self.__desc_visible_before_pull = False
@@ -300,9 +323,6 @@ class ProjectileMain:
             self.__is_description_visible = True
             self.__desc_visible_before_pull = True
             self.__btn_description_visibility.config("Hide Description")
-        time.sleep(0.5)
-        self.__btn_description_visibility.config(state="normal")
-        self.__btn_menu_visibility.config(state="normal")
 
     def __handle_camera_movement(self):
         if any([entry.get_status() for entry in self.__entries]):
@@ -346,69 +366,60 @@ class ProjectileMain:
             else:
                 self.__btn_menu_visibility.config(state="normal")
 
-    def mainloop(self):
-        """Mainloop
-        """
-        pygame.display.set_caption("Projectile Motion Simulation (PMS)")
+    def get_entries(self):
+        return self.__entries
 
-        while self.__running:
-            if pygame.event.peek(pygame.QUIT):
-                pygame.quit()
-                self.__running = False
-                return 0
-            if self.__is_object_list_visible:
-                pygame.event.clear(pygame.MOUSEBUTTONDOWN)
-            for event in pygame.event.get():
-                for entry in self.__entries:
-                    entry.handle_entry_events(event)
-                if event.type == KEYDOWN:
-                    if event.key == K_c:
-                        self.__create_projectile()
-                    elif event.key == K_BACKSPACE and self.__active_shape != None:
-                        self.__space.remove(self.__active_shape, self.__active_shape.body)
-                        self.__active_shape = None
-                elif event.type == MOUSEBUTTONDOWN:
-                    pg_position = pm_coord(pygame.mouse.get_pos(), get_offset(self.__camera),
-                                           self.__screen)
-                    self.__active_shape = None
-                    for body in self.__space.bodies:
-                        if body.body_type == pymunk.Body.DYNAMIC:
-                            shape_pos = list(body.shapes)[0]
-                            self.__during_query = True
-                            q_info = shape_pos.point_query(pg_position)
-                            self.__during_query = False
-                            distance = q_info.distance
-                            if distance < 0:
-                                self.__active_shape = shape_pos
-                                self.__pulling = True
-                                shape_pos.body.angle = (pg_position - shape_pos.body.position).angle
-                elif event.type == MOUSEMOTION:
-                    self.__m_position = event.pos
-                elif event.type == MOUSEBUTTONUP:
-                    if self.__pulling:
-                        self.__pulling = False
-                        pt2 = pm_coord(event.pos, get_offset(self.__camera), self.__screen)
-                        pt1 = Vec2d(*self.__active_shape.body.position)
-                        imp = self.__impulse * (pt1 - pt2).rotated(-self.__active_shape.body.angle)
-                        self.__active_shape.body.apply_impulse_at_local_point(imp)
+    def handle_event(self, event: pygame.event.Event):
+        if event.type == KEYDOWN:
+            if event.key == K_c:
+                self.__create_projectile()
+            elif event.key == K_BACKSPACE and self.__active_shape != None:
+                self.__space.remove(self.__active_shape, self.__active_shape.body)
+                self.__active_shape = None
+        elif event.type == MOUSEBUTTONDOWN and not self.__is_object_list_visible:
+            pg_position = pm_coord(pygame.mouse.get_pos(), get_offset(self.__camera),
+                                   self.__screen)
+            self.__active_shape = None
+            for body in self.__space.bodies:
+                if body.body_type == pymunk.Body.DYNAMIC:
+                    shape_pos = list(body.shapes)[0]
+                    self.__during_query = True
+                    q_info = shape_pos.point_query(pg_position)
+                    self.__during_query = False
+                    distance = q_info.distance
+                    if distance < 0:
+                        self.__active_shape = shape_pos
+                        self.__pulling = True
+                        shape_pos.body.angle = (pg_position - shape_pos.body.position).angle
+        elif event.type == MOUSEMOTION:
+            self.__m_position = event.pos
+        elif event.type == MOUSEBUTTONUP:
+            if self.__pulling:
+                self.__pulling = False
+                pt2 = pm_coord(event.pos, get_offset(self.__camera), self.__screen)
+                pt1 = Vec2d(*self.__active_shape.body.position)
+                imp = self.__impulse * (pt1 - pt2).rotated(-self.__active_shape.body.angle)
+                self.__active_shape.body.apply_impulse_at_local_point(imp)
+
+    def update(self, dt: float):
+        self.__ready_to_step = True
+        self.__pull_handle()
+        self.__handle_camera_movement()
+        self.__space.step(0.01)
+        self.__ready_to_step = False
 
-            self.__ready_to_step = True
-            self.__pull_handle()
-            self.__screen.fill(GRAY)
-            self.__handle_camera_movement()
-            self.__space.debug_draw(self.__draw_options)
-            self.__draw_widgets()
+    def draw(self):
+        self.__screen.fill(GRAY)
+        self.__space.debug_draw(self.__draw_options)
 
-            if self.__active_shape != None:
-                shape_pos = self.__active_shape.body.position
-                radius = int(self.__active_shape.radius)
-                pg_position = pg_coord(shape_pos, get_offset(self.__camera), self.__screen, "+")
-                pygame.draw.circle(self.__screen, RED, pg_position, radius, 3)
-                if self.__pulling:
-                    pygame.draw.line(self.__screen, RED, pg_position, self.__m_position, 3)
-                    pygame.draw.circle(self.__screen, RED, self.__m_position, radius, 3)
+        if self.__active_shape != None:
+            shape_pos = self.__active_shape.body.position
+            radius = int(self.__active_shape.radius)
+            pg_position = pg_coord(shape_pos, get_offset(self.__camera), self.__screen, "+")
+            pygame.draw.circle(self.__screen, RED, pg_position, radius, 3)
+            if self.__pulling:
+                pygame.draw.line(self.__screen, RED, pg_position, self.__m_position, 3)
+                pygame.draw.circle(self.__screen, RED, self.__m_position, radius, 3)
 
-            self.__space.step(0.01)
-            self.__ready_to_step = False
-            pygame.display.flip()
-            self.__clock.tick(FPS)
+        # bodies and the camera can move anywhere, the whole space is redrawn
+        get_compositor().mark_all()
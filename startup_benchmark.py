@@ -0,0 +1,63 @@
+"""Startup benchmark
+
+Measure what importing the launcher costs, with python -X importtime. Run this file:
+
+    python3 startup_benchmark.py [--top N] [--runs N]
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+HEAVY_MODULES = ("matplotlib", "numpy", "pygame", "pymunk", "scipy")
+
+
+def measure():
+    """Import main in a fresh interpreter
+
+    Raises:
+        RuntimeError: the import failed, with the last line of its traceback
+
+    Returns:
+        dict: top-level module -> (self time, cumulative time), in microseconds
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                            cwd=ROOT, capture_output=True, text=True, check=False)
+    if result.returncode != 0:
+        errors = [line for line in result.stderr.splitlines()
+                  if line.strip() and not line.startswith("import time:")]
+        raise RuntimeError(errors[-1] if errors else "import main failed")
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_time, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_time), int(cumulative))
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure launcher import time")
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list")
+    parser.add_argument("--runs", type=int, default=5, help="runs, the fastest is kept")
+    options = parser.parse_args()
+
+    runs = [measure() for _ in range(max(1, options.runs))]
+    best = min(runs, key=lambda modules: modules.get("main", (0, 0))[1])
+    total = best.get("main", (0, 0))[1]
+    print(f"import main: {total / 1000:.1f} ms (best of {len(runs)})")
+    print(f"{'self [ms]':>10} {'cumulative [ms]':>16}  module")
+    slowest = sorted(best.items(), key=lambda item: item[1][1], reverse=True)
+    for name, (self_time, cumulative) in slowest[:options.top]:
+        print(f"{self_time / 1000:>10.1f} {cumulative / 1000:>16.1f}  {name}")
+
+    heavy = sorted(name for name in best if name.split(".")[0] in HEAVY_MODULES)
+    if heavy:
+        print(f"Heavy modules imported at startup: {', '.join(heavy)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,10 @@
+from pendulum.includes.chain import PendulumChain
+
+
+def test_gravity_change_restarts_energy_drift():
+    chain = PendulumChain([1, 1], angles=[1, 2])
+    chain.advance(0.5)
+    chain.gravity = chain.gravity * 10
+    assert chain.max_energy_drift == 0
+    chain.advance(0.5)
+    assert chain.max_energy_drift < 1e-6
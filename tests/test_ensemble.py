@@ -0,0 +1,26 @@
+import numpy as np
+
+from pendulum.includes.ensemble import PendulumEnsemble
+
+
+def test_set_parameters_changes_existing_pendulums():
+    unchanged = PendulumEnsemble()
+    changed = PendulumEnsemble()
+    for ensemble in (unchanged, changed):
+        ensemble.add([1, 2], 0.5)
+    changed.set_parameters(gravity=unchanged.gravity * 10, damping=0.5)
+    unchanged.step(0.2)
+    changed.step(0.2)
+    assert not np.allclose(unchanged.angles, changed.angles)
+    assert changed.gravity == unchanged.gravity * 10
+
+
+def test_add_after_clear_keeps_parameters_aligned():
+    ensemble = PendulumEnsemble()
+    ensemble.add([1, 2], 0.3, gravity=[9.8, 1.6], damping=[0, 0.1])
+    ensemble.add(1, 0.2)
+    ensemble.step(0.1)
+    ensemble.clear()
+    ensemble.add_wave(0.2)
+    ensemble.step(0.1)
+    assert len(ensemble.energy()) == len(ensemble)